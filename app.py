@@ -1,20 +1,44 @@
-from flask import Flask, render_template, request, session ,jsonify
+from flask import Flask, render_template, request, session ,jsonify, Response, stream_with_context, g, abort
+from flask.signals import before_render_template, template_rendered
 from evaluator.run_extraction import (
-    run_extraction,
-    normalize_extraction,
+    run_extraction_async,
     merge_extraction,
     FIELD_QUESTIONS,
     FIELD_GUIDANCE,
     get_attached_sides,
-    extract_attachment_info
+    extract_attachment_info_async
 )
 from evaluator.logic.missing_fields import find_next_missing_field
-from evaluator.scoring.privacy_score_v1 import score_privacy_v1
-from evaluator.logic.product_questions import is_product_question
+from evaluator.scoring.privacy_score_cached import score_privacy_cached, score_cache_info
+from evaluator.extraction_cache import extraction_cache_info
+from evaluator.explanation_cache import explanation_cache_info
+from evaluator.logic.field_resolver import fast_path_info
+from evaluator.scoring.privacy_score_incremental import (
+    provisional_range,
+    provisional_score,
+    update_section_scores
+)
+from evaluator.state import PropertyState
+from evaluator.logic.product_questions import product_question_by_llm_async, product_question_locally
+from evaluator.logic.intent_model import intent_model_info
 from evaluator.logic.product_explain import explain_product
 from evaluator.logic.intent import classify_intent
-from evaluator.logic.explain import explain_concept
+from evaluator.logic.router import route
+from evaluator.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    REQUEST_SECONDS,
+    SCORING_SECONDS,
+    SESSION_SECONDS,
+    TEMPLATE_SECONDS,
+    exposition,
+    register_collector
+)
+from evaluator.logic.explain import explain_concept_async, explain_concept_stream
+from evaluator.gateway import release_async_client
+import asyncio
+import hmac
 import json
+import time
 from flask_session import Session
 import os
 from dotenv import load_dotenv
@@ -22,7 +46,22 @@ load_dotenv()
 
 
 
-app = Flask(__name__)
+class EvaluatorFlask(Flask):
+    def async_to_sync(self, func):
+        """
+        Async views, closing the request's gateway client when they finish
+        (a no-op on the ASGI server's long-lived loop).
+        """
+        async def view(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                await release_async_client()
+
+        return super().async_to_sync(view)
+
+
+app = EvaluatorFlask(__name__)
 app.secret_key = os.getenv("SECRET_KEY")
 if not app.secret_key:
     raise RuntimeError("SECRET_KEY is not set in environment variables")
@@ -31,10 +70,11 @@ if not app.secret_key:
 # -----------------------
 # Server-side Session Config
 # -----------------------
+# SESSION_FILE_DIR (environment) sets where session files are written
 app.config["SESSION_TYPE"] = "filesystem"
 app.config["SESSION_PERMANENT"] = False
 app.config["SESSION_USE_SIGNER"] = True
-app.config["SESSION_FILE_DIR"] = "./flask_session"
+app.config["SESSION_FILE_DIR"] = os.getenv("SESSION_FILE_DIR", "./flask_session")
 app.config["SESSION_FILE_THRESHOLD"] = 100
 app.config["SESSION_COOKIE_HTTPONLY"] = True
 app.config["SESSION_COOKIE_SECURE"] = False  # Set to True when using HTTPS
@@ -45,16 +85,288 @@ os.makedirs(app.config["SESSION_FILE_DIR"], exist_ok=True)
 Session(app)
 
 
+# -----------------------
+# Metrics (served at /metrics)
+# -----------------------
+# /metrics is off unless METRICS_TOKEN is set, and then only answers
+# requests with "Authorization: Bearer <METRICS_TOKEN>".
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
+def timed_session_interface(interface):
+    """
+    Times session loads and saves, i.e. the session file I/O.
+    """
+    open_session, save_session = interface.open_session, interface.save_session
+
+    def timed_open(app, request):
+        with SESSION_SECONDS.time("load"):
+            return open_session(app, request)
+
+    def timed_save(app, session, response):
+        with SESSION_SECONDS.time("save"):
+            return save_session(app, session, response)
+
+    interface.open_session = timed_open
+    interface.save_session = timed_save
+    return interface
+
+
+app.session_interface = timed_session_interface(app.session_interface)
+
+
+@before_render_template.connect_via(app)
+def start_render_timer(sender, template, context, **extra):
+    g.setdefault("render_started", []).append(time.perf_counter())
+
+
+@template_rendered.connect_via(app)
+def stop_render_timer(sender, template, context, **extra):
+    started = g.get("render_started")
+    if started:
+        TEMPLATE_SECONDS.observe(time.perf_counter() - started.pop(), template.name)
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def stop_request_timer(response):
+    started = g.get("request_started")
+    if started is not None:
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            request.endpoint or "none",
+            request.method,
+            f"{response.status_code // 100}xx",
+        )
+    return response
+
+
+def cache_stats():
+    return {
+        "extraction": extraction_cache_info(),
+        "explanation": explanation_cache_info(),
+        "score": score_cache_info(),
+    }
+
+
+register_collector(
+    "cache_lookups_total", "counter", "Cache lookups.", ("cache",),
+    lambda: {
+        (name,): stats.get("lookups", stats["hits"] + stats.get("misses", 0))
+        for name, stats in cache_stats().items()
+    },
+)
+register_collector(
+    "cache_hits_total", "counter", "Cache hits (either tier).", ("cache",),
+    lambda: {(name,): stats["hits"] for name, stats in cache_stats().items()},
+)
+register_collector(
+    "fast_path_turns_total", "counter", "Extraction turns tried on the local fast path.", (),
+    lambda: {(): fast_path_info()["turns"]},
+)
+register_collector(
+    "fast_path_resolved_total", "counter", "Extraction turns resolved without the LLM.", (),
+    lambda: {(): fast_path_info()["resolved"]},
+)
+register_collector(
+    "intent_model_messages_total", "counter", "Product checks that reached the local intent model.", (),
+    lambda: {(): intent_model_info()["messages"]},
+)
+register_collector(
+    "intent_model_local_total", "counter", "Product checks the local intent model decided.", (),
+    lambda: {(): intent_model_info()["local"]},
+)
+
+
 DEBUG_MODE = False
 
+# Start the turn's extraction alongside the LLM product-question check
+# instead of after it. Set SPECULATIVE_EXTRACTION=0 to run them in turn.
+SPECULATIVE_EXTRACTION = os.getenv("SPECULATIVE_EXTRACTION", "1") != "0"
+
+
+def is_quick_explanation(user_input):
+    # Trigger if explanation phrases present
+    if "quick_explanation" in route(user_input):
+        return True
+
+    lower_input = user_input.lower().strip()
+
+    # Also trigger for short question-style inputs like:
+    # "foyer?", "buffer?", "lobby?"
+    return lower_input.endswith("?") and len(lower_input.split()) <= 4
+
+
+EXPLANATION_SEPARATOR = "\n\n—\n\n"
+
+
 def get_question(section, field):
     if field == "__entire_section__":
         return FIELD_GUIDANCE.get((section, field), "Could you tell me more?")
     return FIELD_QUESTIONS.get(field, f"Tell me more about {field.replace('_',' ')}")
 
 
+def rescore_sections(extracted, changed_fields):
+    """
+    Recomputes only the section scores touched by this turn.
+    """
+    section_scores = update_section_scores(
+        extracted,
+        session.get("section_scores", {}),
+        changed_fields,
+    )
+    session["section_scores"] = section_scores
+
+    if DEBUG_MODE:
+        print("PROVISIONAL SCORE:", provisional_score(section_scores))
+
+
+def chat_payload(messages):
+    """
+    AJAX response body: the transcript plus the running provisional score
+    and the range the final score can still fall in.
+    """
+    payload = {"messages": messages}
+
+    section_scores = session.get("section_scores")
+    if section_scores:
+        payload["provisional"] = provisional_score(section_scores)
+
+        if payload["provisional"]:
+            payload["provisional"]["range"] = provisional_range(section_scores)
+
+    return payload
+
+
+def extraction_context():
+    """
+    What run_extraction is told about the question the user is answering.
+    """
+    if not session.get("last_question"):
+        return {}
+
+    section, field = session.get("last_question")
+    return {
+        "last_question": (section, field),
+        "field_question": get_question(section, field)
+    }
+
+
+def start_speculative_extraction(user_input, product_local):
+    """
+    Starts the gateway call the turn will need if the user is describing
+    the property, or returns None when the turn won't reach extraction
+    anyway (rules or the local model already decided the product check,
+    product_local, or it's an explanation).
+    """
+    if not SPECULATIVE_EXTRACTION or product_local is not None:
+        return None
+
+    if is_quick_explanation(user_input) or classify_intent(user_input) == "EXPLANATION":
+        return None
+
+    if session.get("pending_attachment_side"):
+        call = extract_attachment_info_async(user_input)
+    else:
+        call = run_extraction_async(user_input, context=extraction_context())
+
+    return asyncio.ensure_future(call)
+
+
+def discard(task):
+    """
+    Cancels a speculative call whose result isn't needed.
+    """
+    if task is None:
+        return
+
+    task.cancel()
+    # A call that already failed has nobody left to report to
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    if DEBUG_MODE:
+        print("SPECULATIVE EXTRACTION DISCARDED")
+
+
+async def speculative_or(task, call):
+    """
+    The speculative call's result, or call() if none was started.
+    """
+    if task is not None:
+        return await task
+    return await call()
+
+
+def wants_stream():
+    """
+    chat.html asks for explanations as server-sent events.
+    """
+    return "text/event-stream" in request.headers.get("Accept", "")
+
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def save_session_now():
+    """
+    Stores the session from inside a streamed body. Flask saved it (and
+    sent the cookie) before the first chunk, so the reply appended at the
+    end of the stream needs a second save.
+    """
+    app.session_interface.save_session(app, session._get_current_object(), Response())
+
+
+def explanation_stream(user_input, follow_up, messages):
+    """
+    text/event-stream response for an explanation turn: a "token" event
+    for every piece of the answer as the gateway produces it, the
+    follow-up question as the last token, then a "done" event with the
+    same payload the JSON response carries.
+    """
+    started = time.perf_counter()
+
+    def first_token():
+        if DEBUG_MODE:
+            print(f"EXPLANATION FIRST TOKEN: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def finish(pieces):
+        messages.append({
+            "role": "assistant",
+            "content": "".join(pieces).strip() + EXPLANATION_SEPARATOR + follow_up
+        })
+        session["messages"] = messages
+        save_session_now()
+        return sse("done", chat_payload(messages))
+
+    def events():
+        pieces = []
+        for piece in explain_concept_stream(user_input):
+            if not pieces:
+                first_token()
+            pieces.append(piece)
+            yield sse("token", piece)
+
+        yield sse("token", EXPLANATION_SEPARATOR + follow_up)
+        yield finish(pieces)
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.route("/", methods=["GET", "POST"])
-def chatbot():
+async def chatbot():
+    """
+    One chat turn. Async so the gateway round trips don't hold a worker:
+    served by asgi.py, hundreds of turns can wait on the gateway at once.
+    """
 
     # -----------------------
     # FIRST LOAD
@@ -85,7 +397,7 @@ def chatbot():
     # -----------------------
     # SESSION INIT
     # -----------------------
-    extracted = session.get("extracted", {})
+    extracted = PropertyState.unpack(session.get("state"))
     confirmed = set(tuple(x) for x in session.get("confirmed", []))
     last_question = session.get("last_question")
 
@@ -103,7 +415,7 @@ def chatbot():
     if DEBUG_MODE:
         print("\n==============================")
         print("USER INPUT:", user_input)
-        print("CURRENT EXTRACTED:", json.dumps(extracted, indent=2))
+        print("CURRENT EXTRACTED:", json.dumps(extracted.to_dict(), indent=2))
         print("CONFIRMED:", confirmed)
 
     if not user_input:
@@ -117,14 +429,29 @@ def chatbot():
         session["messages"] = messages
 
         if is_ajax:
-            return jsonify({"messages": messages})
+            return jsonify(chat_payload(messages))
         return render_template("chat.html", messages=messages)
 
 
+    # Rules and the local intent model, once per turn
+    product_local = product_question_locally(user_input)
+    speculative = start_speculative_extraction(user_input, product_local)
+
     # -----------------------
     # PRODUCT / EXPLANATION OVERRIDES
     # -----------------------
-    if is_product_question(user_input):
+    try:
+        if product_local is not None:
+            is_product = product_local
+        else:
+            is_product = await product_question_by_llm_async(user_input)
+    except BaseException:
+        discard(speculative)
+        raise
+
+    if is_product:
+        discard(speculative)
+
         # Decide what the next question would be
         missing = find_next_missing_field(extracted, confirmed)
 
@@ -149,36 +476,13 @@ def chatbot():
         session["messages"] = messages
 
         if is_ajax:
-            return jsonify({"messages": messages})
+            return jsonify(chat_payload(messages))
         return render_template("chat.html", messages=messages)
     
     # -----------------------
-    # QUICK EXPLANATION KEYWORD OVERRIDE
+    # EXPLANATION (KEYWORD OVERRIDE OR INTENT)
     # -----------------------
-    lower_input = user_input.lower().strip()
-
-    explanation_phrases = [
-        "what is",
-        "what's",
-        "whats",
-        "what does",
-        "meaning of",
-        "meaning",
-        "define",
-        "explain",
-        "means"
-    ]
-
-    # Trigger if explanation phrases present
-    is_explanation = any(p in lower_input for p in explanation_phrases)
-
-    # Also trigger for short question-style inputs like:
-    # "foyer?", "buffer?", "lobby?"
-    if not is_explanation:
-        if lower_input.endswith("?") and len(lower_input.split()) <= 4:
-            is_explanation = True
-
-    if is_explanation:
+    if is_quick_explanation(user_input) or classify_intent(user_input) == "EXPLANATION":
         missing = find_next_missing_field(extracted, confirmed)
 
         if missing:
@@ -188,38 +492,12 @@ def chatbot():
         else:
             follow_up = "You can continue describing the property."
 
-        assistant_reply = (
-            explain_concept(user_input)
-            + "\n\n—\n\n"
-            + follow_up
-        )
-
-        messages.append({
-            "role": "assistant",
-            "content": assistant_reply
-        })
-
-        session["messages"] = messages
-
-        if is_ajax:
-            return jsonify({"messages": messages})
-        return render_template("chat.html", messages=messages)
-
-
-    intent = classify_intent(user_input)
-    if intent == "EXPLANATION":
-        missing = find_next_missing_field(extracted, confirmed)
-
-        if missing:
-            section, field = missing
-            follow_up = get_question(section, field)
-            session["last_question"] = (section, field)
-        else:
-            follow_up = "You can continue describing the property."
+        if is_ajax and wants_stream():
+            return explanation_stream(user_input, follow_up, messages)
 
         assistant_reply = (
-            explain_concept(user_input)
-            + "\n\n—\n\n"
+            await explain_concept_async(user_input)
+            + EXPLANATION_SEPARATOR
             + follow_up
         )
 
@@ -231,7 +509,7 @@ def chatbot():
         session["messages"] = messages
 
         if is_ajax:
-            return jsonify({"messages": messages})
+            return jsonify(chat_payload(messages))
         return render_template("chat.html", messages=messages)
 
     # -----------------------------------------
@@ -240,17 +518,20 @@ def chatbot():
     pending_side = session.get("pending_attachment_side")
 
     if pending_side:
-        info = extract_attachment_info(user_input)
+        info = await speculative_or(
+            speculative, lambda: extract_attachment_info_async(user_input)
+        )
 
         owner = info.get("owner")
         space_type = info.get("space_type")
 
         if owner or space_type:
-            extracted.setdefault("attachment_details", {})
-            extracted["attachment_details"][pending_side] = {
+            extracted.set_attachment(pending_side, {
                 "owner": owner,
                 "space_type": space_type,
-            }
+            })
+            rescore_sections(extracted, {("attachment_details", pending_side)})
+
         # ✅ Confirm the open-space field now that attachment is resolved
         confirmed.add(("privacy_between_units", f"{pending_side}_open_space"))
         session["confirmed"] = list(confirmed)
@@ -261,20 +542,29 @@ def chatbot():
         session["explained_attachment_sides"] = list(explained)
         session.pop("pending_attachment_side")
 
-        session["extracted"] = extracted
+        session["state"] = extracted.pack()
 
         if DEBUG_MODE:
-            print("UPDATED ATTACHMENTS:", json.dumps(extracted.get("attachment_details", {}), indent=2))
+            print("UPDATED ATTACHMENTS:", json.dumps(extracted.attachments, indent=2))
 
         missing = find_next_missing_field(extracted, confirmed)
 
         if not missing:
             if DEBUG_MODE:
-                print("FINAL STATE BEFORE SCORING:", json.dumps(extracted, indent=2))
+                print("FINAL STATE BEFORE SCORING:", json.dumps(extracted.to_dict(), indent=2))
+
+            with SCORING_SECONDS.time():
+                score = score_privacy_cached(extracted)
+
+            if DEBUG_MODE:
+                print("SCORE CACHE:", score_cache_info())
+                print("EXTRACTION CACHE:", extraction_cache_info())
+                print("FAST PATH:", fast_path_info())
+                print("EXPLANATION CACHE:", explanation_cache_info())
+                print("INTENT MODEL:", intent_model_info())
 
-            score = score_privacy_v1(extracted)
             session.clear()
-            return render_template("result.html", score=score, extracted=extracted)
+            return render_template("result.html", score=score, extracted=extracted.to_dict())
 
         section, field = missing
         session["last_question"] = (section, field)
@@ -291,23 +581,14 @@ def chatbot():
         session["messages"] = messages
 
         if is_ajax:
-            return jsonify({"messages": messages})
+            return jsonify(chat_payload(messages))
         return render_template("chat.html", messages=messages)
 
     # -----------------------
     # RUN EXTRACTION (ONCE)
     # -----------------------
-    context = {}
-
-    if session.get("last_question"):
-        section, field = session.get("last_question")
-        context = {
-            "last_question": (section, field),
-            "field_question": get_question(section, field)
-        }
-
-    update = normalize_extraction(
-        run_extraction(user_input, context=context)
+    update = await speculative_or(
+        speculative, lambda: run_extraction_async(user_input, context=extraction_context())
     )
 
 
@@ -349,7 +630,7 @@ def chatbot():
         session["messages"] = messages
 
         if is_ajax:
-            return jsonify({"messages": messages})
+            return jsonify(chat_payload(messages))
         return render_template("chat.html", messages=messages)
 
 
@@ -357,10 +638,14 @@ def chatbot():
     # -----------------------
     # MERGE UPDATE
     # -----------------------
-    merge_extraction(extracted, update)
+    changed_fields = merge_extraction(extracted, update)
+    rescore_sections(extracted, changed_fields)
+
+    # The packed state is a copy, so store it before any early return
+    session["state"] = extracted.pack()
 
     if DEBUG_MODE:
-        print("STATE AFTER MERGE:", json.dumps(extracted, indent=2))
+        print("STATE AFTER MERGE:", json.dumps(extracted.to_dict(), indent=2))
     
     # -----------------------
     # CONFIRM LAST ASKED FIELD ONLY
@@ -406,7 +691,7 @@ def chatbot():
         session["messages"] = messages
 
         if is_ajax:
-            return jsonify({"messages": messages})
+            return jsonify(chat_payload(messages))
         return render_template("chat.html", messages=messages)
 
 
@@ -418,7 +703,7 @@ def chatbot():
     if DEBUG_MODE:
         print("NEXT MISSING:", missing)
 
-    session["extracted"] = extracted
+    session["state"] = extracted.pack()
     session["confirmed"] = list(confirmed)
 
     # -----------------------
@@ -427,13 +712,21 @@ def chatbot():
     if not missing:
 
         if DEBUG_MODE:
-            print("FINAL STATE BEFORE SCORING:", json.dumps(extracted, indent=2))
+            print("FINAL STATE BEFORE SCORING:", json.dumps(extracted.to_dict(), indent=2))
         
-        score = score_privacy_v1(extracted)
+        with SCORING_SECONDS.time():
+            score = score_privacy_cached(extracted)
+
+        if DEBUG_MODE:
+            print("SCORE CACHE:", score_cache_info())
+            print("EXTRACTION CACHE:", extraction_cache_info())
+            print("FAST PATH:", fast_path_info())
+            print("EXPLANATION CACHE:", explanation_cache_info())
+            print("INTENT MODEL:", intent_model_info())
 
         # Store result in session for later rendering
         session["final_score"] = score
-        session["final_extracted"] = extracted
+        session["final_state"] = extracted.pack()
 
         if is_ajax:
             return jsonify({
@@ -443,7 +736,7 @@ def chatbot():
         return render_template(
             "result.html",
             score=score,
-            extracted=extracted,
+            extracted=extracted.to_dict(),
         )
 
 
@@ -465,13 +758,25 @@ def chatbot():
     session["messages"] = messages
 
     if is_ajax:
-            return jsonify({"messages": messages})
+            return jsonify(chat_payload(messages))
     return render_template("chat.html", messages=messages)
 
+@app.route("/metrics")
+def metrics():
+    if not METRICS_TOKEN:
+        abort(404)
+
+    supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not hmac.compare_digest(supplied.encode(), METRICS_TOKEN.encode()):
+        return Response("Unauthorized\n", 401, {"WWW-Authenticate": "Bearer"}, content_type="text/plain")
+
+    return Response(exposition(), content_type=METRICS_CONTENT_TYPE)
+
+
 @app.route("/result")
 def result():
     score = session.get("final_score")
-    extracted = session.get("final_extracted")
+    extracted = PropertyState.unpack(session.get("final_state")).to_dict()
 
     if not score:
         return "No result available."
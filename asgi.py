@@ -0,0 +1,64 @@
+# asgi.py
+#
+# ASGI entry point for the chat app:
+#
+#   uvicorn asgi:app --host 0.0.0.0 --port $PORT
+#
+# The Flask app is served through asgiref's WsgiToAsgi, so Flask handles
+# requests exactly as it does under any WSGI server.
+#
+# Every request runs in its own ThreadSensitiveContext. WsgiToAsgi's
+# default is one shared thread for all requests. With one context per
+# request, each request gets its own thread, and async views (the chat
+# turn) are awaited on the server's event loop. So one worker can have
+# hundreds of turns waiting on the gateway at once. Use uvicorn's
+# --limit-concurrency to cap how many threads a worker runs.
+#
+# Each request also starts from an empty contextvars context. uvicorn
+# resumes reading a keep-alive connection from inside the previous
+# response's send(). Without this, the next request would inherit that
+# request's context (asgiref's executor for the finished thread among it).
+#
+# Streamed responses (the explanation events) are sent chunk by chunk
+# as the WSGI body yields them.
+#
+# The event loop lives as long as the worker, so startup marks it as
+# long-lived. Its gateway client is then kept across requests, and it is
+# closed at shutdown.
+
+import asyncio
+import contextvars
+
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app as flask_app
+from evaluator.gateway import aclose_client, keep_async_client
+
+wsgi_app = WsgiToAsgi(flask_app)
+
+
+async def handle_lifespan(receive, send):
+    while True:
+        message = await receive()
+
+        if message["type"] == "lifespan.startup":
+            keep_async_client()
+            await send({"type": "lifespan.startup.complete"})
+
+        elif message["type"] == "lifespan.shutdown":
+            await aclose_client()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def handle_http(scope, receive, send):
+    async with ThreadSensitiveContext():
+        await wsgi_app(scope, receive, send)
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "http":
+        await contextvars.Context().run(asyncio.ensure_future, handle_http(scope, receive, send))
+    elif scope["type"] == "lifespan":
+        await handle_lifespan(receive, send)
@@ -0,0 +1,165 @@
+# benchmarks/generator.py
+#
+# Seeded generator of realistic `extracted` dicts for benchmarks.
+# Fields and enums are read from schemas/extraction/privacy_v1.json, so
+# new schema fields show up here without changes.
+#
+# The generated data mimics what the chat flow accumulates:
+# - fields are missing (None) with some probability, more often late in
+#   the question order
+# - the LLM occasionally returns the string "null" or a ceiling word
+# - single-bedroom homes leave the between-rooms details empty
+# - every "attached" side gets an attachment_details entry
+
+import copy
+import json
+import random
+from pathlib import Path
+
+SCHEMA_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "evaluator" / "schemas" / "extraction" / "privacy_v1.json"
+)
+
+CEILING_HEIGHTS = (7, 7.5, 8, 8, 8.5, 9, 9, 10)
+CEILING_WORDS = ("low", "normal", "high", "average", "large")
+
+ATTACHMENT_OWNERS = ("own_unit", "neighbor_unit")
+ATTACHMENT_SPACES = ("bedroom", "non_bedroom", "common_area")
+
+SIDE_FIELDS = {
+    "front": "front_open_space",
+    "side_a": "side_a_open_space",
+    "side_b": "side_b_open_space",
+    "back": "back_open_space",
+}
+
+
+def load_schema_fields(path: Path = SCHEMA_PATH) -> dict:
+    """
+    {section: {field: property schema}} from the extraction schema.
+    """
+    with open(path, "r") as f:
+        schema = json.load(f)
+
+    return {
+        section: spec["properties"]
+        for section, spec in schema["parameters"]["properties"].items()
+    }
+
+
+SCHEMA_FIELDS = load_schema_fields()
+
+
+class ExtractionGenerator:
+    """
+    Produces extracted dicts, per-turn updates and confirmed-field sets.
+    Same seed → same sequence.
+    """
+
+    def __init__(self, seed: int = 0, missing_rate: float = 0.2, noise_rate: float = 0.03):
+        self.rng = random.Random(seed)
+        self.missing_rate = missing_rate
+        self.noise_rate = noise_rate
+
+    def field_value(self, field: str, spec: dict):
+        rng = self.rng
+
+        if rng.random() < self.missing_rate:
+            return None
+        if rng.random() < self.noise_rate:
+            return "null"
+
+        if "enum" in spec:
+            return rng.choice(spec["enum"])
+
+        types = spec["type"] if isinstance(spec["type"], list) else [spec["type"]]
+        if "boolean" in types:
+            return rng.random() < 0.5
+        if "number" in types:
+            if rng.random() < self.noise_rate * 3:
+                return rng.choice(CEILING_WORDS)
+            return rng.choice(CEILING_HEIGHTS)
+
+        return None
+
+    def section(self, section: str) -> dict:
+        data = {
+            field: self.field_value(field, spec)
+            for field, spec in SCHEMA_FIELDS[section].items()
+        }
+
+        if section == "privacy_between_rooms" and data.get("has_multiple_bedrooms") is False:
+            for field in data:
+                if field != "has_multiple_bedrooms":
+                    data[field] = None
+
+        return data
+
+    def attachment_details(self, between_units: dict) -> dict:
+        details = {}
+
+        for side, field in SIDE_FIELDS.items():
+            if between_units.get(field) != "attached":
+                continue
+
+            details[side] = {
+                "owner": self.rng.choice(ATTACHMENT_OWNERS),
+                "space_type": self.rng.choice(ATTACHMENT_SPACES + (None,)),
+            }
+
+        return details
+
+    def extraction(self) -> dict:
+        extracted = {}
+
+        for section in SCHEMA_FIELDS:
+            # Whole sections are sometimes not reached yet
+            if self.rng.random() < self.missing_rate / 4:
+                continue
+            extracted[section] = self.section(section)
+
+        between_units = extracted.get("privacy_between_units")
+        if between_units:
+            details = self.attachment_details(between_units)
+            if details:
+                extracted["attachment_details"] = details
+
+        return extracted
+
+    def update(self) -> dict:
+        """
+        A single turn's extraction: one to three fields, mostly in one section.
+        """
+        section = self.rng.choice(list(SCHEMA_FIELDS))
+        fields = SCHEMA_FIELDS[section]
+        chosen = self.rng.sample(list(fields), self.rng.randint(1, min(3, len(fields))))
+
+        return {section: {field: self.field_value(field, fields[field]) for field in chosen}}
+
+    def confirmed(self, extracted: dict) -> set:
+        """
+        Fields the user has explicitly confirmed, as the chat flow records them.
+        """
+        confirmed = set()
+
+        for section, data in extracted.items():
+            if section == "attachment_details" or not data:
+                continue
+            for field, value in data.items():
+                if value is not None and self.rng.random() < 0.7:
+                    confirmed.add((section, field))
+
+        return confirmed
+
+
+def generate_extractions(n: int, seed: int = 0, **kwargs) -> list:
+    generator = ExtractionGenerator(seed, **kwargs)
+    return [generator.extraction() for _ in range(n)]
+
+
+def copies(items: list, count: int) -> list:
+    """
+    Independent deep copies for benchmarks of functions that mutate their input.
+    """
+    return [copy.deepcopy(items) for _ in range(count)]
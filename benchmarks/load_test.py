@@ -0,0 +1,340 @@
+# benchmarks/load_test.py
+#
+# End-to-end load test: scripted multi-turn conversations against the
+# app, with benchmarks/mock_gateway.py standing in for the gateway.
+#
+#   python -m benchmarks.load_test
+#   python -m benchmarks.load_test --workers 1 2 4 --users 50 --duration 60
+#   python -m benchmarks.load_test --server gunicorn --workers 2 4 --threads 8
+#   python -m benchmarks.load_test --target http://127.0.0.1:8000 --gateway http://127.0.0.1:8900
+#
+# The mock gateway is started once. For every --workers count the app is
+# started with that many worker processes, either as deployed
+# (`uvicorn asgi:app`, see render.yaml) or as the WSGI app under gunicorn
+# (`gunicorn app:app`), in a scratch directory so session files and
+# caches start empty. Extraction and explanation caches are off unless
+# --keep-caches, since the scripts repeat the same messages.
+#
+# --users virtual users then replay conversations from
+# benchmarks/conversations.json for --duration seconds, each
+# conversation in a fresh session, exactly as chat.html posts them. Every
+# POST is one turn; the report has p50/p95/p99 turn latency and turns per
+# second for each worker count.
+#
+# With --cassette the app's gateway calls go through a cassette
+# (evaluator/cassette.py):
+#
+#   python -m benchmarks.load_test --cassette runs/a.jsonl --cassette-mode record
+#   python -m benchmarks.load_test --cassette runs/a.jsonl --cassette-mode replay
+#
+# record runs against the mock (or --gateway) and keeps every call;
+# replay starts no gateway at all and answers every call from the
+# cassette, so what is left in the turn latency is the app's own overhead.
+# A replay only hits the cassette for conversations the recording made,
+# so replay with the same --conversations and enough --duration in the
+# recording to have played each of them.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+CONVERSATIONS_PATH = Path(__file__).resolve().parent / "conversations.json"
+
+AJAX = {"X-Requested-With": "XMLHttpRequest"}
+
+
+# -----------------------
+# Processes
+# -----------------------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start(command: list, env: dict, cwd, log_path: Path) -> subprocess.Popen:
+    log = open(log_path, "wb")
+    return subprocess.Popen(command, env=env, cwd=cwd, stdout=log, stderr=subprocess.STDOUT)
+
+
+def stop(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def wait_ready(url: str, process: subprocess.Popen | None, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"{url} exited with {process.returncode} before it was ready")
+        try:
+            httpx.get(url, timeout=2)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+
+def app_command(server: str, port: int, workers: int, threads: int) -> list:
+    if server == "gunicorn":
+        return [
+            sys.executable, "-m", "gunicorn", "app:app",
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(workers),
+            "--threads", str(threads),
+            "--timeout", "120",
+            "--log-level", "warning",
+        ]
+    return [
+        sys.executable, "-m", "uvicorn", "asgi:app",
+        "--host", "127.0.0.1",
+        "--port", str(port),
+        "--workers", str(workers),
+        "--log-level", "warning",
+    ]
+
+
+def app_env(gateway_url: str, keep_caches: bool, cassette: Path | None = None, cassette_mode: str = "record") -> dict:
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])),
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "load-test"),
+        "OPENAI_API_KEY": "mock",
+        "GATEWAY_BASE_URL": gateway_url,
+        "INTENT_LABEL_LOG": "",
+        "FAST_PATH_LOG_EVERY": "0",
+    }
+    if not keep_caches:
+        env.update({
+            "EXTRACTION_CACHE_SIZE": "0",
+            "EXTRACTION_CACHE_PATH": "",
+            "EXPLANATION_CACHE_SIZE": "0",
+            "EXPLANATION_CACHE_PATH": "",
+        })
+    if cassette is not None:
+        env.update({
+            "GATEWAY_CASSETTE": cassette_mode,
+            "GATEWAY_CASSETTE_PATH": str(cassette.resolve()),
+        })
+    return env
+
+
+# -----------------------
+# Load
+# -----------------------
+async def replay(base_url: str, conversations: list, users: int, duration: float, seed: int) -> dict:
+    latencies = []
+    errors = Counter()
+    finished = 0
+    deadline = time.perf_counter() + duration
+
+    async def user(i: int):
+        nonlocal finished
+        rng = random.Random(seed + i)
+        # Spread the first requests over a second
+        await asyncio.sleep(rng.random())
+
+        while time.perf_counter() < deadline:
+            conversation = rng.choice(conversations)
+
+            async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+                try:
+                    await client.get("/")
+
+                    for text in conversation["turns"]:
+                        if time.perf_counter() >= deadline:
+                            return
+
+                        start = time.perf_counter()
+                        response = await client.post("/", data={"message": text}, headers=AJAX)
+                        elapsed = time.perf_counter() - start
+
+                        if response.status_code != 200:
+                            errors[f"HTTP {response.status_code}"] += 1
+                            break
+
+                        latencies.append(elapsed)
+                        if response.json().get("redirect"):
+                            finished += 1
+                            break
+
+                except httpx.HTTPError as e:
+                    errors[type(e).__name__] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(users)))
+    elapsed = time.perf_counter() - started
+
+    return summarize(latencies, elapsed, errors, finished)
+
+
+def summarize(latencies: list, elapsed: float, errors: Counter, finished: int) -> dict:
+    row = {
+        "turns": len(latencies),
+        "seconds": elapsed,
+        "turns_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "errors": dict(errors),
+        "conversations_finished": finished,
+    }
+
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        row.update(p50=cuts[49], p95=cuts[94], p99=cuts[98], max=max(latencies))
+    elif latencies:
+        row.update(p50=latencies[0], p95=latencies[0], p99=latencies[0], max=latencies[0])
+
+    return row
+
+
+# -----------------------
+# Runs
+# -----------------------
+def run_all(args) -> dict:
+    with open(args.conversations, "r") as f:
+        conversations = json.load(f)
+
+    scratch = Path(tempfile.mkdtemp(prefix="load-test-"))
+    processes = []
+    rows = []
+
+    try:
+        gateway_url = args.gateway
+        if replaying(args):
+            # Nothing listens here; a call missing from the cassette fails
+            gateway_url = "http://127.0.0.1:9/v1"
+        elif gateway_url is None:
+            port = free_port()
+            gateway_url = f"http://127.0.0.1:{port}/v1"
+            gateway = start(
+                [
+                    sys.executable, "-m", "benchmarks.mock_gateway",
+                    "--port", str(port),
+                    "--latency", args.latency,
+                    "--token-interval", str(args.token_interval),
+                ],
+                {**os.environ, "PYTHONPATH": str(ROOT)}, ROOT, scratch / "gateway.log",
+            )
+            processes.append(gateway)
+            wait_ready(f"http://127.0.0.1:{port}/", gateway)
+
+        targets = [(None, args.target)] if args.target else [(n, None) for n in args.workers]
+
+        for workers, target in targets:
+            server = None
+            if target is None:
+                port = free_port()
+                target = f"http://127.0.0.1:{port}"
+                cwd = scratch / f"app-{workers}"
+                cwd.mkdir()
+                server = start(
+                    app_command(args.server, port, workers, args.threads),
+                    app_env(gateway_url, args.keep_caches, args.cassette, args.cassette_mode),
+                    cwd, cwd / "server.log",
+                )
+                processes.append(server)
+                wait_ready(target + "/metrics", server)
+
+            row = asyncio.run(replay(target, conversations, args.users, args.duration, args.seed))
+            rows.append({"workers": workers, **row})
+            print_row(rows[-1])
+
+            if server is not None:
+                stop(server)
+                processes.remove(server)
+    finally:
+        for process in processes:
+            stop(process)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    return {
+        "server": "external" if args.target else args.server,
+        "threads": args.threads if args.server == "gunicorn" else None,
+        "users": args.users,
+        "duration": args.duration,
+        "gateway": gateway_label(args),
+        "rows": rows,
+    }
+
+
+def replaying(args) -> bool:
+    return args.cassette is not None and args.cassette_mode == "replay"
+
+
+def gateway_label(args) -> str:
+    if replaying(args):
+        return f"replay {args.cassette}"
+    label = args.gateway or f"mock {args.latency}"
+    if args.cassette is not None:
+        label += f", recording to {args.cassette}"
+    return label
+
+
+HEADER = f"{'workers':>7} {'turns':>7} {'turns/s':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'done':>5}  errors"
+
+
+def print_row(row: dict):
+    workers = "-" if row["workers"] is None else row["workers"]
+    latencies = " ".join(f"{row.get(k, float('nan')):7.3f}" for k in ("p50", "p95", "p99"))
+    errors = ", ".join(f"{k}: {v}" for k, v in row["errors"].items()) or "-"
+    print(
+        f"{workers:>7} {row['turns']:>7} {row['turns_per_second']:>8.1f} {latencies} "
+        f"{row['conversations_finished']:>5}  {errors}",
+        flush=True,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Turn latency and throughput under load, per worker count.")
+    parser.add_argument("--server", choices=("uvicorn", "gunicorn"), default="uvicorn")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker")
+    parser.add_argument("--users", type=int, default=32, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per worker count")
+    parser.add_argument("--latency", default="lognormal:0.8,0.4", help="Mock gateway latency spec")
+    parser.add_argument("--token-interval", type=float, default=0.02, help="Mock gateway seconds per streamed chunk")
+    parser.add_argument("--conversations", type=Path, default=CONVERSATIONS_PATH)
+    parser.add_argument("--keep-caches", action="store_true", help="Leave the extraction / explanation caches on")
+    parser.add_argument("--gateway", help="Use this gateway base URL instead of starting the mock")
+    parser.add_argument("--target", help="Load an already running app at this URL")
+    parser.add_argument("--cassette", type=Path, help="Record gateway calls to / replay them from this file")
+    parser.add_argument("--cassette-mode", choices=("record", "replay"), default="replay")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+    if args.cassette is not None and args.cassette_mode == "replay" and not args.cassette.exists():
+        parser.error(f"no cassette at {args.cassette}")
+
+    print(
+        f"{args.server if not args.target else args.target}, {args.users} users, "
+        f"{args.duration:g}s per run, gateway {gateway_label(args)}\n"
+    )
+    print(HEADER)
+    report = run_all(args)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
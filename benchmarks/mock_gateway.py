@@ -0,0 +1,231 @@
+# benchmarks/mock_gateway.py
+#
+# Local stand-in for the gateway, for load tests that burn no tokens.
+#
+#   python -m benchmarks.mock_gateway --port 8900
+#   python -m benchmarks.mock_gateway --port 8900 --latency lognormal:0.8,0.5 --token-interval 0.02
+#
+# then point the app at it with GATEWAY_BASE_URL=http://127.0.0.1:8900/v1.
+#
+# It answers POST /v1/chat/completions for the subset of the API the app
+# uses:
+# - functions + function_call: a schema-valid extraction for the
+#   function schema that was sent (full, section or field scope). Every
+#   section gets at least one value, the rest are filled or null at random,
+#   seeded by the user message so the same turn gets the same answer.
+# - response_format json_object: an object with one of the options the
+#   system prompt lists ("- owner: own_unit | neighbor_unit | null").
+# - plain messages: "B" for the intent classifier, a canned explanation
+#   otherwise, as server-sent events when "stream" is set (with a final
+#   usage chunk when stream_options.include_usage is set).
+#
+# Latency is drawn per request from --latency:
+#   fixed:S | uniform:LOW,HIGH | lognormal:MEDIAN,SIGMA   (seconds)
+# Streamed answers add --token-interval seconds between chunks.
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import zlib
+
+LABEL_PROMPT = "intent classifier"
+
+EXPLANATION = (
+    "A foyer is a small entry space between the main door and the rest of the home. "
+    "It keeps the living areas and bedrooms out of direct view when the door is open, "
+    "and gives a buffer for noise from the corridor outside."
+)
+
+_JSON_OPTION = re.compile(r"^- (\w+): (.+)$", re.MULTILINE)
+
+settings = {"latency": lambda: 0.0, "token_interval": 0.0, "fill_rate": 0.6}
+
+
+def parse_latency(spec: str):
+    """
+    A function drawing one latency in seconds from a --latency spec.
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",")] if args else []
+
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(values[0], values[1])
+    if kind == "lognormal" and len(values) == 2:
+        return lambda: random.lognormvariate(math.log(values[0]), values[1])
+
+    raise argparse.ArgumentTypeError(f"bad latency spec {spec!r}")
+
+
+def user_text(messages: list) -> str:
+    return next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+
+
+def field_value(spec: dict, rng: random.Random):
+    types = spec["type"] if isinstance(spec["type"], list) else [spec["type"]]
+    if "enum" in spec:
+        return rng.choice([v for v in spec["enum"] if v is not None])
+    if "boolean" in types:
+        return rng.random() < 0.5
+    if "number" in types:
+        return rng.choice([7.5, 8, 9, 10])
+    return None
+
+
+def canned_extraction(function: dict, rng: random.Random) -> dict:
+    arguments = {}
+
+    for section, section_spec in function["parameters"]["properties"].items():
+        fields = section_spec["properties"]
+        filled = {field for field in fields if rng.random() < settings["fill_rate"]}
+        filled.add(rng.choice(list(fields)))
+
+        arguments[section] = {
+            field: field_value(spec, rng) if field in filled else None
+            for field, spec in fields.items()
+        }
+
+    return arguments
+
+
+def canned_json_object(messages: list, rng: random.Random) -> dict:
+    prompt = "\n".join(m["content"] for m in messages if m["role"] == "system")
+    return {
+        key: rng.choice([o.strip() for o in options.split("|") if o.strip() != "null"])
+        for key, options in _JSON_OPTION.findall(prompt)
+    }
+
+
+def completion(body: dict) -> tuple:
+    """
+    (message, finish_reason) for a chat-completions request body.
+    """
+    messages = body["messages"]
+    rng = random.Random(zlib.crc32(user_text(messages).encode()))
+
+    if body.get("functions"):
+        function = body["functions"][0]
+        arguments = json.dumps(canned_extraction(function, rng))
+        return {"role": "assistant", "content": None,
+                "function_call": {"name": function["name"], "arguments": arguments}}, "function_call"
+
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        return {"role": "assistant", "content": json.dumps(canned_json_object(messages, rng))}, "stop"
+
+    if LABEL_PROMPT in messages[0]["content"]:
+        return {"role": "assistant", "content": "B"}, "stop"
+
+    return {"role": "assistant", "content": EXPLANATION}, "stop"
+
+
+def usage(body: dict, message: dict) -> dict:
+    # Roughly 4 characters per token
+    prompt = sum(len(m["content"] or "") for m in body["messages"]) + len(json.dumps(body.get("functions", "")))
+    output = len(message.get("content") or "") + len(json.dumps(message.get("function_call", "")))
+    prompt, output = -(-prompt // 4), -(-output // 4)
+    return {"prompt_tokens": prompt, "completion_tokens": output, "total_tokens": prompt + output}
+
+
+def response_body(body: dict) -> dict:
+    message, finish_reason = completion(body)
+    return {
+        "id": f"chatcmpl-mock{random.getrandbits(32):08x}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": usage(body, message),
+    }
+
+
+def stream_chunks(body: dict):
+    message, finish_reason = completion(body)
+    base = {
+        "id": f"chatcmpl-mock{random.getrandbits(32):08x}",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+    }
+
+    yield {**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]}
+    for word in re.findall(r"\S+\s*", message["content"] or ""):
+        yield {**base, "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}]}
+    yield {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": finish_reason}]}
+    if (body.get("stream_options") or {}).get("include_usage"):
+        yield {**base, "choices": [], "usage": usage(body, message)}
+
+
+async def read_json(receive) -> dict:
+    body = b""
+    more = True
+    while more:
+        message = await receive()
+        body += message.get("body", b"")
+        more = message.get("more_body", False)
+    return json.loads(body or b"{}")
+
+
+async def send_json(send, status: int, payload: dict):
+    data = json.dumps(payload).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(data)).encode())],
+    })
+    await send({"type": "http.response.body", "body": data})
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while (await receive())["type"] != "lifespan.shutdown":
+            await send({"type": "lifespan.startup.complete"})
+        await send({"type": "lifespan.shutdown.complete"})
+        return
+
+    if scope["method"] != "POST" or not scope["path"].endswith("/chat/completions"):
+        await send_json(send, 404, {"error": {"message": "not found"}})
+        return
+
+    body = await read_json(receive)
+    await asyncio.sleep(max(0.0, settings["latency"]()))
+
+    if not body.get("stream"):
+        await send_json(send, 200, response_body(body))
+        return
+
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"text/event-stream"), (b"cache-control", b"no-cache")],
+    })
+    for i, chunk in enumerate(stream_chunks(body)):
+        if i:
+            await asyncio.sleep(settings["token_interval"])
+        data = f"data: {json.dumps(chunk)}\n\n".encode()
+        await send({"type": "http.response.body", "body": data, "more_body": True})
+    await send({"type": "http.response.body", "body": b"data: [DONE]\n\n"})
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Mock chat-completions gateway.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=parse_latency, default=parse_latency("lognormal:0.8,0.4"),
+                        help="fixed:S | uniform:LOW,HIGH | lognormal:MEDIAN,SIGMA (seconds)")
+    parser.add_argument("--token-interval", type=float, default=0.02, help="Seconds between streamed chunks")
+    parser.add_argument("--fill-rate", type=float, default=0.6, help="Share of extraction fields given a value")
+    args = parser.parse_args(argv)
+
+    settings.update(latency=args.latency, token_interval=args.token_interval, fill_rate=args.fill_rate)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# benchmarks/prompt_size.py
+#
+# Prompt size of run_extraction requests, full schema vs scoped schema.
+#
+#   python -m benchmarks.prompt_size
+#   python -m benchmarks.prompt_size --scope field --output benchmarks/results/prompt.json
+#
+# For every kind of turn (opening description, section guidance, each
+# single-field question) the request's messages and function schema are
+# built exactly as run_extraction builds them and their tokens counted
+# with tiktoken's o200k_base (gpt-4o-mini's encoding) when tiktoken is
+# installed, otherwise estimated at 4 characters per token. The
+# "conversation" row is one full questionnaire: the opening, one
+# guidance prompt per section and one question per field.
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from evaluator.extraction_types import SCHEMA_SCOPES, extraction_schema, privacy_schema
+from evaluator.run_extraction import FIELD_GUIDANCE, FIELD_QUESTIONS, extraction_messages
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+def token_counter():
+    """
+    (count(text) -> int, description of the method).
+    """
+    if tiktoken is not None:
+        encoding = tiktoken.get_encoding("o200k_base")
+        return (lambda text: len(encoding.encode(text))), "tiktoken o200k_base"
+    return (lambda text: -(-len(text) // 4)), "estimate (4 chars/token)"
+
+
+def turn_contexts() -> list:
+    """
+    (label, user text, context) for every kind of extraction turn.
+    """
+    turns = [("opening", "2 bhk apartment in a gated society, bedroom faces a wide road", None)]
+
+    for (section, field), question in FIELD_GUIDANCE.items():
+        turns.append((
+            f"{section}.{field}",
+            "it is a corner unit with a park behind",
+            {"last_question": (section, field), "field_question": question},
+        ))
+
+    for section, spec in privacy_schema["parameters"]["properties"].items():
+        for field in spec["properties"]:
+            turns.append((
+                f"{section}.{field}",
+                "not sure, maybe the second option",
+                {"last_question": (section, field), "field_question": FIELD_QUESTIONS.get(field)},
+            ))
+
+    return turns
+
+
+def request_tokens(count, text: str, context, scope: str) -> int:
+    messages = extraction_messages(text, context)
+    schema = extraction_schema(context, scope)
+
+    return (
+        sum(count(message["content"]) for message in messages) +
+        count(json.dumps(schema, separators=(",", ":")))
+    )
+
+
+def measure(scope: str) -> dict:
+    count, method = token_counter()
+    rows = []
+
+    for label, text, context in turn_contexts():
+        full = request_tokens(count, text, context, "full")
+        scoped = request_tokens(count, text, context, scope)
+        rows.append({"turn": label, "full": full, "scoped": scoped, "saved": full - scoped})
+
+    full = sum(row["full"] for row in rows)
+    scoped = sum(row["scoped"] for row in rows)
+
+    return {
+        "scope": scope,
+        "tokenizer": method,
+        "turns": rows,
+        "conversation": {
+            "full": full,
+            "scoped": scoped,
+            "saved": full - scoped,
+            "saved_fraction": (full - scoped) / full if full else 0.0,
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prompt tokens per extraction turn, full vs scoped schema.")
+    parser.add_argument("--scope", choices=SCHEMA_SCOPES, default="section")
+    parser.add_argument("--output", type=Path, help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = measure(args.scope)
+
+    print(f"tokens per request ({report['tokenizer']}), scope={report['scope']}\n")
+    for row in report["turns"]:
+        print(f"{row['turn']:<58} {row['full']:6d} → {row['scoped']:6d}  (-{row['saved']})")
+
+    total = report["conversation"]
+    print(
+        f"\n{'conversation':<58} {total['full']:6d} → {total['scoped']:6d}  "
+        f"(-{total['saved']}, {total['saved_fraction']:.0%})"
+    )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/router.py
+#
+# Per-message cost of the keyword pre-router as the phrase lists grow.
+#
+#   python -m benchmarks.router
+#   python -m benchmarks.router --scales 1 4 16 64 256 --output benchmarks/results/router.json
+#
+# The messages are the intent seed set (evaluator/models/intent_seed.jsonl).
+# At scale k every category of router.PHRASE_SETS gets (k - 1) times its
+# size in extra seeded synthetic phrases. Two ways of finding every
+# matched category are timed on the same phrase sets:
+# - linear: lowercase, then `phrase in text` over each category's list
+#   (what the separate keyword checks did)
+# - automaton: one pass of the compiled Aho–Corasick automaton
+# route()'s memoization is left out of both.
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from evaluator.logic.intent_model import SEED_PATH, read_labelled
+from evaluator.logic.router import PHRASE_SETS, PhraseAutomaton
+
+WORDS = (
+    "room wall door window floor flat house road lane gap hall lobby foyer score "
+    "privacy noise layout side front back unit tool result range check rate how what "
+    "why is does do you this the a my your can will evaluate explain mean"
+).split()
+
+
+def grown_phrase_sets(scale: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    grown = {}
+
+    for category, phrases in PHRASE_SETS.items():
+        extra = [
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 4)))
+            for _ in range(len(phrases) * (scale - 1))
+        ]
+        grown[category] = list(phrases) + extra
+
+    return grown
+
+
+def linear_categories(phrase_sets: dict, text: str) -> frozenset:
+    t = text.lower()
+    return frozenset(
+        category for category, phrases in phrase_sets.items()
+        if any(phrase in t for phrase in phrases)
+    )
+
+
+def time_per_message(route, messages: list, repeat: int) -> float:
+    """
+    Median over repeats of the mean microseconds per message.
+    """
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in messages:
+            route(text)
+        runs.append((time.perf_counter() - start) / len(messages) * 1e6)
+    return statistics.median(runs)
+
+
+def measure(scales: list, repeat: int) -> dict:
+    messages = [text for text, _ in read_labelled(SEED_PATH)]
+    rows = []
+
+    for scale in scales:
+        phrase_sets = grown_phrase_sets(scale)
+        automaton = PhraseAutomaton(phrase_sets)
+
+        # Both must agree before their timings mean anything
+        for text in messages:
+            assert automaton.categories(text.lower()) == linear_categories(phrase_sets, text), text
+
+        rows.append({
+            "scale": scale,
+            "phrases": sum(len(phrases) for phrases in phrase_sets.values()),
+            "states": automaton.size,
+            "linear_us": time_per_message(lambda text: linear_categories(phrase_sets, text), messages, repeat),
+            "automaton_us": time_per_message(lambda text: automaton.categories(text.lower()), messages, repeat),
+        })
+
+    return {"messages": len(messages), "repeat": repeat, "rows": rows}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keyword routing cost per message vs phrase-list size.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = measure(args.scales, args.repeat)
+
+    print(f"µs per message over {report['messages']} messages (median of {report['repeat']})\n")
+    print(f"{'scale':>6} {'phrases':>8} {'states':>7} {'linear':>9} {'automaton':>10}")
+    for row in report["rows"]:
+        print(
+            f"{row['scale']:>6} {row['phrases']:>8} {row['states']:>7} "
+            f"{row['linear_us']:>9.2f} {row['automaton_us']:>10.2f}"
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
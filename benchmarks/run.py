@@ -0,0 +1,260 @@
+# benchmarks/run.py
+#
+# Micro-benchmarks for the scoring and state-machine hot paths.
+#
+#   python -m benchmarks.run
+#   python -m benchmarks.run --n 5000 --repeat 7 --output benchmarks/results/main.json
+#   python -m benchmarks.run --only score_privacy_v1 merge_extraction
+#
+# Every benchmark runs over the same seeded records, so numbers from two
+# commits are comparable. Results are written as JSON (default:
+# benchmarks/results/<commit>.json); compare two files with --compare.
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.generator import ExtractionGenerator, copies
+from evaluator.extraction_types import decode_extraction
+from evaluator.logic.missing_fields import find_next_missing_field
+from evaluator.run_extraction import get_attached_sides, merge_extraction, normalize_extraction
+from evaluator.scoring.privacy_score_v1 import score_privacy_v1
+from evaluator.state import PropertyState
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+# -----------------------
+# Fixtures
+# -----------------------
+def build_fixtures(n: int, seed: int) -> dict:
+    generator = ExtractionGenerator(seed)
+
+    raw = [generator.extraction() for _ in range(n)]
+    normalized = [normalize_extraction(item) for item in copies(raw, 1)[0]]
+
+    return {
+        "raw": raw,
+        "arguments": [json.dumps(item) for item in raw],
+        "normalized": normalized,
+        "updates": [generator.update() for _ in range(n)],
+        "confirmed": [generator.confirmed(item) for item in normalized],
+    }
+
+
+# -----------------------
+# Benchmarks
+# -----------------------
+# Each benchmark takes the fixtures and the repeat count and returns one
+# callable per repeat. Inputs that get mutated are copied up front so
+# copying is not part of the measurement.
+def bench_score_privacy_v1(fixtures, repeat):
+    records = fixtures["normalized"]
+
+    def run():
+        for extracted in records:
+            score_privacy_v1(extracted)
+
+    return [run] * repeat
+
+
+def bench_normalize_extraction(fixtures, repeat):
+    def make_run(records):
+        def run():
+            for extracted in records:
+                normalize_extraction(extracted)
+        return run
+
+    return [make_run(records) for records in copies(fixtures["raw"], repeat)]
+
+
+def bench_decode_extraction(fixtures, repeat):
+    arguments = fixtures["arguments"]
+
+    def run():
+        for text in arguments:
+            decode_extraction(text)
+
+    return [run] * repeat
+
+
+def bench_json_normalize_extraction(fixtures, repeat):
+    # What run_extraction did before decode_extraction
+    arguments = fixtures["arguments"]
+
+    def run():
+        for text in arguments:
+            normalize_extraction(json.loads(text))
+
+    return [run] * repeat
+
+
+def bench_merge_extraction(fixtures, repeat):
+    # The chat turn merges into the session's PropertyState, not a dict
+    updates = fixtures["updates"]
+
+    def make_run(bases):
+        def run():
+            for base, update in zip(bases, updates):
+                merge_extraction(base, update)
+        return run
+
+    return [
+        make_run([PropertyState.from_dict(extracted) for extracted in fixtures["normalized"]])
+        for _ in range(repeat)
+    ]
+
+
+def bench_find_next_missing_field(fixtures, repeat):
+    pairs = list(zip(fixtures["normalized"], fixtures["confirmed"]))
+
+    def run():
+        for extracted, confirmed in pairs:
+            find_next_missing_field(extracted, confirmed)
+
+    return [run] * repeat
+
+
+def bench_get_attached_sides(fixtures, repeat):
+    pairs = [
+        (extracted.get("privacy_between_units", {}), confirmed)
+        for extracted, confirmed in zip(fixtures["normalized"], fixtures["confirmed"])
+    ]
+
+    def run():
+        for between_units, confirmed in pairs:
+            get_attached_sides(between_units, confirmed)
+
+    return [run] * repeat
+
+
+BENCHMARKS = {
+    "score_privacy_v1": bench_score_privacy_v1,
+    "normalize_extraction": bench_normalize_extraction,
+    "decode_extraction": bench_decode_extraction,
+    "json_normalize_extraction": bench_json_normalize_extraction,
+    "merge_extraction": bench_merge_extraction,
+    "find_next_missing_field": bench_find_next_missing_field,
+    "get_attached_sides": bench_get_attached_sides,
+}
+
+
+# -----------------------
+# Runner
+# -----------------------
+def time_runs(runs: list, n: int) -> dict:
+    """
+    Times each run once; reports per-call microseconds.
+    """
+    per_call = []
+
+    for run in runs:
+        started = time.perf_counter()
+        run()
+        per_call.append((time.perf_counter() - started) / n * 1e6)
+
+    return {
+        "calls_per_repeat": n,
+        "repeat": len(runs),
+        "min_us": min(per_call),
+        "median_us": statistics.median(per_call),
+        "mean_us": statistics.fmean(per_call),
+        "stdev_us": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(names, n: int, seed: int, repeat: int, warmup: int = 1) -> dict:
+    fixtures = build_fixtures(n, seed)
+    results = {}
+
+    for name in names:
+        runs = BENCHMARKS[name](fixtures, warmup + repeat)
+        for run in runs[:warmup]:
+            run()
+        results[name] = time_runs(runs[warmup:], n)
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "n": n,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict) -> list:
+    """
+    (name, baseline median, current median, ratio) for benchmarks in both.
+    """
+    rows = []
+
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        rows.append((
+            name,
+            before["median_us"],
+            result["median_us"],
+            result["median_us"] / before["median_us"] if before["median_us"] else float("inf"),
+        ))
+
+    return rows
+
+
+# -----------------------
+# CLI
+# -----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the scoring / state-machine micro-benchmarks.")
+    parser.add_argument("--n", type=int, default=2000, help="Records per repeat")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Subset of benchmarks")
+    parser.add_argument("--output", type=Path, help="Results file (default: results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.only or list(BENCHMARKS), args.n, args.seed, args.repeat)
+
+    output = args.output or RESULTS_DIR / f"{report['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for name, result in report["results"].items():
+        print(f"{name:<28} median {result['median_us']:9.2f} µs/call   min {result['min_us']:9.2f}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+
+        print(f"\nvs {args.compare} ({baseline.get('commit')})")
+        for name, before, after, ratio in compare(baseline, report):
+            print(f"{name:<28} {before:9.2f} → {after:9.2f} µs/call  ({ratio:.2f}x)")
+
+    print(f"\nWrote {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
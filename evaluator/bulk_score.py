@@ -0,0 +1,311 @@
+# evaluator/bulk_score.py
+#
+# Offline bulk scoring of pre-extracted property records.
+#
+#   python -m evaluator.bulk_score records.jsonl -o scores.jsonl
+#   python -m evaluator.bulk_score records.csv -o scores.jsonl --workers 4
+#
+# Records stream through normalize_extraction and scoring in chunks, so
+# memory stays bounded by (chunk size × chunks in flight) regardless of
+# the input size. Results are written as each chunk finishes.
+#
+# Input formats:
+# - JSONL: one extracted dict per line, or {"id": ..., "extracted": {...}}
+# - JSON:  an array of such records (or a single one), read in one go
+# - CSV:   one column per field named "<section>.<field>", attachments as
+#          "attachment_details.<side>.owner" / ".space_type", optional "id"
+#
+# A record that can't be read or scored (malformed JSON line, invalid
+# values) is written as {"id": ..., "error": ...} and the run goes on.
+
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from evaluator.run_extraction import normalize_extraction
+from evaluator.scoring.privacy_score_batch import score_encoded, stack_encoded
+from evaluator.scoring.privacy_score_cached import score_privacy_cached
+from evaluator.state import encode_state
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+# -----------------------
+# Readers
+# -----------------------
+class ReadError(ValueError):
+    """
+    A record the reader couldn't parse; written out as an error result.
+    """
+
+
+def _json_record(record, default_id):
+    if not isinstance(record, dict):
+        return default_id, ReadError(f"expected an object, got {type(record).__name__}")
+    if "extracted" in record:
+        return record.get("id", default_id), record["extracted"]
+    return default_id, record
+
+
+def read_jsonl(path: Path):
+    with open(path, "r") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, ReadError(f"invalid JSON on line {line_no}: {e}")
+                continue
+
+            yield _json_record(record, line_no)
+
+
+def read_json(path: Path):
+    with open(path, "r") as f:
+        records = json.load(f)
+
+    if not isinstance(records, list):
+        records = [records]
+
+    for index, record in enumerate(records, start=1):
+        yield _json_record(record, index)
+
+
+def _csv_value(raw: str):
+    value = raw.strip()
+
+    if value == "" or value.lower() in ("null", "none"):
+        return None
+    if value.lower() == "true":
+        return True
+    if value.lower() == "false":
+        return False
+
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+
+    return int(number) if number.is_integer() else number
+
+
+def read_csv(path: Path):
+    with open(path, "r", newline="") as f:
+        for row_no, row in enumerate(csv.DictReader(f), start=1):
+            record_id = row.pop("id", None) or row_no
+            extracted = {}
+
+            for column, raw in row.items():
+                if column is None or raw is None:
+                    continue
+
+                value = _csv_value(raw)
+                parts = column.split(".")
+
+                if parts[0] == "attachment_details" and len(parts) == 3:
+                    _, side, key = parts
+                    extracted.setdefault("attachment_details", {}).setdefault(side, {})[key] = value
+                elif len(parts) == 2:
+                    section, field = parts
+                    extracted.setdefault(section, {})[field] = value
+
+            # Drop attachment sides with nothing filled in
+            if "attachment_details" in extracted:
+                extracted["attachment_details"] = {
+                    side: info
+                    for side, info in extracted["attachment_details"].items()
+                    if any(v is not None for v in info.values())
+                }
+
+            yield record_id, extracted
+
+
+READERS = {
+    ".jsonl": read_jsonl,
+    ".json": read_json,
+    ".csv": read_csv,
+}
+
+
+# -----------------------
+# Scoring
+# -----------------------
+def chunked(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def score_chunk(chunk: list, explanations: bool = True) -> list:
+    """
+    Normalizes and scores one chunk of (id, extracted) records.
+    Returns one output dict per record, in input order.
+    """
+    results = [None] * len(chunk)
+    valid = []
+
+    for i, (record_id, extracted) in enumerate(chunk):
+        if isinstance(extracted, ReadError):
+            results[i] = {"id": record_id, "error": str(extracted)}
+            continue
+        try:
+            valid.append((i, record_id, normalize_extraction(extracted)))
+        except Exception as e:
+            results[i] = {"id": record_id, "error": str(e)}
+
+    if explanations:
+        for i, record_id, extracted in valid:
+            try:
+                results[i] = {"id": record_id, "score": score_privacy_cached(extracted)}
+            except Exception as e:
+                results[i] = {"id": record_id, "error": str(e)}
+        return results
+
+    # Scores only: encode record by record (so one bad record only fails
+    # itself), then one vectorized pass over the ones that encoded
+    encoded = []
+    rows = []
+    attachment_rows = []
+
+    for i, record_id, extracted in valid:
+        try:
+            codes, attachments = encode_state(extracted)
+        except Exception as e:
+            results[i] = {"id": record_id, "error": str(e)}
+            continue
+        encoded.append((i, record_id))
+        rows.append(codes)
+        attachment_rows.append(attachments)
+
+    batch = score_encoded(*stack_encoded(rows, attachment_rows))
+    for row, (i, record_id) in enumerate(encoded):
+        results[i] = {
+            "id": record_id,
+            "score": {
+                "privacy_score_1_to_10": batch["privacy_score_1_to_10"][row].item(),
+                "confidence": str(batch["confidence"][row]),
+                "breakdown": {
+                    "scale": "0 to 1 (higher is better)",
+                    "privacy_in_room": batch["privacy_in_room"][row].item(),
+                    "privacy_between_rooms": batch["privacy_between_rooms"][row].item(),
+                    "privacy_between_units": batch["privacy_between_units"][row].item(),
+                },
+            },
+        }
+
+    return results
+
+
+def _score_chunk_worker(args):
+    chunk, explanations = args
+    return score_chunk(chunk, explanations)
+
+
+def bounded_map(executor, fn, items, max_in_flight: int):
+    """
+    Like executor.map, but only keeps max_in_flight tasks queued so the
+    input iterator is consumed lazily. Results come back in input order.
+    """
+    pending = deque()
+
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def score_stream(records, chunk_size=DEFAULT_CHUNK_SIZE, workers=0, explanations=True):
+    """
+    Yields one list of results per chunk.
+    workers=0 scores in-process; otherwise chunks fan out to a process pool.
+    """
+    chunks = ((chunk, explanations) for chunk in chunked(records, chunk_size))
+
+    if workers <= 0:
+        for args in chunks:
+            yield _score_chunk_worker(args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from bounded_map(executor, _score_chunk_worker, chunks, max_in_flight=workers * 2)
+
+
+# -----------------------
+# CLI
+# -----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-score pre-extracted property records.")
+    parser.add_argument("input", type=Path, help="JSONL, JSON or CSV file of extracted records")
+    parser.add_argument("-o", "--output", type=Path, help="JSONL output file (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "json", "csv"], help="Override format detection")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=0, help="Process pool size (0 = in-process)")
+    parser.add_argument(
+        "--no-explanations",
+        action="store_true",
+        help="Only scores and breakdown, computed with the vectorized batch scorer",
+    )
+    parser.add_argument("--quiet", action="store_true", help="No progress output")
+    args = parser.parse_args(argv)
+
+    suffix = f".{args.format}" if args.format else args.input.suffix.lower()
+    reader = READERS.get(suffix)
+    if reader is None:
+        parser.error(f"Unsupported input format: {suffix}")
+
+    out = open(args.output, "w") if args.output else sys.stdout
+
+    total = 0
+    errors = 0
+    started = time.perf_counter()
+    chunk_started = started
+
+    try:
+        for results in score_stream(
+            reader(args.input),
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            explanations=not args.no_explanations,
+        ):
+            for result in results:
+                out.write(json.dumps(result) + "\n")
+                if "error" in result:
+                    errors += 1
+
+            now = time.perf_counter()
+            total += len(results)
+
+            if not args.quiet:
+                print(
+                    f"[bulk_score] {total:,} records | chunk {len(results):,} in "
+                    f"{now - chunk_started:.2f}s ({len(results) / max(now - chunk_started, 1e-9):,.0f}/s) | "
+                    f"overall {total / max(now - started, 1e-9):,.0f}/s | errors {errors:,}",
+                    file=sys.stderr,
+                )
+            chunk_started = now
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if not args.quiet:
+        elapsed = time.perf_counter() - started
+        print(f"[bulk_score] done: {total:,} records in {elapsed:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+# evaluator/cache.py
+
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Small bounded LRU map with hit/miss counters.
+    Thread-safe so it can be shared by every request in a worker.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class SQLiteCache:
+    """
+    On-disk key/value cache for JSON-serializable values, shared by all
+    worker processes on the host.
+
+    Entries expire ttl seconds after they were written; when the table
+    grows past max_entries the least recently used rows are dropped.
+    """
+
+    def __init__(self, path, max_entries: int = 100_000, ttl: float = 7 * 24 * 3600):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+        self._conn.commit()
+
+    def get(self, key: str, default=None):
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return default
+
+            value, created = row
+            if now - created > self.ttl:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.expired += 1
+                self.misses += 1
+                return default
+
+            self._conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(value)
+
+    def put(self, key: str, value):
+        now = time.time()
+        payload = json.dumps(value)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self._writes += 1
+
+            # Size/TTL sweep every so often rather than on every write
+            if self._writes % 100 == 0:
+                self._evict(now)
+
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        self.expired += self._conn.execute(
+            "DELETE FROM cache WHERE created < ?", (now - self.ttl,)
+        ).rowcount
+
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self.evictions += self._conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY accessed LIMIT ?)",
+                (excess,),
+            ).rowcount
+
+    def evict(self):
+        """
+        Runs the TTL and size eviction now.
+        """
+        with self._lock:
+            self._evict(time.time())
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+            self.expired = 0
+            self.evictions = 0
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "size": len(self),
+            "max_entries": self.max_entries,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class TieredCache:
+    """
+    LRU in front of SQLite. The SQLite connection is opened lazily and
+    per process, so creating one has no side effects and forked
+    workers don't share a connection.
+    """
+
+    def __init__(self, maxsize: int, path: str, max_entries: int, ttl: float):
+        self.memory = LRUCache(maxsize=maxsize)
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stores = 0
+        self._disk = None
+        self._disk_pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def disk(self) -> SQLiteCache | None:
+        if not self.path:
+            return None
+
+        if self._disk is None or self._disk_pid != os.getpid():
+            with self._lock:
+                if self._disk is None or self._disk_pid != os.getpid():
+                    self._disk = SQLiteCache(self.path, self.max_entries, self.ttl)
+                    self._disk_pid = os.getpid()
+
+        return self._disk
+
+    def get(self, key: str):
+        value = self.memory.get(key)
+
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.put(key, value)
+
+        # Callers may mutate the value
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: dict):
+        self.stores += 1
+        self.memory.put(key, copy.deepcopy(value))
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def clear(self):
+        self.memory.clear()
+        self.stores = 0
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> dict:
+        memory = self.memory.stats()
+        disk = self.disk.stats() if self.disk is not None else None
+
+        lookups = memory["hits"] + memory["misses"]
+        hits = memory["hits"] + (disk["hits"] if disk else 0)
+
+        return {
+            "lookups": lookups,
+            "hits": hits,
+            # Every hit is a gateway round trip saved
+            "gateway_calls_saved": hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "memory": memory,
+            "disk": disk,
+        }
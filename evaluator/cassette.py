@@ -0,0 +1,199 @@
+# evaluator/cassette.py
+#
+# Record / replay of gateway calls.
+#
+# With GATEWAY_CASSETTE=record every chat completion made through
+# evaluator.gateway (run_extraction, extract_attachment_info,
+# explain_concept, classify_with_llm) is appended to a JSONL cassette,
+# keyed by a hash of the request. With GATEWAY_CASSETTE=replay the same
+# requests are answered from the cassette and nothing goes to the
+# network; a request that was never recorded raises CassetteMiss.
+#
+# Each line holds one call:
+#   {"key": ..., "operation": ..., "response": {...}}        or
+#   {"key": ..., "operation": ..., "chunks": [{...}, ...]}   (stream=True)
+# with responses dumped without their null fields. A request already on
+# the cassette is not written again; if several processes recorded the
+# same key, the last line wins.
+#
+# Records are appended with one write() per line, so several worker
+# processes can record into the same file.
+#
+# Configuration (environment):
+#   GATEWAY_CASSETTE        off | record | replay (default off)
+#   GATEWAY_CASSETTE_PATH   (default ./cache/gateway_cassette.jsonl)
+
+import hashlib
+import json
+import os
+import threading
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+CASSETTE_MODES = ("off", "record", "replay")
+
+GATEWAY_CASSETTE = os.getenv("GATEWAY_CASSETTE", "off")
+GATEWAY_CASSETTE_PATH = os.getenv("GATEWAY_CASSETTE_PATH", "./cache/gateway_cassette.jsonl")
+
+if GATEWAY_CASSETTE not in CASSETTE_MODES:
+    raise RuntimeError(f"GATEWAY_CASSETTE must be one of {', '.join(CASSETTE_MODES)}")
+
+# Per-call transport options that don't change the answer
+_UNKEYED = {"extra_headers", "timeout"}
+
+
+class CassetteMiss(LookupError):
+    """
+    Replay mode got a request that is not on the cassette.
+    """
+
+
+def request_key(model: str, messages: list, kwargs: dict) -> str:
+    request = {
+        "model": model,
+        "messages": messages,
+        **{k: v for k, v in kwargs.items() if k not in _UNKEYED},
+    }
+    encoded = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _dump(model) -> dict:
+    return model.model_dump(mode="json", exclude_none=True)
+
+
+class ReplayedStream:
+    """
+    Stands in for openai's Stream / AsyncStream: a context manager that
+    iterates (sync or async) over the recorded chunks.
+    """
+
+    def __init__(self, chunks: list):
+        self.chunks = [ChatCompletionChunk.model_validate(chunk) for chunk in chunks]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    def close(self):
+        pass
+
+
+class RecordingStream:
+    """
+    Wraps a live stream; once it has been read to the end, its chunks are
+    recorded.
+    """
+
+    def __init__(self, cassette: "Cassette", key: str, operation: str, stream):
+        self.cassette = cassette
+        self.key = key
+        self.operation = operation
+        self.stream = stream
+        self.chunks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stream.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stream.close()
+
+    def __iter__(self):
+        for chunk in self.stream:
+            self.chunks.append(_dump(chunk))
+            yield chunk
+        self.cassette.add({"key": self.key, "operation": self.operation, "chunks": self.chunks})
+
+    async def __aiter__(self):
+        async for chunk in self.stream:
+            self.chunks.append(_dump(chunk))
+            yield chunk
+        self.cassette.add({"key": self.key, "operation": self.operation, "chunks": self.chunks})
+
+    def close(self):
+        return self.stream.close()
+
+
+class Cassette:
+    def __init__(self, path: str):
+        self.path = path
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def entries(self) -> dict:
+        """
+        {key: recorded line}, read on first use.
+        """
+        if self._entries is None:
+            with self._lock:
+                if self._entries is None:
+                    entries = {}
+                    if os.path.exists(self.path):
+                        with open(self.path, "r") as f:
+                            for line in f:
+                                if line.strip():
+                                    entry = json.loads(line)
+                                    entries[entry["key"]] = entry
+                    self._entries = entries
+        return self._entries
+
+    def add(self, entry: dict):
+        entries = self.entries()
+        with self._lock:
+            if entry["key"] in entries:
+                return
+            entries[entry["key"]] = entry
+        self.write(entry)
+
+    def write(self, entry: dict):
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode()
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def record(self, key: str, operation: str, response):
+        """
+        Records a live response; streams are recorded once consumed.
+        Returns what the caller should use in place of the response.
+        """
+        if isinstance(response, ChatCompletion):
+            self.add({"key": key, "operation": operation, "response": _dump(response)})
+            return response
+        return RecordingStream(self, key, operation, response)
+
+    def replay(self, key: str, operation: str):
+        entry = self.entries().get(key)
+        if entry is None:
+            raise CassetteMiss(f"{operation} request {key[:12]} is not on cassette {self.path}")
+
+        if "chunks" in entry:
+            return ReplayedStream(entry["chunks"])
+        return ChatCompletion.model_validate(entry["response"])
+
+
+cassette = Cassette(GATEWAY_CASSETTE_PATH)
@@ -0,0 +1,48 @@
+# evaluator/explanation_cache.py
+#
+# Answer cache for explain_concept questions outside the glossary.
+#
+# Keyed by the concept phrase (logic/concepts.concept_phrase), so "what
+# is a duplex?" and "duplex?" share one entry, in the same two tiers as
+# the extraction cache (evaluator.cache.TieredCache).
+#
+# Configuration (environment):
+#   EXPLANATION_CACHE_SIZE         in-process entries (default 512, 0 = off)
+#   EXPLANATION_CACHE_PATH         SQLite file (default ./cache/explanations.sqlite,
+#                                  empty = no disk tier)
+#   EXPLANATION_CACHE_MAX_ENTRIES  disk rows kept (default 10000)
+#   EXPLANATION_CACHE_TTL          disk entry lifetime in seconds (default 30 days)
+
+import hashlib
+import json
+import os
+
+from evaluator.cache import TieredCache
+
+# Bump when the explain_concept prompt changes meaningfully
+EXPLAIN_PROMPT_VERSION = "1"
+
+EXPLANATION_CACHE_SIZE = int(os.getenv("EXPLANATION_CACHE_SIZE", "512"))
+EXPLANATION_CACHE_PATH = os.getenv("EXPLANATION_CACHE_PATH", "./cache/explanations.sqlite")
+EXPLANATION_CACHE_MAX_ENTRIES = int(os.getenv("EXPLANATION_CACHE_MAX_ENTRIES", "10000"))
+EXPLANATION_CACHE_TTL = float(os.getenv("EXPLANATION_CACHE_TTL", str(30 * 24 * 3600)))
+
+
+def explanation_cache_key(phrase: str) -> str:
+    key = json.dumps([phrase, EXPLAIN_PROMPT_VERSION], separators=(",", ":"))
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+explanation_cache = TieredCache(
+    maxsize=EXPLANATION_CACHE_SIZE,
+    path=EXPLANATION_CACHE_PATH,
+    max_entries=EXPLANATION_CACHE_MAX_ENTRIES,
+    ttl=EXPLANATION_CACHE_TTL,
+)
+
+
+def explanation_cache_info() -> dict:
+    """
+    Hit/miss counters for both tiers.
+    """
+    return explanation_cache.stats()
@@ -0,0 +1,75 @@
+# evaluator/extraction_cache.py
+#
+# Response cache for run_extraction.
+#
+# Short answers repeat across sessions ("small" to room_size, "yes" to
+# is_in_gated_society), so the extraction for
+#   (normalized text, last_question, schema version, prompt version,
+#    schema scope)
+# is cached in two tiers:
+# - an in-process LRU
+# - a SQLite file shared by every worker on the host, with TTL and
+#   size eviction
+# (evaluator.cache.TieredCache)
+#
+# Configuration (environment):
+#   EXTRACTION_CACHE_SIZE         in-process entries (default 2048, 0 = off)
+#   EXTRACTION_CACHE_PATH         SQLite file (default ./cache/extraction.sqlite,
+#                                 empty = no disk tier)
+#   EXTRACTION_CACHE_MAX_ENTRIES  disk rows kept (default 100000)
+#   EXTRACTION_CACHE_TTL          disk entry lifetime in seconds (default 7 days)
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+
+from evaluator.cache import TieredCache
+from evaluator.extraction_types import SCHEMA_VERSION, schema_scope
+
+# Bump when the run_extraction prompt changes meaningfully
+PROMPT_VERSION = "1"
+
+EXTRACTION_CACHE_SIZE = int(os.getenv("EXTRACTION_CACHE_SIZE", "2048"))
+EXTRACTION_CACHE_PATH = os.getenv("EXTRACTION_CACHE_PATH", "./cache/extraction.sqlite")
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "100000"))
+EXTRACTION_CACHE_TTL = float(os.getenv("EXTRACTION_CACHE_TTL", str(7 * 24 * 3600)))
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " .,!?;:'\"`"
+
+
+def normalize_text(text: str) -> str:
+    """
+    Case, spacing and trailing punctuation don't change the extraction.
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    return _WHITESPACE.sub(" ", text).strip(_EDGE_PUNCTUATION)
+
+
+def extraction_cache_key(text: str, context: dict | None = None) -> str:
+    last_question = None
+    if context and context.get("last_question"):
+        last_question = list(context["last_question"])
+
+    key = json.dumps(
+        [normalize_text(text), last_question, SCHEMA_VERSION, PROMPT_VERSION, schema_scope(context)],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+extraction_cache = TieredCache(
+    maxsize=EXTRACTION_CACHE_SIZE,
+    path=EXTRACTION_CACHE_PATH,
+    max_entries=EXTRACTION_CACHE_MAX_ENTRIES,
+    ttl=EXTRACTION_CACHE_TTL,
+)
+
+
+def extraction_cache_info() -> dict:
+    """
+    Hit/miss counters for both tiers.
+    """
+    return extraction_cache.stats()
@@ -0,0 +1,316 @@
+# evaluator/extraction_types.py
+#
+# Typed decoding of the extraction function-call arguments.
+#
+# msgspec Structs are generated from schemas/extraction/privacy_v1.json:
+# each section becomes a Struct, enum fields become Literal types. One
+# decode call then parses, validates and normalizes the LLM output:
+# - unknown sections/fields are dropped (what ALLOWED_FIELDS filters)
+# - the string "null" becomes None
+# - numeric strings ("9", "8.5") become numbers and ceiling words
+#   ("low", "average", "high", ...) become feet; any other string in a
+#   number field is dropped and reported like an invalid enum value
+# - a stray top-level apartment_entry_buffer moves into its section
+# - values outside an enum are rejected instead of reaching scoring
+#
+# The result is the same dict shape normalize_extraction produces.
+#
+# extraction_schema prunes the function schema sent with a
+# field-specific question (see EXTRACTION_SCHEMA_SCOPE). The decoder
+# accepts the pruned output unchanged: sections left out are just unset.
+
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Literal, Union
+
+import msgspec
+
+SCHEMA_PATH = Path(__file__).resolve().parent / "schemas" / "extraction" / "privacy_v1.json"
+
+with open(SCHEMA_PATH, "r") as f:
+    privacy_schema = json.load(f)
+
+# Changes whenever the schema does; part of the extraction cache key
+SCHEMA_VERSION = hashlib.sha256(
+    json.dumps(privacy_schema, sort_keys=True).encode()
+).hexdigest()[:12]
+
+# What run_extraction sends when last_question names one field:
+#   full     the whole schema, every turn
+#   section  only the asked field's section (default)
+#   field    only the asked field, inside its section
+# The opening description and "__entire_section__" prompts always get
+# the whole schema.
+EXTRACTION_SCHEMA_SCOPE = os.getenv("EXTRACTION_SCHEMA_SCOPE", "section")
+SCHEMA_SCOPES = ("full", "section", "field")
+
+if EXTRACTION_SCHEMA_SCOPE not in SCHEMA_SCOPES:
+    raise RuntimeError(f"EXTRACTION_SCHEMA_SCOPE must be one of {SCHEMA_SCOPES}")
+
+# Same mapping as normalize_extraction
+CEILING_WORDS = {
+    "small": 7,
+    "low": 7,
+    "average": 8,
+    "normal": 8,
+    "large": 9,
+    "high": 9,
+}
+
+_NUMBER = re.compile(r"\d+(\.\d+)?")
+
+Unset = msgspec.UnsetType
+UNSET = msgspec.UNSET
+
+# Number fields __post_init__ couldn't read, for the running decode
+_rejected_numbers = contextvars.ContextVar("rejected_numbers", default=None)
+
+
+# -----------------------
+# Struct generation
+# -----------------------
+def _field_type(spec: dict):
+    types = spec["type"] if isinstance(spec["type"], list) else [spec["type"]]
+
+    if "enum" in spec:
+        return Union[Literal[tuple(spec["enum"]) + ("null",)], None, Unset]
+    if "boolean" in types:
+        return Union[bool, Literal["null"], None, Unset]
+    if "number" in types:
+        # Strings are parsed, mapped or rejected in __post_init__
+        return Union[int, float, str, None, Unset]
+    return Union[str, None, Unset]
+
+
+def _parse_number(value: str):
+    """
+    A number field's string value in feet, or None if it isn't one.
+    """
+    value = value.strip().lower()
+
+    if _NUMBER.fullmatch(value):
+        number = float(value)
+        return int(number) if number.is_integer() else number
+    return CEILING_WORDS.get(value)
+
+
+def _section_post_init(self):
+    for field in self.__struct_fields__:
+        value = getattr(self, field)
+
+        if value == "null":
+            setattr(self, field, None)
+
+        elif field in self.__number_fields__ and isinstance(value, str):
+            number = _parse_number(value)
+            setattr(self, field, number)
+
+            rejected = _rejected_numbers.get()
+            if number is None and rejected is not None:
+                rejected.append(f"{self.__section__}.{field}")
+
+
+def _struct_name(section: str) -> str:
+    return "".join(part.title() for part in section.split("_"))
+
+
+def build_section_struct(section: str, properties: dict):
+    return msgspec.defstruct(
+        _struct_name(section),
+        [(field, _field_type(spec), UNSET) for field, spec in properties.items()],
+        namespace={
+            "__post_init__": _section_post_init,
+            "__section__": section,
+            "__number_fields__": frozenset(
+                field for field, spec in properties.items() if "number" in spec["type"]
+            ),
+        },
+    )
+
+
+SECTION_STRUCTS = {
+    section: build_section_struct(section, spec["properties"])
+    for section, spec in privacy_schema["parameters"]["properties"].items()
+}
+
+_ENTRY_BUFFER_SPEC = (
+    privacy_schema["parameters"]["properties"]["privacy_between_units"]
+    ["properties"]["apartment_entry_buffer"]
+)
+
+
+def _extraction_post_init(self):
+    # A null section means "asked about, nothing known"
+    for section, struct in SECTION_STRUCTS.items():
+        if getattr(self, section) is None:
+            setattr(self, section, struct())
+
+    # The model sometimes puts this field at the top level
+    if self.apartment_entry_buffer is not UNSET:
+        between_units = self.privacy_between_units
+        if between_units is UNSET:
+            between_units = SECTION_STRUCTS["privacy_between_units"]()
+            self.privacy_between_units = between_units
+
+        between_units.apartment_entry_buffer = self.apartment_entry_buffer
+        self.apartment_entry_buffer = UNSET
+
+
+PrivacyExtraction = msgspec.defstruct(
+    "PrivacyExtraction",
+    [
+        (section, Union[struct, None, Unset], UNSET)
+        for section, struct in SECTION_STRUCTS.items()
+    ] + [
+        ("apartment_entry_buffer", _field_type(_ENTRY_BUFFER_SPEC), UNSET),
+    ],
+    namespace={"__post_init__": _extraction_post_init},
+)
+
+_decoder = msgspec.json.Decoder(PrivacyExtraction)
+
+
+# -----------------------
+# Decoding
+# -----------------------
+_ERROR_PATH = re.compile(r"at `\$\.([\w.]+)`")
+
+
+def _drop_path(data: dict, path: str) -> bool:
+    *parents, key = path.split(".")
+
+    for part in parents:
+        data = data.get(part) if isinstance(data, dict) else None
+    if not isinstance(data, dict) or key not in data:
+        return False
+
+    del data[key]
+    return True
+
+
+def _decode_checked(decode, *args):
+    """
+    Runs one decode attempt. Returns the extraction and the number fields
+    __post_init__ rejected while building it.
+    """
+    rejected_numbers = []
+    token = _rejected_numbers.set(rejected_numbers)
+    try:
+        return decode(*args), rejected_numbers
+    finally:
+        _rejected_numbers.reset(token)
+
+
+def _decoded(extraction, rejected_numbers, rejected) -> dict:
+    if rejected is not None:
+        rejected.extend(rejected_numbers)
+    return msgspec.to_builtins(extraction)
+
+
+def decode_extraction(arguments, rejected: list | None = None) -> dict:
+    """
+    Decodes function-call arguments (JSON str/bytes) into a normalized
+    extracted dict.
+
+    A value that fails validation (e.g. an invalid enum value, or a
+    number field that is neither a number nor a ceiling word) is dropped
+    and the rest of the message kept; its path is appended to `rejected`
+    if given. Malformed JSON raises msgspec.DecodeError.
+    """
+    try:
+        return _decoded(*_decode_checked(_decoder.decode, arguments), rejected)
+    except msgspec.ValidationError as e:
+        error = e
+
+    data = msgspec.json.decode(arguments)
+
+    while True:
+        match = _ERROR_PATH.search(str(error))
+        if match is None or not _drop_path(data, match.group(1)):
+            # Not a field-level problem (e.g. top level isn't an object)
+            raise error
+
+        if rejected is not None:
+            rejected.append(match.group(1))
+
+        try:
+            return _decoded(*_decode_checked(msgspec.convert, data, PrivacyExtraction), rejected)
+        except msgspec.ValidationError as e:
+            error = e
+
+
+# -----------------------
+# Schema scoping
+# -----------------------
+_SECTION_OF = {
+    field: section
+    for section, spec in privacy_schema["parameters"]["properties"].items()
+    for field in spec["properties"]
+}
+
+
+def schema_scope(context: dict | None, scope: str = EXTRACTION_SCHEMA_SCOPE) -> str:
+    """
+    The scope actually used for a run_extraction context.
+    """
+    if not context or not context.get("last_question"):
+        return "full"
+
+    _, field = context["last_question"]
+    if field not in _SECTION_OF:
+        # "__entire_section__" guidance
+        return "full"
+
+    return scope
+
+
+def _pruned_schema(section: str, fields=None) -> dict:
+    section_spec = privacy_schema["parameters"]["properties"][section]
+
+    properties = section_spec["properties"]
+    if fields is not None:
+        properties = {field: properties[field] for field in fields}
+
+    return {
+        **privacy_schema,
+        "parameters": {
+            **privacy_schema["parameters"],
+            "properties": {section: {**section_spec, "properties": properties}},
+        },
+    }
+
+
+# One schema per section, for extracting the sections separately
+SECTION_SCHEMAS = {
+    section: _pruned_schema(section)
+    for section in privacy_schema["parameters"]["properties"]
+}
+
+
+@functools.lru_cache(maxsize=None)
+def scoped_schema(field: str, scope: str) -> dict:
+    """
+    privacy_schema reduced to `field`'s section, or to the field alone.
+    """
+    section = _SECTION_OF[field]
+
+    if scope == "field":
+        return _pruned_schema(section, [field])
+    return SECTION_SCHEMAS[section]
+
+
+def extraction_schema(context: dict | None, scope: str = EXTRACTION_SCHEMA_SCOPE) -> dict:
+    """
+    The function schema to send for a run_extraction context.
+    """
+    scope = schema_scope(context, scope)
+    if scope == "full":
+        return privacy_schema
+
+    _, field = context["last_question"]
+    return scoped_schema(field, scope)
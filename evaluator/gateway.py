@@ -0,0 +1,267 @@
+# evaluator/gateway.py
+#
+# One OpenAI client for every gateway call in the process.
+#
+# The client sits on an explicitly sized httpx pool with keep-alive, so a
+# gunicorn worker holds at most GATEWAY_MAX_CONNECTIONS sockets and reuses
+# TLS sessions across requests. The client offers HTTP/2 (h2 is in
+# requirements.txt). Over TLS it is used when the gateway agrees to it
+# (ALPN). Plain http:// URLs, GATEWAY_HTTP2=0, or an install without h2
+# use HTTP/1.1. The static gateway headers are set once as default
+# headers instead of being passed on every call.
+#
+# The client is created lazily on first use, and again after a fork, so
+# importing this module needs no API key and workers never share sockets.
+#
+# Every call is timed and its token usage counted under an `operation`
+# label (evaluator.metrics).
+#
+# GATEWAY_CASSETTE=record / replay records every call to a cassette file
+# or answers it from one without touching the network (evaluator.cassette).
+#
+# achat_completion is the asyncio counterpart. An AsyncOpenAI client is
+# tied to the event loop it was created on, so there is one per loop.
+# Under the ASGI entry point (asgi.py), the server's loop is marked with
+# keep_async_client, and its client is one pooled client per worker.
+# Under a WSGI server, each async view runs on a new loop. The app calls
+# release_async_client when that view finishes, which closes the
+# request's client and its connections.
+#
+# Configuration (environment):
+#   OPENAI_API_KEY
+#   GATEWAY_BASE_URL                (default https://dncgateway.com/v1)
+#   GATEWAY_MAX_CONNECTIONS         pool size per process (default 20)
+#   GATEWAY_MAX_KEEPALIVE           idle connections kept (default 10)
+#   GATEWAY_KEEPALIVE_EXPIRY        idle seconds before closing (default 60)
+#   GATEWAY_CONNECT_TIMEOUT / GATEWAY_READ_TIMEOUT /
+#   GATEWAY_WRITE_TIMEOUT / GATEWAY_POOL_TIMEOUT   seconds
+#   GATEWAY_MAX_RETRIES             (default 2)
+#   GATEWAY_HTTP2                   "0" to force HTTP/1.1
+#   GATEWAY_CASSETTE / GATEWAY_CASSETTE_PATH   see evaluator/cassette.py
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, OpenAI
+
+from evaluator.cassette import GATEWAY_CASSETTE, cassette, request_key
+from evaluator.metrics import GATEWAY_ERRORS, GATEWAY_SECONDS, record_usage
+
+load_dotenv()
+
+GATEWAY_BASE_URL = os.getenv("GATEWAY_BASE_URL", "https://dncgateway.com/v1")
+GATEWAY_MAX_CONNECTIONS = int(os.getenv("GATEWAY_MAX_CONNECTIONS", "20"))
+GATEWAY_MAX_KEEPALIVE = int(os.getenv("GATEWAY_MAX_KEEPALIVE", "10"))
+GATEWAY_KEEPALIVE_EXPIRY = float(os.getenv("GATEWAY_KEEPALIVE_EXPIRY", "60"))
+GATEWAY_CONNECT_TIMEOUT = float(os.getenv("GATEWAY_CONNECT_TIMEOUT", "5"))
+GATEWAY_READ_TIMEOUT = float(os.getenv("GATEWAY_READ_TIMEOUT", "30"))
+GATEWAY_WRITE_TIMEOUT = float(os.getenv("GATEWAY_WRITE_TIMEOUT", "10"))
+GATEWAY_POOL_TIMEOUT = float(os.getenv("GATEWAY_POOL_TIMEOUT", "5"))
+GATEWAY_MAX_RETRIES = int(os.getenv("GATEWAY_MAX_RETRIES", "2"))
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+DEFAULT_HEADERS = {
+    "X-API-Key": "usr_8f3a91c2d7",
+    "X-App-Id": "dnc-property-evaluator",
+    # optional for now:
+    # "X-User-Id": "aman"
+}
+
+# Per-call header for the endpoints that asked for uncompressed responses
+IDENTITY_ENCODING = {"Accept-Encoding": "identity"}
+
+
+def http2_available() -> bool:
+    if os.getenv("GATEWAY_HTTP2", "1") == "0":
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        connect=GATEWAY_CONNECT_TIMEOUT,
+        read=GATEWAY_READ_TIMEOUT,
+        write=GATEWAY_WRITE_TIMEOUT,
+        pool=GATEWAY_POOL_TIMEOUT,
+    )
+
+
+def build_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=GATEWAY_MAX_CONNECTIONS,
+        max_keepalive_connections=GATEWAY_MAX_KEEPALIVE,
+        keepalive_expiry=GATEWAY_KEEPALIVE_EXPIRY,
+    )
+
+
+def build_http_client() -> httpx.Client:
+    return httpx.Client(
+        http2=http2_available(),
+        limits=build_limits(),
+        timeout=build_timeout(),
+    )
+
+
+def build_async_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=http2_available(),
+        limits=build_limits(),
+        timeout=build_timeout(),
+    )
+
+
+_client = None
+_client_pid = None
+_lock = threading.Lock()
+
+
+def get_client() -> OpenAI:
+    """
+    The process-wide gateway client.
+    """
+    global _client, _client_pid
+
+    if _client is None or _client_pid != os.getpid():
+        with _lock:
+            if _client is None or _client_pid != os.getpid():
+                _client = OpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    base_url=GATEWAY_BASE_URL,
+                    default_headers=DEFAULT_HEADERS,
+                    max_retries=GATEWAY_MAX_RETRIES,
+                    # The SDK sends its own per-request timeout otherwise
+                    timeout=build_timeout(),
+                    http_client=build_http_client(),
+                )
+                _client_pid = os.getpid()
+
+    return _client
+
+
+def close_client():
+    global _client, _client_pid
+
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+
+
+def chat_completion(messages: list, model: str = DEFAULT_MODEL, operation: str = "other", **kwargs):
+    """
+    client.chat.completions.create on the shared client.
+    """
+    start = time.perf_counter()
+    try:
+        if GATEWAY_CASSETTE == "off":
+            response = get_client().chat.completions.create(model=model, messages=messages, **kwargs)
+        else:
+            key = request_key(model, messages, kwargs)
+            if GATEWAY_CASSETTE == "replay":
+                response = cassette.replay(key, operation)
+            else:
+                response = cassette.record(
+                    key, operation,
+                    get_client().chat.completions.create(model=model, messages=messages, **kwargs),
+                )
+    except Exception as e:
+        GATEWAY_ERRORS.inc(operation, type(e).__name__)
+        raise
+    finally:
+        GATEWAY_SECONDS.observe(time.perf_counter() - start, operation)
+
+    record_usage(operation, response)
+    return response
+
+
+# -----------------------
+# asyncio
+# -----------------------
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> AsyncOpenAI:
+    """
+    The gateway client for the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+
+    client = _async_clients.get(loop)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            base_url=GATEWAY_BASE_URL,
+            default_headers=DEFAULT_HEADERS,
+            max_retries=GATEWAY_MAX_RETRIES,
+            timeout=build_timeout(),
+            http_client=build_async_http_client(),
+        )
+        _async_clients[loop] = client
+
+    return client
+
+
+# Loops that outlive a request (the ASGI server's)
+_kept_loops = weakref.WeakSet()
+
+
+def keep_async_client():
+    """
+    Keeps the running loop's client across requests, until aclose_client.
+    """
+    _kept_loops.add(asyncio.get_running_loop())
+
+
+async def aclose_client():
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+async def release_async_client():
+    """
+    End of a request: closes the running loop's client, unless the loop
+    is kept (keep_async_client).
+    """
+    if asyncio.get_running_loop() not in _kept_loops:
+        await aclose_client()
+
+
+async def achat_completion(messages: list, model: str = DEFAULT_MODEL, operation: str = "other", **kwargs):
+    """
+    chat_completion without blocking the event loop.
+    """
+    start = time.perf_counter()
+    try:
+        if GATEWAY_CASSETTE == "off":
+            response = await get_async_client().chat.completions.create(
+                model=model, messages=messages, **kwargs
+            )
+        else:
+            key = request_key(model, messages, kwargs)
+            if GATEWAY_CASSETTE == "replay":
+                response = cassette.replay(key, operation)
+            else:
+                response = cassette.record(
+                    key, operation,
+                    await get_async_client().chat.completions.create(model=model, messages=messages, **kwargs),
+                )
+    except Exception as e:
+        GATEWAY_ERRORS.inc(operation, type(e).__name__)
+        raise
+    finally:
+        GATEWAY_SECONDS.observe(time.perf_counter() - start, operation)
+
+    record_usage(operation, response)
+    return response
@@ -0,0 +1,97 @@
+# logic/concepts.py
+#
+# Concept normalizer and glossary for explain_concept.
+#
+# Concept questions come from a small closed vocabulary (the terms used
+# in FIELD_QUESTIONS / FIELD_GUIDANCE), asked in many ways: "what is a
+# foyer?", "foyer?", "meaning of foyer", "whats a foyr". normalize_concept
+# strips the question wording and maps what is left to a canonical
+# glossary term (exact alias, singular form, or a close difflib match).
+#
+# glossary/privacy_v1.json holds a written answer for every term, so
+# those questions are answered without a gateway call. Anything else is
+# keyed by the stripped concept phrase (see explanation_cache).
+
+import difflib
+import functools
+import json
+import re
+from pathlib import Path
+
+from evaluator.extraction_cache import normalize_text
+from evaluator.logic.field_resolver import phrase_words
+
+GLOSSARY_PATH = Path(__file__).resolve().parent.parent / "glossary" / "privacy_v1.json"
+
+with open(GLOSSARY_PATH, "r") as f:
+    glossary = json.load(f)
+
+GLOSSARY_VERSION = glossary["version"]
+
+# {term: answer}
+GLOSSARY = {term: entry["answer"] for term, entry in glossary["terms"].items()}
+
+# {alias: term}, aliases in phrase_words form
+CONCEPT_ALIASES = {
+    phrase_words(alias): term
+    for term, entry in glossary["terms"].items()
+    for alias in [term] + entry["aliases"]
+}
+
+FUZZY_CUTOFF = 0.88
+
+# Question wording around the concept, in phrase_words form
+_LEADING = re.compile(
+    r"^(?:(?:can you |could you |please )?"
+    r"(?:what is meant by|what do you mean by|what does|what do|what is|what are|whats|what s|"
+    r"meaning of|definition of|define|explain|tell me about|what)\s+)?"
+    r"(?:(?:a|an|the|by)\s+)?"
+)
+_TRAILING = re.compile(r"(?:(?:^|\s+)(?:mean|means|meaning|is|stand for|refer to|exactly))+$")
+
+
+def concept_phrase(user_text: str) -> str:
+    """
+    The user's question without the question wording: "what is a foyer?"
+    -> "foyer".
+    """
+    text = phrase_words(normalize_text(user_text))
+
+    # "can you explain what is meant by ..." has more than one lead-in
+    stripped = _LEADING.sub("", text, count=1)
+    while stripped != text:
+        text = stripped
+        stripped = _LEADING.sub("", text, count=1)
+
+    return _TRAILING.sub("", text).strip()
+
+
+def canonical_term(phrase: str, fuzzy: bool = True) -> str | None:
+    if not phrase:
+        return None
+
+    term = CONCEPT_ALIASES.get(phrase)
+    if term is None and phrase.endswith("s"):
+        term = CONCEPT_ALIASES.get(phrase[:-1])
+    if term is not None or not fuzzy:
+        return term
+
+    return _fuzzy_term(phrase)
+
+
+@functools.lru_cache(maxsize=4096)
+def _fuzzy_term(phrase: str) -> str | None:
+    close = difflib.get_close_matches(phrase, CONCEPT_ALIASES, n=1, cutoff=FUZZY_CUTOFF)
+    return CONCEPT_ALIASES[close[0]] if close else None
+
+
+def normalize_concept(user_text: str) -> tuple:
+    """
+    (glossary term or None, concept phrase) for a concept question.
+    """
+    phrase = concept_phrase(user_text)
+    return canonical_term(phrase), phrase
+
+
+def glossary_answer(term: str | None) -> str | None:
+    return GLOSSARY.get(term)
@@ -1,14 +1,54 @@
 # logic/explain.py
 
-import os
-from openai import OpenAI
-from dotenv import load_dotenv
+from evaluator.explanation_cache import explanation_cache, explanation_cache_key
+from evaluator.gateway import IDENTITY_ENCODING, achat_completion, chat_completion
+from evaluator.logic.concepts import canonical_term, concept_phrase, glossary_answer
+from evaluator.metrics import record_usage
 
-load_dotenv()
-client = OpenAI(
-    api_key=os.getenv("OPENAI_API_KEY"),
-    base_url="https://dncgateway.com/v1",
-)
+
+def explain_messages(user_text: str) -> list:
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You are a real-estate and housing design expert.\n"
+                "Explain concepts related to residential properties, "
+                "home design, layout, privacy, noise, space, and living comfort.\n\n"
+                "Rules:\n"
+                "- Do NOT explain any app, tool, or evaluation process\n"
+                "- Do NOT mention scoring or ratings\n"
+                "- Answer like you are explaining to a home buyer\n"
+                "- Keep explanations practical and easy to understand\n"
+            )
+        },
+        {
+            "role": "user",
+            "content": user_text
+        }
+    ]
+
+
+def known_explanation(user_text: str):
+    """
+    (answer or None, cache key). Glossary terms are answered from the
+    glossary, anything else from the explanation cache if present.
+    """
+    phrase = concept_phrase(user_text)
+
+    answer = glossary_answer(canonical_term(phrase, fuzzy=False))
+    if answer is not None:
+        return answer, None
+
+    if not phrase:
+        return None, None
+
+    key = explanation_cache_key(phrase)
+    cached = explanation_cache.get(key)
+    if cached is not None:
+        return cached, key
+
+    # Misspelt glossary terms ("foyr") only cost a difflib pass on a miss
+    return glossary_answer(canonical_term(phrase)), key
 
 
 def explain_concept(user_text: str) -> str:
@@ -16,35 +56,79 @@ def explain_concept(user_text: str) -> str:
     Explains real-estate / housing concepts in simple terms.
     This is NOT about the app or evaluation process.
     """
+    answer, key = known_explanation(user_text)
+    if answer is not None:
+        return answer
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are a real-estate and housing design expert.\n"
-                    "Explain concepts related to residential properties, "
-                    "home design, layout, privacy, noise, space, and living comfort.\n\n"
-                    "Rules:\n"
-                    "- Do NOT explain any app, tool, or evaluation process\n"
-                    "- Do NOT mention scoring or ratings\n"
-                    "- Answer like you are explaining to a home buyer\n"
-                    "- Keep explanations practical and easy to understand\n"
-                )
-            },
-            {
-                "role": "user",
-                "content": user_text
-            }
-        ],
-        extra_headers={
-            "X-API-Key": "usr_8f3a91c2d7",
-            "X-App-Id": "dnc-property-evaluator",
-            "Accept-Encoding": "identity",
-            # optional for now:
-            # "X-User-Id": "aman"
-        }
+    response = chat_completion(
+        messages=explain_messages(user_text),
+        operation="explain_concept",
+        extra_headers=IDENTITY_ENCODING,
+    )
+
+    answer = response.choices[0].message.content.strip()
+    if key is not None:
+        explanation_cache.put(key, answer)
+    return answer
+
+
+async def explain_concept_async(user_text: str) -> str:
+    answer, key = known_explanation(user_text)
+    if answer is not None:
+        return answer
+
+    response = await achat_completion(
+        messages=explain_messages(user_text),
+        operation="explain_concept",
+        extra_headers=IDENTITY_ENCODING,
     )
 
-    return response.choices[0].message.content.strip()
+    answer = response.choices[0].message.content.strip()
+    if key is not None:
+        explanation_cache.put(key, answer)
+    return answer
+
+
+# -----------------------
+# Streaming
+# -----------------------
+def chunk_text(chunk) -> str:
+    """
+    The text a streamed completion chunk adds ("" for role / usage chunks).
+    """
+    if not chunk.choices:
+        return ""
+    return chunk.choices[0].delta.content or ""
+
+
+def explain_concept_stream(user_text: str):
+    """
+    explain_concept piece by piece as the gateway produces it. Glossary
+    and cached answers come as a single piece.
+    """
+    answer, key = known_explanation(user_text)
+    if answer is not None:
+        yield answer
+        return
+
+    pieces = []
+    with chat_completion(
+        messages=explain_messages(user_text),
+        operation="explain_concept",
+        extra_headers=IDENTITY_ENCODING,
+        stream=True,
+        stream_options={"include_usage": True},
+    ) as stream:
+        for chunk in stream:
+            # The last chunk carries the usage and no choices
+            record_usage("explain_concept", chunk)
+            text = chunk_text(chunk)
+            if not pieces:
+                text = text.lstrip()
+            if text:
+                pieces.append(text)
+                yield text
+
+    answer = "".join(pieces).strip()
+    if key is not None and answer:
+        explanation_cache.put(key, answer)
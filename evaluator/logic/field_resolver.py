@@ -0,0 +1,366 @@
+# logic/field_resolver.py
+#
+# Local fast path for short answers to a field-specific question.
+#
+# When the last question was about one field, most replies just name one
+# of that field's options ("attached", "small", "9 ft", "no lobby",
+# "gated yes"). resolve_field_answer maps such a reply to the field's
+# value from the schema enums plus the synonym tables below:
+# - exact phrase match
+# - phrases contained in the reply, when they all agree on one value
+# - difflib fuzzy match of the whole reply (typos)
+# - numbers / ceiling words for ceiling_height_ft
+#
+# A reply with a negation ("not attached") only matches phrases that
+# carry the negation themselves ("no lobby"). A bare yes / no word
+# ("no", "yeah", "none") only counts as the whole reply; inside a longer
+# one it must agree with what the rest of the reply says ("yes, gated"),
+# so "yes but not gated" is left alone. Replies that sound unsure
+# ("no idea", "not sure yet") are never resolved. Anything unresolved,
+# ambiguous or longer than FAST_PATH_MAX_WORDS returns None and goes to
+# the LLM as before.
+
+import difflib
+import os
+import re
+
+from evaluator.extraction_cache import normalize_text
+from evaluator.extraction_types import CEILING_WORDS, privacy_schema
+
+FAST_PATH_ENABLED = os.getenv("FAST_PATH", "1") != "0"
+FAST_PATH_MAX_WORDS = int(os.getenv("FAST_PATH_MAX_WORDS", "5"))
+# Print the handled fraction every N extraction turns (0 = never)
+FAST_PATH_LOG_EVERY = int(os.getenv("FAST_PATH_LOG_EVERY", "100"))
+
+FUZZY_CUTOFF = 0.85
+
+NEGATIONS = {"no", "not", "none", "nope", "nah", "never", "without", "isnt", "dont", "doesnt", "arent"}
+
+# A reply with one of these is a non-answer, not a "no"
+UNCERTAIN = {"idea", "clue", "sure", "unsure", "know", "dunno", "idk", "maybe", "perhaps", "possibly", "guess"}
+
+YES_NO = {
+    "yes": True,
+    "yeah": True,
+    "yep": True,
+    "yup": True,
+    "y": True,
+    "true": True,
+    "sure": True,
+    "correct": True,
+    "no": False,
+    "nope": False,
+    "nah": False,
+    "n": False,
+    "false": False,
+}
+
+OPEN_SPACE_SYNONYMS = {
+    "attached": "attached",
+    "shared wall": "attached",
+    "common wall": "attached",
+    "wall to wall": "attached",
+    "no gap": "attached",
+    "tight gap": "tight_service_gap",
+    "service gap": "tight_service_gap",
+    "duct": "tight_service_gap",
+    "shaft": "tight_service_gap",
+    "gap": "narrow_gap",
+    "small gap": "narrow_gap",
+    "lane": "narrow_road",
+    "narrow lane": "narrow_road",
+    "small road": "narrow_road",
+}
+
+# {field: {phrase: value}}; only values in the field's enum are kept
+FIELD_SYNONYMS = {
+    "room_size": {
+        "tiny": "small",
+        "compact": "small",
+        "medium": "average",
+        "normal": "average",
+        "standard": "average",
+        "avg": "average",
+        "big": "large",
+        "spacious": "large",
+        "huge": "large",
+    },
+    "window_placement": {
+        "same wall": "door_wall",
+        "same": "door_wall",
+        "near door": "door_wall",
+        "next to door": "door_wall",
+        "beside door": "door_wall",
+        "away": "away_from_door",
+        "away from door": "away_from_door",
+        "different wall": "away_from_door",
+        "other wall": "away_from_door",
+        "opposite": "away_from_door",
+        "opposite wall": "away_from_door",
+    },
+    "window_facing_side": {
+        "rear": "back",
+        "behind": "back",
+    },
+    "buffer_between_rooms": {
+        "no": "none",
+        "nothing": "none",
+        "no buffer": "none",
+        "no lobby": "none",
+        "no passage": "none",
+        "passage": "small_passage",
+        "corridor": "small_passage",
+        "lobby": "large_lobby",
+        "hall": "big_hall",
+        "living room": "big_hall",
+        "living area": "big_hall",
+    },
+    "unit_type": {
+        "flat": "apartment",
+        "villa": "independent_house",
+        "bungalow": "independent_house",
+        "independent": "independent_house",
+        "house": "independent_house",
+        "row": "row_house",
+        "rowhouse": "row_house",
+        "townhouse": "row_house",
+    },
+    "front_open_space": {
+        **OPEN_SPACE_SYNONYMS,
+        "main road": "wide_road",
+        "big road": "wide_road",
+        "yard": "front_yard",
+        "garden": "front_yard",
+        "front garden": "front_yard",
+    },
+    "side_a_open_space": {
+        **OPEN_SPACE_SYNONYMS,
+        "alley": "side_alley",
+        "road": "side_road",
+    },
+    "side_b_open_space": {
+        **OPEN_SPACE_SYNONYMS,
+        "alley": "side_alley",
+        "road": "side_road",
+    },
+    "back_open_space": {
+        **OPEN_SPACE_SYNONYMS,
+        "nothing": "none",
+        "no space": "none",
+        "alley": "back_alley",
+        "road": "back_road",
+        "yard": "private_backyard",
+        "backyard": "private_backyard",
+        "garden": "private_backyard",
+    },
+    "is_in_gated_society": {
+        "gated": True,
+        "not gated": False,
+        "open": False,
+        "non gated": False,
+    },
+    "has_multiple_bedrooms": {
+        "multiple": True,
+        "1 bhk": False,
+        "1bhk": False,
+        "studio": False,
+        "single": False,
+        "2 bhk": True,
+        "2bhk": True,
+        "3 bhk": True,
+        "3bhk": True,
+        "4 bhk": True,
+        "4bhk": True,
+    },
+    "bedrooms_share_wall": {
+        "shared": True,
+        "share": True,
+        "common wall": True,
+        "separate": False,
+        "not shared": False,
+    },
+    "surrounding_layout_uniformity": {
+        "uniform": "uniform_layout",
+        "similar": "uniform_layout",
+        "mostly": "mostly_uniform",
+        "mostly similar": "mostly_uniform",
+        "mixed": "mixed_layout",
+        "irregular": "irregular_layout",
+        "random": "irregular_layout",
+    },
+    "distance_between_apartment_doors": {
+        "close": "very_close",
+        "adjacent": "very_close",
+        "next to each other": "very_close",
+        "medium": "moderate",
+        "far": "far_apart",
+    },
+    "apartment_entry_buffer": {
+        "directly into room": "direct_to_room",
+        "directly into bedroom": "direct_to_room",
+        "direct to bedroom": "direct_to_room",
+        "directly into hall": "direct_to_hall",
+        "directly into living room": "direct_to_hall",
+        "foyer then room": "foyer_to_room",
+        "foyer then hall": "foyer_to_hall",
+        "lobby to room": "foyer_to_room",
+        "lobby to hall": "foyer_to_hall",
+    },
+}
+
+# Only matched as the whole reply
+BARE_ANSWERS = set(YES_NO) | NEGATIONS
+
+_WORD = re.compile(r"[a-z0-9]+")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+CEILING_MIN_FT = 6
+CEILING_MAX_FT = 20
+
+
+def phrase_words(text: str) -> str:
+    # Apostrophes are dropped so "isn't" reads as "isnt"
+    return " ".join(_WORD.findall(text.replace("'", "").replace("’", "")))
+
+
+def _build_phrases(spec: dict, field: str) -> dict:
+    types = spec["type"] if isinstance(spec["type"], list) else [spec["type"]]
+    synonyms = FIELD_SYNONYMS.get(field, {})
+
+    if "boolean" in types:
+        return {**YES_NO, **synonyms}
+
+    if "number" in types:
+        return dict(CEILING_WORDS)
+
+    options = spec.get("enum", [])
+    phrases = {phrase_words(option.replace("_", " ")): option for option in options}
+    phrases.update(
+        (phrase_words(phrase), value) for phrase, value in synonyms.items() if value in options
+    )
+    return phrases
+
+
+# {field: (section, {phrase: value}, is_number)}
+FIELD_PHRASES = {
+    field: (
+        section,
+        _build_phrases(spec, field),
+        "number" in (spec["type"] if isinstance(spec["type"], list) else [spec["type"]]),
+    )
+    for section, section_spec in privacy_schema["parameters"]["properties"].items()
+    for field, spec in section_spec["properties"].items()
+}
+
+
+def contains_phrase(text: str, phrase: str) -> bool:
+    return f" {phrase} " in f" {text} "
+
+
+def _match_phrases(text: str, phrases: dict):
+    if text in phrases:
+        return phrases[text]
+
+    words = set(text.split())
+    negated = bool(NEGATIONS & words)
+
+    contained = [
+        phrase for phrase in phrases
+        if phrase not in BARE_ANSWERS and contains_phrase(text, phrase)
+    ]
+    found = [p for p in contained if not negated or NEGATIONS & set(p.split())]
+    # "narrow road" wins over "road"
+    found = [p for p in found if not any(p != q and contains_phrase(q, p) for q in found)]
+
+    bare = {phrases[w] for w in words & BARE_ANSWERS if w in phrases}
+    values = {phrases[p] for p in found}
+    if len(values) == 1:
+        # "yes, gated" but not "yes but not gated"
+        return values.pop() if bare <= values else None
+    if values:
+        return None
+
+    # "no, gated": the negation dropped "gated", but the reply still
+    # contradicts itself, so it's not left to the fuzzy match
+    if bare and any(phrases[p] not in bare for p in contained):
+        return None
+
+    close = difflib.get_close_matches(text, phrases, n=2, cutoff=FUZZY_CUTOFF)
+    if close and len({phrases[p] for p in close}) == 1:
+        return phrases[close[0]]
+
+    return None
+
+
+def _match_number(text: str, raw: str, phrases: dict):
+    # Decimal points are gone from text, so numbers come from raw
+    numbers = _NUMBER.findall(raw)
+
+    if len(numbers) == 1:
+        value = float(numbers[0])
+        if CEILING_MIN_FT <= value <= CEILING_MAX_FT:
+            return int(value) if value.is_integer() else value
+        return None
+
+    if numbers:
+        return None
+    return _match_phrases(text, phrases)
+
+
+def resolve_field_answer(text: str, context: dict | None):
+    """
+    {section: {field: value}} for a short reply to a single-field question,
+    or None when the LLM should handle it.
+    """
+    if not FAST_PATH_ENABLED or not context or not context.get("last_question"):
+        return None
+
+    _, field = context["last_question"]
+    if field not in FIELD_PHRASES:
+        # "__entire_section__" guidance or unknown field
+        return None
+
+    raw = normalize_text(text)
+    text = phrase_words(raw)
+    if not text or len(text.split()) > FAST_PATH_MAX_WORDS:
+        return None
+
+    section, phrases, is_number = FIELD_PHRASES[field]
+    # "sure" on its own is still a yes
+    if text not in phrases and UNCERTAIN & set(text.split()):
+        return None
+
+    if is_number:
+        value = _match_number(text, raw, phrases)
+    else:
+        value = _match_phrases(text, phrases)
+
+    if value is None:
+        return None
+    return {section: {field: value}}
+
+
+# -----------------------
+# Handled-fraction counters
+# -----------------------
+fast_path_stats = {"turns": 0, "resolved": 0}
+
+
+def record_fast_path(resolved: bool):
+    fast_path_stats["turns"] += 1
+    fast_path_stats["resolved"] += resolved
+
+    if FAST_PATH_LOG_EVERY and fast_path_stats["turns"] % FAST_PATH_LOG_EVERY == 0:
+        info = fast_path_info()
+        print(
+            f"FAST PATH: {info['resolved']}/{info['turns']} extraction turns "
+            f"resolved locally ({info['fraction']:.1%})"
+        )
+
+
+def fast_path_info() -> dict:
+    turns = fast_path_stats["turns"]
+    return {
+        **fast_path_stats,
+        "fraction": fast_path_stats["resolved"] / turns if turns else 0.0,
+    }
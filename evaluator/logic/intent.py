@@ -1,5 +1,8 @@
 # logic/intent.py
 
+from evaluator.logic.router import route
+
+
 def classify_intent(text: str) -> str:
     """
     Classifies user intent into:
@@ -8,43 +11,19 @@ def classify_intent(text: str) -> str:
     - ANSWER: provides information or description (default)
     """
 
-    t = text.lower().strip()
+    matched = route(text)
 
     # --------------------------------------------------
     # CONTINUE / SKIP INTENT
     # --------------------------------------------------
-    continue_phrases = [
-        "continue anyway",
-        "just evaluate",
-        "just check",
-        "do it",
-        "do it anyway",
-        "skip",
-        "doesn't matter",
-        "not sure",
-        "you decide",
-    ]
-
-    if any(p in t for p in continue_phrases):
+    if "continue" in matched:
         return "CONTINUE_ANYWAY"
 
     # --------------------------------------------------
     # EXPLANATION INTENT (DOMAIN CONCEPTS ONLY)
     # --------------------------------------------------
-    explanation_triggers = [
-        "what is",
-        "what does",
-        "what do you mean",
-        "meaning of",
-        "explain",
-        "how does",
-        "how do",
-        "why does",
-        "why is",
-    ]
-
     # Avoid catching answers like "8 ft", "small room", etc.
-    if len(t.split()) >= 3 and any(p in t for p in explanation_triggers):
+    if "explanation" in matched and len(text.split()) >= 3:
         return "EXPLANATION"
 
     # --------------------------------------------------
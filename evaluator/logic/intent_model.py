@@ -0,0 +1,363 @@
+# logic/intent_model.py
+#
+# Local A/B/C classifier in front of classify_with_llm.
+#
+# Character n-grams of the message, weighted by TF-IDF, feed a
+# multinomial logistic regression, all in numpy. The trained model is a
+# small .npz next to its seed data (n-gram vocabulary, idf, weights).
+# local_label answers when the top class probability reaches
+# INTENT_MODEL_THRESHOLD; anything less confident goes to the LLM as
+# before. A and C are questions, so those labels also need a question
+# cue in the message ("?", a question word or a product term); "i don't
+# know" or "skip this" without one goes to the LLM whatever the score. With INTENT_LABEL_LOG set, the LLM's label is appended to the
+# label log so the next retrain learns from it. The log holds raw user
+# messages, so it is off by default. Once it reaches
+# INTENT_LABEL_LOG_MAX_BYTES it is rotated to "<log>.1", replacing the
+# previous rotation. So at most two files' worth is kept, and retraining
+# reads both.
+#
+# Retrain from the seed set plus the logged labels:
+#
+#   python -m evaluator.logic.intent_model
+#   python -m evaluator.logic.intent_model --log cache/intent_labels.jsonl --output evaluator/models/intent_v1.npz
+#
+# Configuration (environment):
+#   INTENT_MODEL            "0" to always ask the LLM
+#   INTENT_MODEL_PATH       (default evaluator/models/intent_v1.npz)
+#   INTENT_MODEL_THRESHOLD  minimum top-class probability (default 0.85)
+#   INTENT_LABEL_LOG        JSONL of LLM-labelled messages (default empty = off),
+#                           e.g. ./cache/intent_labels.jsonl
+#   INTENT_LABEL_LOG_MAX_BYTES   size before rotating (default 1000000)
+
+import argparse
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+MODELS_DIR = Path(__file__).resolve().parent.parent / "models"
+
+INTENT_MODEL_ENABLED = os.getenv("INTENT_MODEL", "1") != "0"
+INTENT_MODEL_PATH = Path(os.getenv("INTENT_MODEL_PATH", str(MODELS_DIR / "intent_v1.npz")))
+INTENT_MODEL_THRESHOLD = float(os.getenv("INTENT_MODEL_THRESHOLD", "0.85"))
+INTENT_LABEL_LOG = os.getenv("INTENT_LABEL_LOG", "")
+INTENT_LABEL_LOG_MAX_BYTES = int(os.getenv("INTENT_LABEL_LOG_MAX_BYTES", "1000000"))
+
+SEED_PATH = MODELS_DIR / "intent_seed.jsonl"
+
+# Same convention as classify_with_llm
+LABELS = ("A", "B", "C")
+
+NGRAM_MIN = 2
+NGRAM_MAX = 5
+MIN_DF = 2
+
+# Words, numbers and "?" survive normalization; other punctuation doesn't
+_TOKEN = re.compile(r"[a-z0-9]+|\?")
+
+# Labels local_label only gives to messages with a question cue
+QUESTION_LABELS = ("A", "C")
+
+QUESTION_WORDS = frozenset({
+    "?", "what", "how", "why", "which", "when", "where", "who", "whose",
+    "can", "could", "do", "does", "did", "is", "are", "was", "will", "would",
+    "should", "shall", "may", "explain", "tell", "mean", "means", "meaning",
+    "difference",
+})
+
+PRODUCT_TERMS = re.compile(r"\b(score|privacy|evaluat|question|ask|result|report|tool|data)")
+
+
+def tokens(text: str) -> list:
+    return _TOKEN.findall(unicodedata.normalize("NFKC", text).lower().replace("'", ""))
+
+
+def has_question_cue(text: str) -> bool:
+    words = tokens(text)
+    return not QUESTION_WORDS.isdisjoint(words) or PRODUCT_TERMS.search(" ".join(words)) is not None
+
+
+def char_ngrams(text: str) -> Counter:
+    padded = f" {' '.join(tokens(text))} "
+
+    return Counter(
+        padded[i:i + n]
+        for n in range(NGRAM_MIN, NGRAM_MAX + 1)
+        for i in range(len(padded) - n + 1)
+    )
+
+
+class IntentModel:
+    """
+    TF-IDF over character n-grams + softmax regression over LABELS.
+    """
+
+    def __init__(self, vocabulary: list, idf: np.ndarray, weights: np.ndarray, bias: np.ndarray):
+        self.vocabulary = {gram: i for i, gram in enumerate(vocabulary)}
+        self.idf = idf
+        self.weights = weights  # (len(LABELS), len(vocabulary))
+        self.bias = bias
+
+    @classmethod
+    def load(cls, path: Path) -> "IntentModel":
+        with np.load(path) as data:
+            if tuple(data["labels"]) != LABELS:
+                raise ValueError(f"{path} was trained for labels {tuple(data['labels'])}")
+            return cls(list(data["vocabulary"]), data["idf"], data["weights"], data["bias"])
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        vocabulary = sorted(self.vocabulary, key=self.vocabulary.get)
+
+        # np.savez appends .npz unless it's already there
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                labels=np.array(LABELS),
+                vocabulary=np.array(vocabulary),
+                idf=self.idf.astype(np.float32),
+                weights=self.weights.astype(np.float32),
+                bias=self.bias.astype(np.float32),
+            )
+
+    def features(self, text: str):
+        """
+        (vocabulary indices, L2-normalized sublinear TF-IDF values).
+        """
+        grams = [
+            (self.vocabulary[gram], count)
+            for gram, count in char_ngrams(text).items()
+            if gram in self.vocabulary
+        ]
+        if not grams:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        index = np.array([i for i, _ in grams])
+        values = (1 + np.log([count for _, count in grams])) * self.idf[index]
+        return index, values / np.linalg.norm(values)
+
+    def matrix(self, texts: list) -> np.ndarray:
+        X = np.zeros((len(texts), len(self.vocabulary)))
+        for row, text in enumerate(texts):
+            index, values = self.features(text)
+            X[row, index] = values
+        return X
+
+    def probabilities(self, text: str) -> np.ndarray:
+        index, values = self.features(text)
+        return softmax(self.weights[:, index] @ values + self.bias)
+
+    def predict(self, text: str) -> tuple:
+        """
+        (label, probability of that label).
+        """
+        p = self.probabilities(text)
+        best = int(np.argmax(p))
+        return LABELS[best], float(p[best])
+
+
+def softmax(z: np.ndarray) -> np.ndarray:
+    z = z - z.max(axis=-1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+def train(texts: list, labels: list, l2: float = 1e-4, steps: int = 1000, lr: float = 4.0) -> IntentModel:
+    """
+    Fits the vocabulary, idf and class-balanced softmax regression by
+    full-batch gradient descent.
+    """
+    df = Counter(gram for text in texts for gram in char_ngrams(text))
+    vocabulary = sorted(gram for gram, count in df.items() if count >= MIN_DF)
+
+    n = len(texts)
+    idf = np.array([np.log((1 + n) / (1 + df[gram])) + 1 for gram in vocabulary])
+
+    model = IntentModel(vocabulary, idf, np.zeros((len(LABELS), len(vocabulary))), np.zeros(len(LABELS)))
+    X = model.matrix(texts)
+
+    y = np.array([LABELS.index(label) for label in labels])
+    Y = np.eye(len(LABELS))[y]
+
+    # Rare classes (A, C) count as much as the common one
+    counts = np.bincount(y, minlength=len(LABELS))
+    sample_weight = (n / (len(LABELS) * np.maximum(counts, 1)))[y][:, None] / n
+
+    W, b = model.weights, model.bias
+    for _ in range(steps):
+        error = (softmax(X @ W.T + b) - Y) * sample_weight
+        W -= lr * (error.T @ X + l2 * W)
+        b -= lr * error.sum(axis=0)
+
+    return model
+
+
+# -----------------------
+# Runtime
+# -----------------------
+intent_model_stats = {"messages": 0, "local": 0}
+
+
+@functools.lru_cache(maxsize=1)
+def get_model() -> IntentModel | None:
+    if not INTENT_MODEL_ENABLED or not INTENT_MODEL_PATH.exists():
+        return None
+    return IntentModel.load(INTENT_MODEL_PATH)
+
+
+def local_label(text: str) -> str | None:
+    """
+    The model's label when it is confident enough (and, for a question
+    label, the message has a question cue), else None (ask the LLM).
+    """
+    model = get_model()
+    if model is None:
+        return None
+
+    label, probability = model.predict(text)
+    if probability < INTENT_MODEL_THRESHOLD:
+        return None
+    if label in QUESTION_LABELS and not has_question_cue(text):
+        return None
+    return label
+
+
+def record_intent_model(resolved: bool):
+    intent_model_stats["messages"] += 1
+    intent_model_stats["local"] += resolved
+
+
+def intent_model_info() -> dict:
+    messages = intent_model_stats["messages"]
+    return {
+        **intent_model_stats,
+        "fraction": intent_model_stats["local"] / messages if messages else 0.0,
+    }
+
+
+_log_lock = threading.Lock()
+
+
+def rotated_log(path) -> str:
+    return f"{path}.1"
+
+
+def record_label(text: str, label: str):
+    """
+    Appends an LLM-labelled message to the label log for retraining.
+    """
+    if not INTENT_LABEL_LOG:
+        return
+
+    line = json.dumps({"text": text, "label": label, "ts": int(time.time())}) + "\n"
+    try:
+        with _log_lock:
+            os.makedirs(os.path.dirname(INTENT_LABEL_LOG) or ".", exist_ok=True)
+            if (
+                os.path.exists(INTENT_LABEL_LOG)
+                and os.path.getsize(INTENT_LABEL_LOG) + len(line) > INTENT_LABEL_LOG_MAX_BYTES
+            ):
+                os.replace(INTENT_LABEL_LOG, rotated_log(INTENT_LABEL_LOG))
+            with open(INTENT_LABEL_LOG, "a") as f:
+                f.write(line)
+    except OSError as e:
+        print(f"INTENT LABEL LOG: {e}", file=sys.stderr)
+
+
+# -----------------------
+# Retraining
+# -----------------------
+def read_labelled(path) -> list:
+    """
+    (text, label) pairs from a JSONL file of {"text", "label"} objects.
+    """
+    rows = []
+    with open(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if row.get("label") in LABELS and row.get("text", "").strip():
+                rows.append((row["text"].strip(), row["label"]))
+    return rows
+
+
+def training_set(seed_path: Path, log_path) -> list:
+    """
+    Seed rows plus logged rows (the rotated log included); a logged label
+    replaces an earlier one for the same text.
+    """
+    rows = read_labelled(seed_path)
+    # Older rotation first, so later labels win
+    for path in (rotated_log(log_path), log_path) if log_path else ():
+        if Path(path).exists():
+            rows += read_labelled(path)
+
+    by_text = {}
+    for text, label in rows:
+        by_text[" ".join(_TOKEN.findall(text.lower()))] = (text, label)
+    return list(by_text.values())
+
+
+def holdout_report(rows: list, folds: int = 5, seed: int = 0) -> dict:
+    """
+    Cross-validated accuracy and, at INTENT_MODEL_THRESHOLD, the share of
+    messages answered locally and the accuracy on those.
+    """
+    order = np.random.default_rng(seed).permutation(len(rows))
+    correct = local = local_correct = 0
+
+    for fold in range(folds):
+        test = set(order[fold::folds].tolist())
+        model = train(
+            [text for i, (text, _) in enumerate(rows) if i not in test],
+            [label for i, (_, label) in enumerate(rows) if i not in test],
+        )
+        for i in test:
+            text, label = rows[i]
+            predicted, probability = model.predict(text)
+            correct += predicted == label
+            if probability >= INTENT_MODEL_THRESHOLD:
+                local += 1
+                local_correct += predicted == label
+
+    return {
+        "accuracy": correct / len(rows),
+        "local_fraction": local / len(rows),
+        "local_accuracy": local_correct / local if local else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Retrain the local A/B/C intent classifier.")
+    parser.add_argument("--seed", type=Path, default=SEED_PATH, help="Hand-labelled messages (JSONL)")
+    parser.add_argument("--log", default=INTENT_LABEL_LOG, help="LLM-labelled messages (JSONL)")
+    parser.add_argument("--output", type=Path, default=INTENT_MODEL_PATH)
+    parser.add_argument("--no-eval", action="store_true", help="Skip the cross-validation report")
+    args = parser.parse_args(argv)
+
+    rows = training_set(args.seed, args.log)
+    print(f"{len(rows)} messages: {dict(sorted(Counter(label for _, label in rows).items()))}")
+
+    if not args.no_eval:
+        report = holdout_report(rows)
+        print(
+            f"5-fold accuracy {report['accuracy']:.1%}; at threshold {INTENT_MODEL_THRESHOLD} "
+            f"{report['local_fraction']:.1%} answered locally, {report['local_accuracy']:.1%} of those correct"
+        )
+
+    model = train([text for text, _ in rows], [label for _, label in rows])
+    model.save(args.output)
+    print(f"Wrote {args.output} ({len(model.vocabulary)} n-grams)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
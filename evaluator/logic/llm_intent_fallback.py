@@ -1,14 +1,49 @@
 # logic/llm_intent_fallback.py
 
-import os
-from openai import OpenAI
-from dotenv import load_dotenv
+from evaluator.gateway import IDENTITY_ENCODING, achat_completion, chat_completion
+from evaluator.logic.intent_model import LABELS, record_label
 
-load_dotenv()
-client = OpenAI(
-    api_key=os.getenv("OPENAI_API_KEY"),
-    base_url="https://dncgateway.com/v1",
-)
+
+def classifier_messages(user_text: str) -> list:
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You are an intent classifier for a property evaluation assistant.\n\n"
+                "Classify the user's message into exactly ONE category:\n\n"
+                "A = Question about the tool, process, scoring, or reliability\n"
+                "B = Description of a property or answer to a question about the property\n"
+                "C = Question about real-estate or housing concepts (privacy, layout, design)\n\n"
+                "Rules:\n"
+                "- Reply with ONLY a single letter: A, B, or C\n"
+                "- Do NOT explain your choice\n"
+                "- Do NOT add punctuation or text\n"
+            )
+        },
+        {
+            "role": "user",
+            "content": user_text
+        }
+    ]
+
+
+def response_label(response) -> str | None:
+    label = response.choices[0].message.content.strip().upper()
+    return label if label in LABELS else None
+
+
+def parse_label(response) -> str:
+    # Safety fallback
+    return response_label(response) or "B"
+
+
+def log_label(user_text: str, response):
+    """
+    Keeps clean LLM labels as training data for the local model.
+    """
+    label = response_label(response)
+    if label is not None:
+        record_label(user_text, label)
 
 
 def classify_with_llm(user_text: str) -> str:
@@ -19,42 +54,24 @@ def classify_with_llm(user_text: str) -> str:
     C = real-estate concept question
     """
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are an intent classifier for a property evaluation assistant.\n\n"
-                    "Classify the user's message into exactly ONE category:\n\n"
-                    "A = Question about the tool, process, scoring, or reliability\n"
-                    "B = Description of a property or answer to a question about the property\n"
-                    "C = Question about real-estate or housing concepts (privacy, layout, design)\n\n"
-                    "Rules:\n"
-                    "- Reply with ONLY a single letter: A, B, or C\n"
-                    "- Do NOT explain your choice\n"
-                    "- Do NOT add punctuation or text\n"
-                )
-            },
-            {
-                "role": "user",
-                "content": user_text
-            }
-        ],
+    response = chat_completion(
+        messages=classifier_messages(user_text),
+        operation="classify_with_llm",
         temperature=0,
-        extra_headers={
-            "X-API-Key": "usr_8f3a91c2d7",
-            "X-App-Id": "dnc-property-evaluator",
-            "Accept-Encoding": "identity",
-            # optional for now:
-            # "X-User-Id": "aman""
-        }
+        extra_headers=IDENTITY_ENCODING,
     )
 
-    label = response.choices[0].message.content.strip().upper()
+    log_label(user_text, response)
+    return parse_label(response)
 
-    # Safety fallback
-    if label not in {"A", "B", "C"}:
-        return "B"
 
-    return label
+async def classify_with_llm_async(user_text: str) -> str:
+    response = await achat_completion(
+        messages=classifier_messages(user_text),
+        operation="classify_with_llm",
+        temperature=0,
+        extra_headers=IDENTITY_ENCODING,
+    )
+
+    log_label(user_text, response)
+    return parse_label(response)
@@ -1,45 +1,54 @@
 # logic/product_questions.py
 
-from evaluator.logic.llm_intent_fallback import classify_with_llm
+from evaluator.logic.intent_model import local_label, record_intent_model
+from evaluator.logic.llm_intent_fallback import classify_with_llm, classify_with_llm_async
+from evaluator.logic.router import route
 
 
 def is_product_question_rule(text: str) -> bool:
     """
-    Fast rule-based detection for product / process questions.
+    Fast rule-based detection for product / process questions
+    (router.PHRASE_SETS["product"]).
     """
+    return "product" in route(text)
 
-    t = text.lower().strip()
 
-    product_phrases = [
-        # how it works
-        "how does this work",
-        "how does it work",
-        "how do you evaluate",
-        "how do u evaluate",
-        "how is this evaluated",
-        "what is your basis",
-        "basis for judgment",
+def product_question_by_rules(text: str) -> bool | None:
+    """
+    The rule-based stages of is_product_question: True/False when they
+    decide, None when a later stage has to.
+    """
 
-        # what is evaluated
-        "what will you evaluate",
-        "what do you evaluate",
-        "what all do you check",
-        "what are you checking",
+    # Guard: very short inputs are never product questions
+    if len(text.strip().split()) <= 2:
+        return False
 
-        # accuracy / reliability
-        "how accurate is this",
-        "is this accurate",
-        "can i trust this",
-        "is this reliable",
+    # Stage 1: fast rule-based check
+    if is_product_question_rule(text):
+        return True
 
-        # meta / tool identity
-        "what is this tool",
-        "what is this",
-        "what can you do",
-        "who are you",
-    ]
+    return None
+
+
+def product_question_by_model(text: str) -> bool | None:
+    """
+    The local intent model's answer when it is confident, else None.
+    """
+    label = local_label(text)
+    record_intent_model(label is not None)
+    return None if label is None else label == "A"
+
+
+def product_question_locally(text: str) -> bool | None:
+    """
+    The stages of is_product_question that need no gateway call: rules,
+    then the local intent model. None when the LLM has to decide.
+    """
+    decided = product_question_by_rules(text)
+    if decided is not None:
+        return decided
 
-    return any(phrase in t for phrase in product_phrases)
+    return product_question_by_model(text)
 
 
 def is_product_question(text: str) -> bool:
@@ -47,18 +56,15 @@ def is_product_question(text: str) -> bool:
     Detects whether the user is asking about the product/process.
     Uses:
     - Rule-based check first (cheap)
+    - Local intent model next
     - LLM fallback only if unclear
     """
 
-    # Guard: very short inputs are never product questions
-    if len(text.strip().split()) <= 2:
-        return False
-
-    # Stage 1: fast rule-based check
-    if is_product_question_rule(text):
-        return True
+    decided = product_question_locally(text)
+    if decided is not None:
+        return decided
 
-    # Stage 2: LLM fallback (only if ambiguous)
+    # LLM fallback (only if ambiguous)
     label = classify_with_llm(text)
 
     # Convention:
@@ -66,3 +72,19 @@ def is_product_question(text: str) -> bool:
     # "B" = property description / answer
     # "C" = real-estate concept question
     return label == "A"
+
+
+async def product_question_by_llm_async(text: str) -> bool:
+    """
+    The LLM stage of is_product_question, for when
+    product_question_locally returned None.
+    """
+    return await classify_with_llm_async(text) == "A"
+
+
+async def is_product_question_async(text: str) -> bool:
+    decided = product_question_locally(text)
+    if decided is not None:
+        return decided
+
+    return await product_question_by_llm_async(text)
@@ -0,0 +1,155 @@
+# logic/router.py
+#
+# Keyword pre-router for a chat message.
+#
+# The keyword checks of a turn (product-question rules, the quick
+# explanation keywords, the continue / explanation triggers of
+# classify_intent) used to lowercase the message and run `in` over their
+# own phrase list each. All phrase sets live here instead and are
+# compiled at import time into one Aho–Corasick automaton, so a single
+# pass over the message finds every category it matches, whatever the
+# number of phrases. Matching is plain substring matching, exactly as
+# `phrase in text.lower()` was.
+#
+# route(text) is memoized: every check made for the same message during
+# a turn reuses one scan.
+
+import functools
+from collections import deque
+
+# {category: phrases}
+PHRASE_SETS = {
+    # product_questions.is_product_question_rule
+    "product": [
+        # how it works
+        "how does this work",
+        "how does it work",
+        "how do you evaluate",
+        "how do u evaluate",
+        "how is this evaluated",
+        "what is your basis",
+        "basis for judgment",
+
+        # what is evaluated
+        "what will you evaluate",
+        "what do you evaluate",
+        "what all do you check",
+        "what are you checking",
+
+        # accuracy / reliability
+        "how accurate is this",
+        "is this accurate",
+        "can i trust this",
+        "is this reliable",
+
+        # meta / tool identity
+        "what is this tool",
+        "what is this",
+        "what can you do",
+        "who are you",
+    ],
+
+    # app.is_quick_explanation
+    "quick_explanation": [
+        "what is",
+        "what's",
+        "whats",
+        "what does",
+        "meaning of",
+        "meaning",
+        "define",
+        "explain",
+        "means",
+    ],
+
+    # intent.classify_intent: CONTINUE_ANYWAY
+    "continue": [
+        "continue anyway",
+        "just evaluate",
+        "just check",
+        "do it",
+        "do it anyway",
+        "skip",
+        "doesn't matter",
+        "not sure",
+        "you decide",
+    ],
+
+    # intent.classify_intent: EXPLANATION (domain concepts only)
+    "explanation": [
+        "what is",
+        "what does",
+        "what do you mean",
+        "meaning of",
+        "explain",
+        "how does",
+        "how do",
+        "why does",
+        "why is",
+    ],
+}
+
+
+class PhraseAutomaton:
+    """
+    Aho–Corasick automaton over {phrase: categories}, with the failure
+    links folded into a full transition table so a scan is one dict
+    lookup per character.
+    """
+
+    def __init__(self, phrase_sets: dict):
+        goto = [{}]
+        output = [set()]
+
+        for category, phrases in phrase_sets.items():
+            for phrase in phrases:
+                state = 0
+                for ch in phrase:
+                    if ch not in goto[state]:
+                        goto.append({})
+                        output.append(set())
+                        goto[state][ch] = len(goto) - 1
+                    state = goto[state][ch]
+                output[state].add(category)
+
+        # Breadth-first, so a state's failure target is complete before it
+        fail = [0] * len(goto)
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            output[state] |= output[fail[state]]
+
+            delta[state] = dict(delta[fail[state]])
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0) if state else 0
+                delta[state][ch] = child
+                queue.append(child)
+
+        self.delta = delta
+        self.output = [frozenset(categories) for categories in output]
+        self.size = len(goto)
+
+    def categories(self, text: str) -> frozenset:
+        delta, output = self.delta, self.output
+        state = 0
+        found = set()
+
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if output[state]:
+                found |= output[state]
+
+        return frozenset(found)
+
+
+ROUTER = PhraseAutomaton(PHRASE_SETS)
+
+
+@functools.lru_cache(maxsize=1024)
+def route(text: str) -> frozenset:
+    """
+    Every PHRASE_SETS category whose phrases occur in the message.
+    """
+    return ROUTER.categories(text.lower())
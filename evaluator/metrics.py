@@ -0,0 +1,199 @@
+# evaluator/metrics.py
+#
+# In-process metrics in the Prometheus text format (version 0.0.4).
+#
+# Counters and histograms are plain dicts behind a lock, keyed by label
+# values, so recording one observation costs a bisect and a dict update.
+# Counters that already exist elsewhere (cache hit/miss counts, fast
+# path, intent model) are not duplicated: register_collector reads them
+# when /metrics is scraped.
+#
+# Every process keeps its own numbers. Under uvicorn (render.yaml) that
+# is one process per instance; with several gunicorn workers a scrape
+# only sees the worker that served it.
+
+import bisect
+import contextlib
+import threading
+import time
+
+# Gateway round trips
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30)
+
+# Local work: session file, scoring, template rendering
+LOCAL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+_registry = []
+_collectors = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def expose(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # {labels: [per-bucket counts (last is +Inf), sum]}
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            data = self._values.get(labels)
+            if data is None:
+                data = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            data[0][i] += 1
+            data[1] += value
+
+    @contextlib.contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels) -> int:
+        data = self._values.get(labels)
+        return sum(data[0]) if data else 0
+
+    def expose(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+def register_collector(name: str, kind: str, documentation: str, labelnames: tuple, collect):
+    """
+    A metric read at scrape time: collect() returns {label values: value}.
+    """
+    _collectors.append((name, kind, documentation, labelnames, collect))
+
+
+def exposition() -> str:
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.expose())
+
+    for name, kind, documentation, labelnames, collect in _collectors:
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in sorted(collect().items()):
+            lines.append(f"{name}{_labels(labelnames, labels)} {_number(value)}")
+
+    return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# -----------------------
+# Metrics
+# -----------------------
+GATEWAY_SECONDS = Histogram(
+    "gateway_request_seconds",
+    "Gateway call latency by operation (streamed calls: until the stream opens).",
+    ("operation",),
+)
+GATEWAY_TOKENS = Counter(
+    "gateway_tokens_total",
+    "Tokens reported in gateway response usage.",
+    ("operation", "type"),
+)
+GATEWAY_ERRORS = Counter(
+    "gateway_errors_total",
+    "Gateway calls that raised.",
+    ("operation", "error"),
+)
+EXTRACTION_REJECTED = Counter(
+    "extraction_rejected_values_total",
+    "Extracted values dropped by decode_extraction, by field path.",
+    ("field",),
+)
+SESSION_SECONDS = Histogram(
+    "session_io_seconds",
+    "Server-side session load / save time.",
+    ("operation",),
+    buckets=LOCAL_BUCKETS,
+)
+SCORING_SECONDS = Histogram(
+    "scoring_seconds",
+    "score_privacy_cached time, cache lookups included.",
+    buckets=LOCAL_BUCKETS,
+)
+TEMPLATE_SECONDS = Histogram(
+    "template_render_seconds",
+    "Jinja rendering time by template.",
+    ("template",),
+    buckets=LOCAL_BUCKETS,
+)
+REQUEST_SECONDS = Histogram(
+    "http_request_seconds",
+    "Time until the response is ready (before a streamed body is sent).",
+    ("endpoint", "method", "status"),
+)
+
+
+def record_usage(operation: str, response):
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+
+    for kind in ("prompt_tokens", "completion_tokens"):
+        tokens = getattr(usage, kind, None)
+        if tokens:
+            GATEWAY_TOKENS.inc(operation, kind.removesuffix("_tokens"), amount=tokens)
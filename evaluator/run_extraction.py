@@ -1,15 +1,31 @@
-import os
+import asyncio
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from openai import OpenAI
-from dotenv import load_dotenv
 
+from evaluator.extraction_cache import extraction_cache, extraction_cache_key, normalize_text
+from evaluator.extraction_types import (
+    SECTION_SCHEMAS,
+    decode_extraction,
+    extraction_schema,
+)
+from evaluator.gateway import IDENTITY_ENCODING, achat_completion, chat_completion
+from evaluator.metrics import EXTRACTION_REJECTED
 from evaluator.logic.product_questions import is_product_question
 from evaluator.logic.product_explain import explain_product
 from evaluator.logic.intent import classify_intent
 from evaluator.logic.explain import explain_concept
+from evaluator.logic.field_resolver import (
+    NEGATIONS,
+    contains_phrase,
+    phrase_words,
+    record_fast_path,
+    resolve_field_answer,
+)
 from evaluator.logic.missing_fields import find_next_missing_field
 from evaluator.scoring.privacy_score_v1 import score_privacy_v1
+from evaluator.state import PropertyState
 
 # -----------------------
 # Debug mode
@@ -17,13 +33,14 @@ from evaluator.scoring.privacy_score_v1 import score_privacy_v1
 DEBUG_MODE = True
 
 # -----------------------
-# Load API key
+# Parallel extraction
 # -----------------------
-load_dotenv()
-client = OpenAI(
-    api_key=os.getenv("OPENAI_API_KEY"),
-    base_url="https://dncgateway.com/v1",
-)
+# A long description that doesn't answer a question is extracted one
+# section at a time, concurrently, each call with its section's schema.
+# The turn then waits for the slowest section instead of one completion
+# that fills every field.
+PARALLEL_EXTRACTION = os.getenv("PARALLEL_EXTRACTION", "1") != "0"
+PARALLEL_EXTRACTION_MIN_WORDS = int(os.getenv("PARALLEL_EXTRACTION_MIN_WORDS", "40"))
 
 # -----------------------
 # Load extraction schema
@@ -206,6 +223,82 @@ ATTACHMENT_SPACE_NORMALIZATION = {
     "lift": "common_area",
     "common corridor": "common_area",
 }
+
+# Phrase rules for the owner half of an attachment reply. "my"/"our" only
+# count when nothing more specific is said ("my neighbour's kitchen").
+ATTACHMENT_OWNER_PHRASES = {
+    "neighbour": "neighbor_unit",
+    "neighbours": "neighbor_unit",
+    "neighbor": "neighbor_unit",
+    "neighbors": "neighbor_unit",
+    "neighbouring": "neighbor_unit",
+    "neighboring": "neighbor_unit",
+    "next door": "neighbor_unit",
+    "other unit": "neighbor_unit",
+    "another unit": "neighbor_unit",
+    "other flat": "neighbor_unit",
+    "another flat": "neighbor_unit",
+    "other house": "neighbor_unit",
+    "another house": "neighbor_unit",
+    "someone else": "neighbor_unit",
+    "someone elses": "neighbor_unit",
+    "own": "own_unit",
+    "same unit": "own_unit",
+    "same flat": "own_unit",
+    "same house": "own_unit",
+    "same apartment": "own_unit",
+    "internal": "own_unit",
+}
+ATTACHMENT_WEAK_OWNER_PHRASES = {
+    "my": "own_unit",
+    "our": "own_unit",
+    "mine": "own_unit",
+    "ours": "own_unit",
+}
+
+# Singular and plural forms of ATTACHMENT_SPACE_NORMALIZATION
+_ATTACHMENT_SPACE_PHRASES = {
+    form: space_type
+    for phrase, space_type in ATTACHMENT_SPACE_NORMALIZATION.items()
+    for form in (phrase, phrase + "s")
+}
+
+
+def _phrase_value(text: str, phrases: dict):
+    """
+    The value of the phrases found in text, None if there are none, and
+    ... if they disagree. A phrase inside a longer found phrase is ignored.
+    """
+    found = [phrase for phrase in phrases if contains_phrase(text, phrase)]
+    found = [p for p in found if not any(p != q and contains_phrase(q, p) for q in found)]
+
+    values = {phrases[p] for p in found}
+    if len(values) > 1:
+        return ...
+    return values.pop() if values else None
+
+
+def parse_attachment_info(text: str) -> dict | None:
+    """
+    Local extract_attachment_info: owner and space_type from phrase
+    tables. None when the reply is negated, says nothing recognisable or
+    names conflicting owners/spaces, so the LLM should decide.
+    """
+    text = phrase_words(normalize_text(text))
+    if not text or NEGATIONS & set(text.split()):
+        return None
+
+    owner = _phrase_value(text, ATTACHMENT_OWNER_PHRASES)
+    if owner is None:
+        owner = _phrase_value(text, ATTACHMENT_WEAK_OWNER_PHRASES)
+    space_type = _phrase_value(text, _ATTACHMENT_SPACE_PHRASES)
+
+    if owner is ... or space_type is ... or (owner is None and space_type is None):
+        return None
+
+    return {"owner": owner, "space_type": space_type}
+
+
 def get_attached_sides(between_units: dict, confirmed_fields: set):
     if not between_units:
         return []
@@ -230,30 +323,45 @@ def get_attached_sides(between_units: dict, confirmed_fields: set):
 
     
 
+ATTACHMENT_MESSAGES = [
+    {
+        "role": "system",
+        "content": (
+            "Interpret the user's message about a wall attachment.\n"
+            "Return JSON with optional fields:\n"
+            "- owner: own_unit | neighbor_unit | null\n"
+            "- space_type: bedroom | non_bedroom | common_area | null\n"
+            "Do not infer side. Do not include any other fields."
+        )
+    },
+]
+
+
 def extract_attachment_info(text: str) -> dict:
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "Interpret the user's message about a wall attachment.\n"
-                    "Return JSON with optional fields:\n"
-                    "- owner: own_unit | neighbor_unit | null\n"
-                    "- space_type: bedroom | non_bedroom | common_area | null\n"
-                    "Do not infer side. Do not include any other fields."
-                )
-            },
-            {"role": "user", "content": text}
-        ],
+    parsed = parse_attachment_info(text)
+    if parsed is not None:
+        return parsed
+
+    response = chat_completion(
+        messages=ATTACHMENT_MESSAGES + [{"role": "user", "content": text}],
+        operation="extract_attachment_info",
         response_format={ "type": "json_object" },
-        extra_headers={
-            "X-API-Key": "usr_8f3a91c2d7",
-            "X-App-Id": "dnc-property-evaluator",
-            "Accept-Encoding": "identity",
-            # optional for now:
-            # "X-User-Id": "aman"
-        }
+        extra_headers=IDENTITY_ENCODING,
+    )
+
+    return json.loads(response.choices[0].message.content)
+
+
+async def extract_attachment_info_async(text: str) -> dict:
+    parsed = parse_attachment_info(text)
+    if parsed is not None:
+        return parsed
+
+    response = await achat_completion(
+        messages=ATTACHMENT_MESSAGES + [{"role": "user", "content": text}],
+        operation="extract_attachment_info",
+        response_format={ "type": "json_object" },
+        extra_headers=IDENTITY_ENCODING,
     )
 
     return json.loads(response.choices[0].message.content)
@@ -262,8 +370,7 @@ def extract_attachment_info(text: str) -> dict:
 # -----------------------
 # Extraction helper
 # -----------------------
-def run_extraction(text: str, context: dict | None = None) -> dict:
-
+def extraction_messages(text: str, context: dict | None = None) -> list:
     context_block = ""
 
     if context and context.get("last_question"):
@@ -306,40 +413,168 @@ def run_extraction(text: str, context: dict | None = None) -> dict:
                 populate ONLY that field.
                 """
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You extract structured property privacy data from user text.\n"
-                    "Use null for missing or unknown values.\n"
-                    "Do not invent information.\n"
-                    "Only use enum values defined in the schema.\n"
-                    "Never create new enum values.\n"
-                    "You must map user descriptions and try and understand the gist of user message and add to the closest matching enum value.\n"
-                    + context_block
-                )
-            },
-            {
-                "role": "user",
-                "content": text
-            }
-        ],
-        functions=[privacy_schema],
-        function_call={"name": privacy_schema["name"]},
-        extra_headers={
-            "X-API-Key": "usr_8f3a91c2d7",
-            "X-App-Id": "dnc-property-evaluator",
-            # optional for now:
-            # "X-User-Id": "aman"
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You extract structured property privacy data from user text.\n"
+                "Use null for missing or unknown values.\n"
+                "Do not invent information.\n"
+                "Only use enum values defined in the schema.\n"
+                "Never create new enum values.\n"
+                "You must map user descriptions and try and understand the gist of user message and add to the closest matching enum value.\n"
+                + context_block
+            )
+        },
+        {
+            "role": "user",
+            "content": text
         }
+    ]
+
+
+def decode_extraction_response(response, cache_key: str | None = None) -> dict:
+    rejected = []
+    extracted = decode_extraction(
+        response.choices[0].message.function_call.arguments,
+        rejected,
     )
 
-    return json.loads(
-        response.choices[0].message.function_call.arguments
+    for field in rejected:
+        EXTRACTION_REJECTED.inc(field)
+
+    if cache_key is not None:
+        extraction_cache.put(cache_key, extracted)
+
+    return extracted
+
+
+def split_by_section(text: str, context: dict | None) -> bool:
+    """
+    Only a long reply to no particular question is split; a reply to a
+    field or section question stays one call, scoped by extraction_schema.
+    """
+    return (
+        PARALLEL_EXTRACTION and
+        not (context and context.get("last_question")) and
+        len(text.split()) >= PARALLEL_EXTRACTION_MIN_WORDS
     )
+
+
+def merge_sections(parts: list) -> dict:
+    """
+    merge_extraction of the per-section results. A section that came back
+    with only nulls is kept as it was, since a present section means
+    "asked about, nothing known" to the state just as in a single call.
+    """
+    merged = {}
+
+    for part in parts:
+        merge_extraction(merged, part)
+
+        for section, section_data in part.items():
+            if section in ALLOWED_FIELDS and section_data and not merged.get(section):
+                merged[section] = dict(section_data)
+
+    return merged
+
+
+# The sync and async variants below share everything but the gateway
+# call: known_extraction before it, the *_request kwargs for it and
+# decode_extraction_response after it.
+def known_extraction(text: str, context: dict | None) -> tuple:
+    """
+    (extracted, cache_key): extracted is the fast-path or cached result,
+    or None when the LLM has to be asked.
+    """
+    # Short replies to a single-field question need no LLM call
+    resolved = resolve_field_answer(text, context)
+    record_fast_path(resolved is not None)
+    if resolved is not None:
+        return resolved, None
+
+    cache_key = extraction_cache_key(text, context)
+    return extraction_cache.get(cache_key), cache_key
+
+
+def extraction_request(text: str, context: dict | None) -> dict:
+    return {
+        "messages": extraction_messages(text, context),
+        "operation": "run_extraction",
+        "functions": [extraction_schema(context)],
+        "function_call": {"name": privacy_schema["name"]},
+    }
+
+
+def section_request(text: str, context: dict | None, section: str) -> dict:
+    return {
+        "messages": extraction_messages(text, context),
+        "operation": "extract_section",
+        "functions": [SECTION_SCHEMAS[section]],
+        "function_call": {"name": privacy_schema["name"]},
+    }
+
+
+def extract_section(text: str, context: dict | None, section: str) -> dict:
+    return decode_extraction_response(chat_completion(**section_request(text, context, section)))
+
+
+async def extract_section_async(text: str, context: dict | None, section: str) -> dict:
+    return decode_extraction_response(await achat_completion(**section_request(text, context, section)))
+
+
+def run_extraction_by_section(text: str, context: dict | None = None) -> dict:
+    """
+    One extraction per section on worker threads, merged.
+    """
+    with ThreadPoolExecutor(max_workers=len(SECTION_SCHEMAS)) as pool:
+        parts = list(pool.map(lambda section: extract_section(text, context, section), SECTION_SCHEMAS))
+
+    return merge_sections(parts)
+
+
+async def run_extraction_by_section_async(text: str, context: dict | None = None) -> dict:
+    parts = await asyncio.gather(*(
+        extract_section_async(text, context, section) for section in SECTION_SCHEMAS
+    ))
+
+    return merge_sections(parts)
+
+
+def run_extraction(text: str, context: dict | None = None) -> dict:
+    extracted, cache_key = known_extraction(text, context)
+    if extracted is not None:
+        return extracted
+
+    if split_by_section(text, context):
+        extracted = run_extraction_by_section(text, context)
+        extraction_cache.put(cache_key, extracted)
+        return extracted
+
+    return decode_extraction_response(chat_completion(**extraction_request(text, context)), cache_key)
+
+
+async def run_extraction_async(text: str, context: dict | None = None) -> dict:
+    """
+    run_extraction on the async gateway client.
+    """
+    extracted, cache_key = known_extraction(text, context)
+    if extracted is not None:
+        return extracted
+
+    if split_by_section(text, context):
+        extracted = await run_extraction_by_section_async(text, context)
+        extraction_cache.put(cache_key, extracted)
+        return extracted
+
+    return decode_extraction_response(await achat_completion(**extraction_request(text, context)), cache_key)
+
+
 def normalize_extraction(data: dict) -> dict:
+    """
+    Cleans up an extracted dict that didn't come through
+    decode_extraction (stored or hand-written records).
+    """
     for section in [
         "privacy_in_room",
         "privacy_between_rooms",
@@ -379,7 +614,17 @@ def normalize_extraction(data: dict) -> dict:
 
     return data
 
-def merge_extraction(base: dict, update: dict):
+def merge_extraction(base, update: dict) -> set:
+    """
+    Merges non-null fields from update into base (an extracted dict or a
+    PropertyState).
+    Returns the (section, field) pairs whose value actually changed.
+    """
+    if isinstance(base, PropertyState):
+        return base.merge(update)
+
+    changed = set()
+
     for section, section_data in update.items():
         if section not in ALLOWED_FIELDS or not section_data:
             continue
@@ -391,8 +636,12 @@ def merge_extraction(base: dict, update: dict):
                 continue
 
             if value is not None:
+                if base[section].get(field) != value:
+                    changed.add((section, field))
                 base[section][field] = value
 
+    return changed
+
 
 
 def evaluate_property(user_input: str):
@@ -403,7 +652,7 @@ def evaluate_property(user_input: str):
     - next question OR final score
     """
 
-    extracted = normalize_extraction(run_extraction(user_input))
+    extracted = run_extraction(user_input)
 
     return extracted
 
@@ -450,7 +699,7 @@ def run_cli():
     # -----------------------
     # Initial extraction
     # -----------------------
-    extracted_privacy = normalize_extraction(run_extraction(initial_input))
+    extracted_privacy = run_extraction(initial_input)
 
     if DEBUG_MODE:
         print("\n=== DEBUG: INITIAL EXTRACTION ===")
@@ -559,7 +808,7 @@ def run_cli():
         # -----------------------
         # Run extraction
         # -----------------------
-        update = normalize_extraction(run_extraction(user_input))
+        update = run_extraction(user_input)
 
         if DEBUG_MODE:
             print("🔎 Raw extraction:", json.dumps(update, indent=2))
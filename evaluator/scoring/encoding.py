@@ -0,0 +1,243 @@
+# scoring/encoding.py
+
+# -----------------------
+# Column encoding
+# -----------------------
+# Every field is stored as a small integer code:
+#   0 = unknown (None)
+#   1 = present but not a value the scorer recognises
+#   2.. = position in the vocabulary below
+UNKNOWN = 0
+UNRECOGNISED = 1
+
+IN_ROOM_VOCAB = {
+    "room_size": ("small", "average", "large"),
+    "ceiling_height_ft": ("low", "standard", "between", "high"),
+    "window_placement": ("door_wall", "away_from_door"),
+    "window_facing_side": ("front", "side", "back"),
+}
+
+BETWEEN_ROOMS_VOCAB = {
+    "has_multiple_bedrooms": (True, False),
+    "bedrooms_share_wall": (True, False),
+    "buffer_between_rooms": ("none", "small_passage", "large_lobby", "big_hall"),
+    "window_proximity_between_rooms": (
+        "close_facing_each_other",
+        "close_not_facing",
+        "far_apart_not_facing",
+        "far_apart_facing",
+    ),
+}
+
+BETWEEN_UNITS_VOCAB = {
+    "unit_type": ("apartment", "independent_house", "row_house"),
+    "front_open_space": (
+        "attached",
+        "tight_service_gap",
+        "narrow_gap",
+        "narrow_road",
+        "wide_road",
+        "front_yard",
+    ),
+    "side_a_open_space": (
+        "attached",
+        "tight_service_gap",
+        "narrow_gap",
+        "side_alley",
+        "small_side_yard",
+        "narrow_road",
+        "side_road",
+        "large_side_yard",
+    ),
+    "side_b_open_space": (
+        "attached",
+        "tight_service_gap",
+        "narrow_gap",
+        "side_alley",
+        "small_side_yard",
+        "narrow_road",
+        "side_road",
+        "large_side_yard",
+    ),
+    "back_open_space": (
+        "none",
+        "attached",
+        "tight_service_gap",
+        "narrow_gap",
+        "back_alley",
+        "narrow_road",
+        "back_road",
+        "private_backyard",
+    ),
+    "is_in_gated_society": (True, False),
+    "surrounding_layout_uniformity": (
+        "uniform_layout",
+        "mostly_uniform",
+        "mixed_layout",
+        "irregular_layout",
+    ),
+    "distance_between_apartment_doors": ("very_close", "moderate", "far_apart"),
+    "apartment_entry_buffer": (
+        "direct_to_room",
+        "direct_to_hall",
+        "foyer_to_room",
+        "foyer_to_hall",
+    ),
+}
+
+ATTACHMENT_OWNER_VOCAB = ("own_unit", "neighbor_unit")
+ATTACHMENT_SPACE_VOCAB = ("bedroom", "non_bedroom", "common_area")
+ATTACHMENT_STRIDE = len(ATTACHMENT_SPACE_VOCAB) + 2
+ATTACHMENT_CODES = (len(ATTACHMENT_OWNER_VOCAB) + 2) * ATTACHMENT_STRIDE
+
+SECTIONS = (
+    ("privacy_in_room", IN_ROOM_VOCAB),
+    ("privacy_between_rooms", BETWEEN_ROOMS_VOCAB),
+    ("privacy_between_units", BETWEEN_UNITS_VOCAB),
+)
+
+COLUMNS = tuple(
+    (section, field)
+    for section, vocab in SECTIONS
+    for field in vocab
+)
+COLUMN_INDEX = {field: i for i, (_, field) in enumerate(COLUMNS)}
+
+BOOLEAN_FIELDS = {"has_multiple_bedrooms", "bedrooms_share_wall", "is_in_gated_society"}
+
+
+def _lookup(vocab):
+    return {value: i + 2 for i, value in enumerate(vocab)}
+
+
+_OWNER_LOOKUP = _lookup(ATTACHMENT_OWNER_VOCAB)
+_SPACE_LOOKUP = _lookup(ATTACHMENT_SPACE_VOCAB)
+
+
+def _code(lookup, value):
+    if value is None:
+        return UNKNOWN
+    try:
+        return lookup.get(value, UNRECOGNISED)
+    except TypeError:
+        # Unhashable junk from the LLM
+        return UNRECOGNISED
+
+
+def _bool_code(value):
+    if value is None:
+        return UNKNOWN
+    if value is True:
+        return 2
+    if value is False:
+        return 3
+    return UNRECOGNISED
+
+
+def _ceiling_code(value):
+    """
+    Buckets a ceiling height the same way score_privacy_v1 compares it.
+    """
+    if value is None:
+        return UNKNOWN
+    try:
+        if value < 8:
+            return 2
+        if value == 8:
+            return 3
+        if value >= 9:
+            return 5
+        return 4
+    except TypeError:
+        return UNRECOGNISED
+
+
+class _Codes(dict):
+    def __missing__(self, value):
+        return UNRECOGNISED
+
+
+def _encoder(field, vocab):
+    if field in BOOLEAN_FIELDS:
+        return _bool_code
+    if field == "ceiling_height_ft":
+        return _ceiling_code
+
+    lookup = _Codes(_lookup(vocab))
+    lookup[None] = UNKNOWN
+    return lookup.__getitem__
+
+
+# (section, ((field, encoder), ...)) built once so encoding a row is a flat loop
+_ENCODERS = tuple(
+    (section, tuple((field, _encoder(field, values)) for field, values in vocab.items()))
+    for section, vocab in SECTIONS
+)
+_FIELD_ENCODERS = {
+    field: encoder
+    for _, encoders in _ENCODERS
+    for field, encoder in encoders
+}
+
+
+def encode_field(field: str, value) -> int:
+    return _FIELD_ENCODERS[field](value)
+
+
+def field_encoder(field: str):
+    """
+    The value → code function for one field, for callers encoding the
+    same field many times.
+    """
+    return _FIELD_ENCODERS[field]
+
+
+def encode_attachment(info: dict) -> int:
+    """
+    Packs one attachment_details entry into a single code:
+    owner_code * ATTACHMENT_STRIDE + space_type_code.
+    """
+    return (
+        _code(_OWNER_LOOKUP, info.get("owner")) * ATTACHMENT_STRIDE
+        + _code(_SPACE_LOOKUP, info.get("space_type"))
+    )
+
+
+def encode_extraction(extracted: dict):
+    """
+    Returns (field_codes, attachment_codes) for one extracted dict.
+    Attachment codes keep the dict iteration order so the penalties are
+    subtracted in the same order as the scalar scorer.
+    """
+    codes = []
+    append = codes.append
+
+    for section, encoders in _ENCODERS:
+        data = extracted.get(section) or {}
+        get = data.get
+        for field, encoder in encoders:
+            try:
+                append(encoder(get(field)))
+            except TypeError:
+                # Unhashable junk from the LLM
+                append(UNRECOGNISED)
+
+    attachment_details = extracted.get("attachment_details") or {}
+    attachments = [encode_attachment(info) for info in attachment_details.values()]
+
+    return codes, attachments
+
+
+def canonical_fingerprint(extracted: dict) -> tuple:
+    """
+    Hashable, canonical form of an extracted dict for cache keys.
+
+    Fields are laid out in the fixed COLUMNS order (so dict ordering and
+    extra keys don't matter) and values are normalized to their codes:
+    two states with the same fingerprint always score identically, e.g.
+    ceiling 7 and 7.5 or "null"-free vs missing sections.
+    Attachment codes keep their order because it affects the order of
+    the explanation strings.
+    """
+    codes, attachments = encode_extraction(extracted)
+    return bytes(codes), bytes(attachments)
@@ -0,0 +1,183 @@
+# scoring/privacy_rules_v1.py
+#
+# The privacy_score_v1 adjustments expressed as data.
+# Each rule maps a field value to (delta, strength, concern):
+#   delta    → added to the section score
+#   strength → appended to explanation.strengths (or None)
+#   concern  → appended to explanation.concerns (or None)
+#
+# Rules are applied in the order they are listed here, which is the
+# order score_privacy_v1 walks its branches.
+
+# =====================================================
+# PRIVACY IN ROOM (25%)
+# =====================================================
+IN_ROOM_BASE = 0.65
+
+IN_ROOM_RULES = {
+    "room_size": {
+        "small": (-0.25, None, "Small bedroom size reduces personal privacy"),
+        "large": (0.08, "Spacious bedroom improves sense of personal privacy", None),
+        "average": (0.0, "Bedroom size is proportionate and suitable for privacy", None),
+    },
+    # Keys are the ceiling buckets from scoring/encoding.py
+    "ceiling_height_ft": {
+        "low": (-0.18, None, "Low ceiling height reduces spatial comfort and privacy perception"),
+        "standard": (0.0, "Standard ceiling height provides acceptable privacy comfort", None),
+        "high": (0.05, "Higher ceiling improves sense of openness and privacy", None),
+    },
+    "window_placement": {
+        "door_wall": (-0.25, None, "Window on the same wall as the door reduces visual privacy"),
+        "away_from_door": (0.05, "Window positioned away from door improves visual privacy", None),
+    },
+}
+
+# =====================================================
+# PRIVACY BETWEEN ROOMS (30%)
+# =====================================================
+BETWEEN_ROOMS_BASE = 0.85
+
+# Neutral score when has_multiple_bedrooms is False
+SINGLE_BEDROOM_SCORE = 1.0
+
+BETWEEN_ROOMS_RULES = {
+    "bedrooms_share_wall": {
+        True: (-0.25, None, "Bedrooms sharing a wall reduces acoustic privacy"),
+        False: (0.05, "Bedrooms do not share walls, improving acoustic separation", None),
+    },
+    "buffer_between_rooms": {
+        "none": (-0.18, None, "No buffer between bedrooms allows direct sound and visual transfer"),
+        "small_passage": (-0.05, None, "Only a small passage separates bedrooms, offering limited privacy buffering"),
+        "large_lobby": (0.12, "Large lobby between bedrooms significantly improves privacy", None),
+        "big_hall": (0.15, "Big hall between bedrooms offers strong visual and acoustic privacy", None),
+    },
+    "window_proximity_between_rooms": {
+        "close_facing_each_other": (-0.32, None, "Bedroom windows close and facing each other allow sound and visual intrusion"),
+        "close_not_facing": (-0.18, None, "Bedroom windows are close, which can still transmit sound"),
+        "far_apart_facing": (0.03, "Bedroom windows face each other but are far apart, reducing intrusion", None),
+        "far_apart_not_facing": (0.06, "Bedroom windows are well separated and not facing each other", None),
+    },
+}
+
+# =====================================================
+# PRIVACY BETWEEN UNITS (45%)
+# =====================================================
+BETWEEN_UNITS_BASE = 0.65
+
+SIDE_OPEN_SPACE_RULES = {
+    "tight_service_gap": (-0.12, None, "Very narrow side gap provides limited privacy"),
+    "narrow_gap": (-0.12, None, "Very narrow side gap provides limited privacy"),
+    "side_alley": (-0.05, None, "Limited side clearance reduces lateral privacy"),
+    "narrow_road": (-0.05, None, "Limited side clearance reduces lateral privacy"),
+    "small_side_yard": (-0.05, None, "Limited side clearance reduces lateral privacy"),
+    "side_road": (0.03, "Side road provides moderate separation", None),
+    "large_side_yard": (0.06, "Large side yard significantly improves lateral privacy", None),
+}
+
+BETWEEN_UNITS_RULES = {
+    "unit_type": {
+        "apartment": (-0.12, None, "Shared apartment living slightly reduces overall privacy"),
+        "independent_house": (0.08, "Independent house structure improves structural privacy separation", None),
+        "row_house": (0.03, "Row house layout offers better separation than apartments", None),
+    },
+    # "attached" fronts/backs are handled by ATTACHMENT_RULES
+    "front_open_space": {
+        "tight_service_gap": (-0.15, None, "Very narrow front gap provides limited privacy buffer"),
+        "narrow_gap": (-0.15, None, "Very narrow front gap provides limited privacy buffer"),
+        "narrow_road": (-0.12, None, "Bedroom faces a narrow road, limiting privacy"),
+        "wide_road": (0.03, "Wide road in front provides separation", None),
+        "front_yard": (0.06, "Front yard provides a visual buffer from the street", None),
+    },
+    "side_a_open_space": SIDE_OPEN_SPACE_RULES,
+    "side_b_open_space": SIDE_OPEN_SPACE_RULES,
+    "back_open_space": {
+        "tight_service_gap": (-0.15, None, "Very narrow rear gap provides limited privacy buffer"),
+        "narrow_gap": (-0.15, None, "Very narrow rear gap provides limited privacy buffer"),
+        "back_alley": (-0.10, None, "Rear alley or narrow road offers limited privacy separation"),
+        "narrow_road": (-0.10, None, "Rear alley or narrow road offers limited privacy separation"),
+        "back_road": (-0.05, None, "Rear road reduces privacy despite some separation"),
+        "private_backyard": (0.10, "Private backyard significantly improves rear privacy", None),
+    },
+    "is_in_gated_society": {
+        True: (0.07, "Gated society improves privacy through controlled access", None),
+    },
+    "surrounding_layout_uniformity": {
+        "uniform_layout": (0.05, "Uniform surrounding layout reduces visual and noise intrusion", None),
+        "mostly_uniform": (0.02, "Mostly uniform surrounding layout offers consistency", None),
+        "mixed_layout": (-0.04, None, "Mixed surrounding layout can increase visual and noise exposure"),
+        "irregular_layout": (-0.08, None, "Irregular surrounding layout can increase privacy intrusion"),
+    },
+    "distance_between_apartment_doors": {
+        "very_close": (-0.10, None, "Very close entrance doors reduce separation"),
+        "moderate": (-0.03, None, "Moderate distance between entrance doors limits separation"),
+        "far_apart": (0.05, "Greater distance between apartment doors improves privacy", None),
+    },
+    "apartment_entry_buffer": {
+        "direct_to_room": (-0.22, None, "Entrance opening directly into a private room severely compromises privacy"),
+        "foyer_to_room": (-0.14, None, "Small foyer before a private room provides limited privacy buffer"),
+        "direct_to_hall": (0.03, "Entrance opening into the hall avoids direct exposure of private rooms", None),
+        "foyer_to_hall": (0.08, "Foyer separating entrance from living areas strongly improves privacy from common corridors", None),
+    },
+}
+
+# ---- Attachment details, keyed on (owner, space_type).
+# Applied after the first clamp, once per attachment_details entry.
+ATTACHMENT_RULES = {
+    ("neighbor_unit", "bedroom"): (-0.15, None, "Bedroom wall attached to a neighboring bedroom severely reduces acoustic privacy"),
+    ("neighbor_unit", "non_bedroom"): (-0.10, None, "Bedroom wall attached to a neighboring unit reduces privacy"),
+    ("neighbor_unit", "common_area"): (-0.08, None, "Bedroom wall adjacent to a shared common corridor or lobby reduces privacy"),
+    ("neighbor_unit", None): (-0.14, None, "Wall attached to neighboring unit reduces privacy"),
+    ("own_unit", "bedroom"): (0.0, None, "Bedrooms within the same apartment sharing walls reduce internal privacy"),
+    ("own_unit", "non_bedroom"): (0.0, "Bedroom wall attached to another room within the apartment avoids external noise intrusion", None),
+    ("own_unit", "common_area"): (0.0, None, "Bedroom wall adjacent to an internal lobby or corridor slightly reduces privacy"),
+}
+
+# =====================================================
+# CONTEXTUAL: WINDOW × OPEN SPACE
+# =====================================================
+FRONT_WINDOW_RULES = {
+    "attached": (0.0, None, "Front window indicated despite attached structure — configuration may be inconsistent"),
+    "front_yard": (0.05, "Front-facing window benefits from a front yard", None),
+    "wide_road": (0.02, "Front-facing window benefits from a wider road providing some separation", None),
+    "narrow_road": (-0.14, None, "Front-facing window exposed to a narrow road"),
+    "tight_service_gap": (-0.18, None, "Front-facing window opens into a very narrow gap"),
+    "narrow_gap": (-0.18, None, "Front-facing window opens into a very narrow gap"),
+}
+
+BACK_WINDOW_RULES = {
+    "attached": (0.0, None, "Back window indicated despite attached structure — configuration may be inconsistent"),
+    "back_road": (0.02, "Back window facing a wider road creates seperation", None),
+    "private_backyard": (0.08, "Back-facing window overlooking a private backyard improves privacy", None),
+    "tight_service_gap": (-0.18, None, "Back-facing window opening into a narrow gap reduces privacy"),
+    "narrow_gap": (-0.18, None, "Back-facing window opening into a narrow gap reduces privacy"),
+    "back_alley": (-0.14, None, "Back-facing window exposed to a rear road or alley reduces privacy"),
+    "narrow_road": (-0.14, None, "Back-facing window exposed to a rear road or alley reduces privacy"),
+}
+
+# Side windows look at both sides: if either side has a positive effect
+# the window is assumed to face the better side, otherwise the worse one.
+SIDE_WINDOW_EFFECTS = {
+    "large_side_yard": 0.06,
+    "side_road": 0.06,
+    "small_side_yard": -0.05,
+    "side_alley": -0.14,
+    "narrow_road": -0.14,
+    "tight_service_gap": -0.18,
+    "narrow_gap": -0.18,
+}
+SIDE_WINDOW_STRENGTH = "Side-facing window benefits from open space along the side"
+SIDE_WINDOW_CONCERN = "Side-facing window exposed to limited side clearance reduces privacy"
+
+# =====================================================
+# FINAL SCORE
+# =====================================================
+SECTION_WEIGHTS = {
+    "privacy_in_room": 0.25,
+    "privacy_between_rooms": 0.30,
+    "privacy_between_units": 0.45,
+}
+
+CONFIDENCE_LEVELS = (
+    (0.8, "high"),
+    (0.5, "medium"),
+)
@@ -0,0 +1,191 @@
+# scoring/privacy_score_batch.py
+
+import numpy as np
+
+from evaluator.scoring import privacy_rules_v1 as rules
+from evaluator.scoring import privacy_score_compiled as compiled
+from evaluator.scoring.encoding import COLUMNS, COLUMN_INDEX, UNKNOWN
+from evaluator.state import encode_state
+
+
+def encode_extractions(extractions):
+    """
+    Encodes an iterable of extracted dicts (or PropertyStates) into
+    integer columns.
+
+    Returns:
+    - fields: int8 array of shape (n, len(COLUMNS))
+    - attachments: int8 array of shape (n, max attachments), 0 = empty slot
+    """
+    rows = []
+    attachment_rows = []
+
+    for extracted in extractions:
+        codes, attachments = encode_state(extracted)
+        rows.append(codes)
+        attachment_rows.append(attachments)
+
+    return stack_encoded(rows, attachment_rows)
+
+
+def stack_encoded(rows: list, attachment_rows: list):
+    """
+    Packs per-record (field_codes, attachment_codes) lists into the
+    arrays encode_extractions returns.
+    """
+    width = max((len(a) for a in attachment_rows), default=0)
+
+    fields = np.array(rows, dtype=np.int8).reshape(len(rows), len(COLUMNS))
+    attachments = np.zeros((len(rows), width), dtype=np.int8)
+
+    for i, row in enumerate(attachment_rows):
+        if row:
+            attachments[i, :len(row)] = row
+
+    return fields, attachments
+
+
+# -----------------------
+# Delta arrays (indexed by code)
+# -----------------------
+# Built from the compiled rule tables so the batch engine and the scalar
+# engines read the same numbers.
+def _deltas(table):
+    return np.array(table[0], dtype=np.float64)
+
+
+def _steps(steps):
+    return tuple((column, _deltas(table)) for column, *table in steps)
+
+
+IN_ROOM_DELTAS = _steps(compiled.IN_ROOM_STEPS)
+BETWEEN_ROOMS_DELTAS = _steps(compiled.BETWEEN_ROOMS_STEPS)
+BETWEEN_UNITS_DELTAS = _steps(compiled.BETWEEN_UNITS_STEPS)
+
+ATTACHMENT_DELTA = _deltas(compiled.ATTACHMENT_TABLE)
+FRONT_WINDOW_DELTA = _deltas(compiled.FRONT_WINDOW_TABLE)
+BACK_WINDOW_DELTA = _deltas(compiled.BACK_WINDOW_TABLE)
+SIDE_WINDOW_DELTA = _deltas(compiled.SIDE_WINDOW_TABLE)
+
+
+def _col(fields, name):
+    return fields[:, COLUMN_INDEX[name]]
+
+
+def _apply_steps(score, fields, steps):
+    for column, deltas in steps:
+        score += deltas[fields[:, column]]
+    np.clip(score, 0, 1, out=score)
+
+
+def _round_exact(values, ndigits):
+    """
+    Rounds with Python's round() so results are bit-identical to the
+    scalar scorer. Only the distinct values go through Python.
+    """
+    unique, inverse = np.unique(values, return_inverse=True)
+    rounded = np.array([round(float(v), ndigits) for v in unique], dtype=np.float64)
+    return rounded[inverse.reshape(values.shape)]
+
+
+# -----------------------
+# Batch scoring
+# -----------------------
+def score_encoded(fields: np.ndarray, attachments: np.ndarray) -> dict:
+    """
+    Scores pre-encoded columns (see encode_extractions).
+    Deltas are applied in the same order as score_privacy_v1 so every
+    intermediate float matches the scalar path.
+    """
+    n = fields.shape[0]
+
+    # =====================================================
+    # PRIVACY IN ROOM (25%)
+    # =====================================================
+    in_room = np.full(n, rules.IN_ROOM_BASE)
+    _apply_steps(in_room, fields, IN_ROOM_DELTAS)
+
+    # =====================================================
+    # PRIVACY BETWEEN ROOMS (30%)
+    # =====================================================
+    single_bedroom = _col(fields, "has_multiple_bedrooms") == compiled.SINGLE_BEDROOM
+
+    between_rooms = np.full(n, rules.BETWEEN_ROOMS_BASE)
+    _apply_steps(between_rooms, fields, BETWEEN_ROOMS_DELTAS)
+    between_rooms[single_bedroom] = rules.SINGLE_BEDROOM_SCORE
+
+    # =====================================================
+    # PRIVACY BETWEEN UNITS (45%)
+    # =====================================================
+    between_units = np.full(n, rules.BETWEEN_UNITS_BASE)
+    _apply_steps(between_units, fields, BETWEEN_UNITS_DELTAS)
+
+    for slot in range(attachments.shape[1]):
+        between_units += ATTACHMENT_DELTA[attachments[:, slot]]
+
+    # ---- Window × open space
+    window_side = _col(fields, "window_facing_side")
+    side_pair = (
+        _col(fields, "side_a_open_space").astype(np.intp) * compiled.SIDE_STRIDE
+        + _col(fields, "side_b_open_space")
+    )
+
+    between_units += np.select(
+        [
+            window_side == compiled.WINDOW_FRONT,
+            window_side == compiled.WINDOW_BACK,
+            window_side == compiled.WINDOW_SIDE,
+        ],
+        [
+            FRONT_WINDOW_DELTA[_col(fields, "front_open_space")],
+            BACK_WINDOW_DELTA[_col(fields, "back_open_space")],
+            SIDE_WINDOW_DELTA[side_pair],
+        ],
+        default=0.0,
+    )
+    np.clip(between_units, 0, 1, out=between_units)
+
+    # =====================================================
+    # FINAL SCORE
+    # =====================================================
+    weights = rules.SECTION_WEIGHTS
+    weighted_score = (
+        in_room * weights["privacy_in_room"] +
+        between_rooms * weights["privacy_between_rooms"] +
+        between_units * weights["privacy_between_units"]
+    )
+
+    # =====================================================
+    # CONFIDENCE
+    # =====================================================
+    known = fields != UNKNOWN
+    rooms_detail = list(compiled.ROOMS_DETAIL_COLUMNS)
+    known_rooms_detail = known[:, rooms_detail].sum(axis=1)
+
+    known_fields = known.sum(axis=1) - np.where(single_bedroom, known_rooms_detail, 0)
+    total_fields = np.where(single_bedroom, len(COLUMNS) - len(rooms_detail), len(COLUMNS))
+    confidence_ratio = known_fields / total_fields
+
+    confidence = np.select(
+        [confidence_ratio >= threshold for threshold, _ in rules.CONFIDENCE_LEVELS],
+        [level for _, level in rules.CONFIDENCE_LEVELS],
+        default="low",
+    )
+
+    return {
+        "privacy_score_1_to_10": _round_exact(weighted_score * 10, 1),
+        "confidence": confidence,
+        "privacy_in_room": _round_exact(in_room, 2),
+        "privacy_between_rooms": _round_exact(between_rooms, 2),
+        "privacy_between_units": _round_exact(between_units, 2),
+    }
+
+
+def score_privacy_batch(extractions) -> dict:
+    """
+    Scores many extracted dicts at once.
+    Returns a dict of arrays keyed like score_privacy_v1's result
+    (final score, confidence and the three section scores).
+    """
+    fields, attachments = encode_extractions(extractions)
+    return score_encoded(fields, attachments)
@@ -0,0 +1,50 @@
+# scoring/privacy_score_cached.py
+
+import os
+
+from evaluator.cache import LRUCache
+from evaluator.scoring.encoding import canonical_fingerprint
+from evaluator.scoring.privacy_score_compiled import score_codes
+from evaluator.state import PropertyState
+
+SCORE_CACHE_SIZE = int(os.getenv("SCORE_CACHE_SIZE", "4096"))
+
+score_cache = LRUCache(maxsize=SCORE_CACHE_SIZE)
+
+
+def _copy_result(result: dict) -> dict:
+    # Callers stash results in the session and may mutate the lists
+    return {
+        **result,
+        "breakdown": dict(result["breakdown"]),
+        "explanation": {
+            "strengths": list(result["explanation"]["strengths"]),
+            "concerns": list(result["explanation"]["concerns"]),
+        },
+    }
+
+
+def score_privacy_cached(extracted) -> dict:
+    """
+    score_privacy_v1 behind a bounded LRU keyed on canonical_fingerprint.
+    Takes an extracted dict or a PropertyState.
+    """
+    if isinstance(extracted, PropertyState):
+        fingerprint = extracted.fingerprint()
+    else:
+        fingerprint = canonical_fingerprint(extracted)
+
+    result = score_cache.get(fingerprint)
+    if result is None:
+        codes, attachments = fingerprint
+        result = score_codes(list(codes), list(attachments))
+        score_cache.put(fingerprint, result)
+
+    return _copy_result(result)
+
+
+def score_cache_info() -> dict:
+    """
+    Hit/miss counters for sizing SCORE_CACHE_SIZE.
+    """
+    return score_cache.stats()
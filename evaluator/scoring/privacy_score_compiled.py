@@ -0,0 +1,348 @@
+# scoring/privacy_score_compiled.py
+#
+# Table-driven version of score_privacy_v1.
+# The rules in privacy_rules_v1 are compiled at import time into flat
+# tuples indexed by the integer codes from scoring/encoding.py, so scoring
+# a record is a handful of indexed reads and sums.
+# score_privacy_v1 stays as the reference implementation.
+
+from evaluator.scoring import privacy_rules_v1 as rules
+from evaluator.scoring.encoding import (
+    ATTACHMENT_CODES,
+    ATTACHMENT_OWNER_VOCAB,
+    ATTACHMENT_SPACE_VOCAB,
+    ATTACHMENT_STRIDE,
+    COLUMN_INDEX,
+    COLUMNS,
+    SECTIONS,
+    UNKNOWN,
+)
+from evaluator.state import encode_state
+
+FIELD_VOCAB = {field: values for _, vocab in SECTIONS for field, values in vocab.items()}
+
+
+# -----------------------
+# Compilation
+# -----------------------
+def _codes(vocab):
+    return {value: i + 2 for i, value in enumerate(vocab)}
+
+
+def compile_field(field: str, field_rules: dict):
+    """
+    Turns {value: (delta, strength, concern)} into three tuples indexed
+    by the field's code. Codes without a rule contribute nothing.
+    """
+    codes = _codes(FIELD_VOCAB[field])
+    size = len(codes) + 2
+
+    deltas = [0.0] * size
+    strengths = [None] * size
+    concerns = [None] * size
+
+    for value, (delta, strength, concern) in field_rules.items():
+        code = codes[value]
+        deltas[code] = delta
+        strengths[code] = strength
+        concerns[code] = concern
+
+    return tuple(deltas), tuple(strengths), tuple(concerns)
+
+
+def _compile_section(section_rules: dict):
+    return tuple(
+        (COLUMN_INDEX[field],) + compile_field(field, field_rules)
+        for field, field_rules in section_rules.items()
+    )
+
+
+def _compile_attachments():
+    owners = _codes(ATTACHMENT_OWNER_VOCAB)
+    spaces = _codes(ATTACHMENT_SPACE_VOCAB)
+    spaces[None] = UNKNOWN
+
+    deltas = [0.0] * ATTACHMENT_CODES
+    strengths = [None] * ATTACHMENT_CODES
+    concerns = [None] * ATTACHMENT_CODES
+
+    for (owner, space_type), (delta, strength, concern) in rules.ATTACHMENT_RULES.items():
+        code = owners[owner] * ATTACHMENT_STRIDE + spaces[space_type]
+        deltas[code] = delta
+        strengths[code] = strength
+        concerns[code] = concern
+
+    return tuple(deltas), tuple(strengths), tuple(concerns)
+
+
+def _compile_side_window():
+    """
+    Pre-resolves the side-window "best side / worst side" choice for every
+    (side_a, side_b) pair. Indexed by side_a_code * SIDE_STRIDE + side_b_code.
+    """
+    codes = _codes(FIELD_VOCAB["side_a_open_space"])
+    effects = [0.0] * (len(codes) + 2)
+    for value, effect in rules.SIDE_WINDOW_EFFECTS.items():
+        effects[codes[value]] = effect
+
+    closed = {UNKNOWN, codes["attached"]}
+    size = len(effects)
+
+    deltas = []
+    strengths = []
+    concerns = []
+
+    for side_a in range(size):
+        for side_b in range(size):
+            pair = (effects[side_a], effects[side_b])
+            delta, strength, concern = 0.0, None, None
+
+            if side_a in closed and side_b in closed:
+                pass
+            elif any(e > 0 for e in pair):
+                delta = max(pair)
+                if delta > 0:
+                    strength = rules.SIDE_WINDOW_STRENGTH
+            else:
+                delta = min(pair)
+                if delta < 0:
+                    concern = rules.SIDE_WINDOW_CONCERN
+
+            deltas.append(delta)
+            strengths.append(strength)
+            concerns.append(concern)
+
+    return tuple(deltas), tuple(strengths), tuple(concerns)
+
+
+IN_ROOM_STEPS = _compile_section(rules.IN_ROOM_RULES)
+BETWEEN_ROOMS_STEPS = _compile_section(rules.BETWEEN_ROOMS_RULES)
+BETWEEN_UNITS_STEPS = _compile_section(rules.BETWEEN_UNITS_RULES)
+
+ATTACHMENT_TABLE = _compile_attachments()
+
+FRONT_WINDOW_TABLE = compile_field("front_open_space", rules.FRONT_WINDOW_RULES)
+BACK_WINDOW_TABLE = compile_field("back_open_space", rules.BACK_WINDOW_RULES)
+SIDE_WINDOW_TABLE = _compile_side_window()
+SIDE_STRIDE = len(FIELD_VOCAB["side_a_open_space"]) + 2
+
+_WINDOW_CODES = _codes(FIELD_VOCAB["window_facing_side"])
+WINDOW_FRONT = _WINDOW_CODES["front"]
+WINDOW_SIDE = _WINDOW_CODES["side"]
+WINDOW_BACK = _WINDOW_CODES["back"]
+SINGLE_BEDROOM = _codes(FIELD_VOCAB["has_multiple_bedrooms"])[False]
+
+
+def _section_columns(section):
+    return tuple(i for i, (s, _) in enumerate(COLUMNS) if s == section)
+
+
+IN_ROOM_COLUMNS = _section_columns("privacy_in_room")
+BETWEEN_UNITS_COLUMNS = _section_columns("privacy_between_units")
+ROOMS_DETAIL_COLUMNS = tuple(COLUMN_INDEX[f] for f in rules.BETWEEN_ROOMS_RULES)
+
+_HAS_MULTIPLE = COLUMN_INDEX["has_multiple_bedrooms"]
+_WINDOW_SIDE = COLUMN_INDEX["window_facing_side"]
+_FRONT = COLUMN_INDEX["front_open_space"]
+_SIDE_A = COLUMN_INDEX["side_a_open_space"]
+_SIDE_B = COLUMN_INDEX["side_b_open_space"]
+_BACK = COLUMN_INDEX["back_open_space"]
+
+
+def _clamp(score):
+    return max(min(score, 1), 0)
+
+
+def _apply(score, code, table, strengths, concerns):
+    deltas, strength_text, concern_text = table
+
+    if strength_text[code] is not None:
+        strengths.append(strength_text[code])
+    if concern_text[code] is not None:
+        concerns.append(concern_text[code])
+
+    return score + deltas[code]
+
+
+def _run_steps(score, steps, codes, strengths, concerns):
+    for column, deltas, strength_text, concern_text in steps:
+        code = codes[column]
+        score += deltas[code]
+        if strength_text[code] is not None:
+            strengths.append(strength_text[code])
+        if concern_text[code] is not None:
+            concerns.append(concern_text[code])
+
+    return _clamp(score)
+
+
+# -----------------------
+# Section scorers
+# -----------------------
+# Each section scorer only reads its own columns (plus window_facing_side
+# for between_units), so its result can be cached and reused until one of
+# those columns changes. See SECTION_INPUTS.
+def _section(score, known, total, strengths, concerns) -> dict:
+    return {
+        "score": score,
+        "known": known,
+        "total": total,
+        "strengths": strengths,
+        "concerns": concerns,
+    }
+
+
+def _known(codes, columns):
+    return sum(1 for column in columns if codes[column] != UNKNOWN)
+
+
+def score_in_room_section(codes: list) -> dict:
+    strengths = []
+    concerns = []
+
+    score = _run_steps(rules.IN_ROOM_BASE, IN_ROOM_STEPS, codes, strengths, concerns)
+
+    return _section(
+        score, _known(codes, IN_ROOM_COLUMNS), len(IN_ROOM_COLUMNS), strengths, concerns
+    )
+
+
+def score_between_rooms_section(codes: list) -> dict:
+    strengths = []
+    concerns = []
+
+    known = 1 if codes[_HAS_MULTIPLE] != UNKNOWN else 0
+
+    # Detail fields don't apply to a single bedroom
+    if codes[_HAS_MULTIPLE] == SINGLE_BEDROOM:
+        return _section(rules.SINGLE_BEDROOM_SCORE, known, 1, strengths, concerns)
+
+    score = _run_steps(rules.BETWEEN_ROOMS_BASE, BETWEEN_ROOMS_STEPS, codes, strengths, concerns)
+
+    return _section(
+        score,
+        known + _known(codes, ROOMS_DETAIL_COLUMNS),
+        1 + len(ROOMS_DETAIL_COLUMNS),
+        strengths,
+        concerns,
+    )
+
+
+def score_between_units_section(codes: list, attachments: list) -> dict:
+    strengths = []
+    concerns = []
+
+    score = _run_steps(rules.BETWEEN_UNITS_BASE, BETWEEN_UNITS_STEPS, codes, strengths, concerns)
+
+    for code in attachments:
+        score = _apply(score, code, ATTACHMENT_TABLE, strengths, concerns)
+
+    # ---- Window × open space
+    window_side = codes[_WINDOW_SIDE]
+    if window_side == WINDOW_FRONT:
+        score = _apply(score, codes[_FRONT], FRONT_WINDOW_TABLE, strengths, concerns)
+    elif window_side == WINDOW_BACK:
+        score = _apply(score, codes[_BACK], BACK_WINDOW_TABLE, strengths, concerns)
+    elif window_side == WINDOW_SIDE:
+        score = _apply(
+            score,
+            codes[_SIDE_A] * SIDE_STRIDE + codes[_SIDE_B],
+            SIDE_WINDOW_TABLE,
+            strengths,
+            concerns,
+        )
+
+    return _section(
+        _clamp(score),
+        _known(codes, BETWEEN_UNITS_COLUMNS),
+        len(BETWEEN_UNITS_COLUMNS),
+        strengths,
+        concerns,
+    )
+
+
+SECTION_SCORERS = {
+    "privacy_in_room": lambda codes, attachments: score_in_room_section(codes),
+    "privacy_between_rooms": lambda codes, attachments: score_between_rooms_section(codes),
+    "privacy_between_units": score_between_units_section,
+}
+
+# Which (section, field) changes invalidate each section's cached result.
+# None = any field of that section; "attachment_details" = any attachment.
+SECTION_INPUTS = {
+    "privacy_in_room": {("privacy_in_room", None)},
+    "privacy_between_rooms": {("privacy_between_rooms", None)},
+    "privacy_between_units": {
+        ("privacy_between_units", None),
+        ("privacy_in_room", "window_facing_side"),
+        ("attachment_details", None),
+    },
+}
+
+
+def confidence_level(known_fields: int, total_fields: int) -> str:
+    confidence_ratio = known_fields / total_fields if total_fields else 0
+
+    for threshold, level in rules.CONFIDENCE_LEVELS:
+        if confidence_ratio >= threshold:
+            return level
+    return "low"
+
+
+def weighted_score(in_room: dict, between_rooms: dict, between_units: dict) -> float:
+    weights = rules.SECTION_WEIGHTS
+    weighted = (
+        in_room["score"] * weights["privacy_in_room"] +
+        between_rooms["score"] * weights["privacy_between_rooms"] +
+        between_units["score"] * weights["privacy_between_units"]
+    )
+    return round(weighted * 10, 1)
+
+
+def combine_sections(in_room: dict, between_rooms: dict, between_units: dict) -> dict:
+    """
+    Builds the score_privacy_v1 result from the three section results.
+    """
+    sections = (in_room, between_rooms, between_units)
+
+    return {
+        "privacy_score_1_to_10": weighted_score(in_room, between_rooms, between_units),
+        "confidence": confidence_level(
+            sum(s["known"] for s in sections),
+            sum(s["total"] for s in sections),
+        ),
+        "breakdown": {
+            "scale": "0 to 1 (higher is better)",
+            "privacy_in_room": round(in_room["score"], 2),
+            "privacy_between_rooms": round(between_rooms["score"], 2),
+            "privacy_between_units": round(between_units["score"], 2)
+        },
+        "explanation": {
+            "strengths": [t for s in sections for t in s["strengths"]],
+            "concerns": [t for s in sections for t in s["concerns"]]
+        }
+    }
+
+
+# -----------------------
+# Scoring
+# -----------------------
+def score_codes(codes: list, attachments: list) -> dict:
+    """
+    Scores one encoded record (see encoding.encode_extraction).
+    Returns the same structure as score_privacy_v1.
+    """
+    return combine_sections(
+        score_in_room_section(codes),
+        score_between_rooms_section(codes),
+        score_between_units_section(codes, attachments),
+    )
+
+
+def score_privacy_compiled(extracted) -> dict:
+    """
+    Drop-in replacement for score_privacy_v1 driven by privacy_rules_v1.
+    Takes an extracted dict or a PropertyState.
+    """
+    codes, attachments = encode_state(extracted)
+    return score_codes(codes, attachments)
@@ -0,0 +1,89 @@
+# scoring/privacy_score_incremental.py
+#
+# Keeps one cached result per section and recomputes only the sections
+# whose inputs changed, so a provisional score can be shown every turn.
+# Each cached result also carries the section's score range over the
+# missing fields ("range", see privacy_score_range.section_bounds), which
+# costs far more than the score itself and so is only redone with it.
+
+from evaluator.scoring.privacy_score_compiled import (
+    SECTION_INPUTS,
+    SECTION_SCORERS,
+    confidence_level,
+    weighted_score,
+)
+from evaluator.scoring.privacy_score_range import combine_section_bounds, section_bounds
+from evaluator.state import encode_state
+
+
+def dirty_sections(changed_fields) -> set:
+    """
+    Maps changed (section, field) pairs to the sections that must be rescored.
+    """
+    dirty = set()
+
+    for section, inputs in SECTION_INPUTS.items():
+        for changed_section, changed_field in changed_fields:
+            if (changed_section, None) in inputs or (changed_section, changed_field) in inputs:
+                dirty.add(section)
+                break
+
+    return dirty
+
+
+def update_section_scores(extracted, section_scores: dict, changed_fields=None) -> dict:
+    """
+    Rescores the sections affected by changed_fields (all sections when
+    changed_fields is None) plus any section without a cached result (or
+    one cached without its range). Updates section_scores in place and
+    returns it.
+    """
+    if changed_fields is None:
+        dirty = set(SECTION_SCORERS)
+    else:
+        dirty = dirty_sections(changed_fields)
+
+    dirty |= {section for section in SECTION_SCORERS if "range" not in section_scores.get(section, {})}
+
+    if not dirty:
+        return section_scores
+
+    codes, attachments = encode_state(extracted)
+
+    for section in dirty:
+        section_scores[section] = {
+            **SECTION_SCORERS[section](codes, attachments),
+            "range": section_bounds(section, codes, attachments),
+        }
+
+    return section_scores
+
+
+def provisional_score(section_scores: dict) -> dict | None:
+    """
+    Running score and confidence from the cached section results.
+    """
+    if set(section_scores) != set(SECTION_SCORERS):
+        return None
+
+    in_room = section_scores["privacy_in_room"]
+    between_rooms = section_scores["privacy_between_rooms"]
+    between_units = section_scores["privacy_between_units"]
+    sections = (in_room, between_rooms, between_units)
+
+    return {
+        "privacy_score_1_to_10": weighted_score(in_room, between_rooms, between_units),
+        "confidence": confidence_level(
+            sum(s["known"] for s in sections),
+            sum(s["total"] for s in sections),
+        ),
+    }
+
+
+def provisional_range(section_scores: dict) -> dict | None:
+    """
+    Range the final score can still fall in, from the cached section ranges.
+    """
+    if set(section_scores) != set(SECTION_SCORERS):
+        return None
+    return combine_section_bounds({section: result["range"] for section, result in section_scores.items()})
@@ -0,0 +1,289 @@
+# scoring/privacy_score_range.py
+#
+# Score bounds for a partially known property: min, max and expected
+# score over every completion of the missing (None) fields.
+#
+# The three sections are scored independently and combined linearly, so
+# each section's distribution is computed on its own and the overall
+# bounds follow from the section bounds. Within a section the fields are
+# added in score_privacy_v1's order, keeping only the distinct running
+# scores (with how many completions reach each), so the enumeration is
+# over a few hundred partial sums instead of the full Cartesian product.
+#
+# Completions use each field's vocabulary from scoring/encoding.py, every
+# completion weighted equally. Unrecognised values and attachment_details
+# are taken as given.
+
+import numpy as np
+
+from evaluator.scoring import privacy_rules_v1 as rules
+from evaluator.scoring.encoding import COLUMN_INDEX, COLUMNS, UNKNOWN
+from evaluator.scoring.privacy_score_compiled import (
+    ATTACHMENT_TABLE,
+    BACK_WINDOW_TABLE,
+    BETWEEN_ROOMS_STEPS,
+    BETWEEN_UNITS_STEPS,
+    FIELD_VOCAB,
+    FRONT_WINDOW_TABLE,
+    IN_ROOM_STEPS,
+    SIDE_STRIDE,
+    SIDE_WINDOW_TABLE,
+    SINGLE_BEDROOM,
+    WINDOW_BACK,
+    WINDOW_FRONT,
+    WINDOW_SIDE,
+    confidence_level,
+    score_between_rooms_section,
+    score_between_units_section,
+    score_in_room_section,
+)
+from evaluator.state import encode_state
+
+_HAS_MULTIPLE = COLUMN_INDEX["has_multiple_bedrooms"]
+_WINDOW_SIDE = COLUMN_INDEX["window_facing_side"]
+_FRONT = COLUMN_INDEX["front_open_space"]
+_SIDE_A = COLUMN_INDEX["side_a_open_space"]
+_SIDE_B = COLUMN_INDEX["side_b_open_space"]
+_BACK = COLUMN_INDEX["back_open_space"]
+
+_VOCAB_SIZES = tuple(len(FIELD_VOCAB[field]) for _, field in COLUMNS)
+
+# Columns that decide the window × open space adjustment, per window side
+_WINDOW_COLUMNS = {
+    WINDOW_FRONT: (_FRONT,),
+    WINDOW_SIDE: (_SIDE_A, _SIDE_B),
+    WINDOW_BACK: (_BACK,),
+}
+
+
+# -----------------------
+# Distributions
+# -----------------------
+# A distribution is (values, counts): the distinct section scores and how
+# many completions produce each one.
+def _candidates(codes, column):
+    """
+    Codes a column can take: the known code, or every vocabulary code.
+    """
+    code = codes[column]
+    if code != UNKNOWN:
+        return (code,)
+    return tuple(range(2, _VOCAB_SIZES[column] + 2))
+
+
+def _merge(values, counts):
+    values, inverse = np.unique(values, return_inverse=True)
+    return values, np.bincount(inverse, weights=counts)
+
+
+def _add_choices(values, counts, deltas):
+    """
+    Adds one field: every running score × every candidate delta.
+    """
+    deltas = np.asarray(deltas, dtype=np.float64)
+    return _merge(
+        (values[:, None] + deltas[None, :]).ravel(),
+        np.repeat(counts, len(deltas)),
+    )
+
+
+def _run_steps(values, counts, steps, codes):
+    for column, deltas, _, _ in steps:
+        values, counts = _add_choices(
+            values, counts, [deltas[code] for code in _candidates(codes, column)]
+        )
+
+    # Same comparisons as _clamp, element-wise
+    return _merge(np.clip(values, 0, 1), counts)
+
+
+def _start(score):
+    return np.array([score], dtype=np.float64), np.ones(1)
+
+
+def _concat(distributions):
+    return _merge(
+        np.concatenate([values for values, _ in distributions]),
+        np.concatenate([counts for _, counts in distributions]),
+    )
+
+
+def in_room_distribution(codes: list):
+    return _run_steps(*_start(rules.IN_ROOM_BASE), IN_ROOM_STEPS, codes)
+
+
+def between_rooms_distribution(codes: list):
+    multiple = _run_steps(*_start(rules.BETWEEN_ROOMS_BASE), BETWEEN_ROOMS_STEPS, codes)
+    single = (np.array([rules.SINGLE_BEDROOM_SCORE]), np.array([multiple[1].sum()]))
+
+    has_multiple = codes[_HAS_MULTIPLE]
+    if has_multiple == SINGLE_BEDROOM:
+        # Detail fields are ignored but their completions still count
+        return single
+    if has_multiple == UNKNOWN:
+        return _concat([multiple, single])
+    return multiple
+
+
+def _window_delta(window_side, fixed):
+    """
+    Window × open space delta, given the codes of _WINDOW_COLUMNS[window_side].
+    """
+    if window_side == WINDOW_FRONT:
+        return FRONT_WINDOW_TABLE[0][fixed[0]]
+    if window_side == WINDOW_BACK:
+        return BACK_WINDOW_TABLE[0][fixed[0]]
+    if window_side == WINDOW_SIDE:
+        return SIDE_WINDOW_TABLE[0][fixed[0] * SIDE_STRIDE + fixed[1]]
+    return 0.0
+
+
+def _group_by_window(window_side, branches):
+    grouped = {}
+    for fixed, distribution in branches.items():
+        grouped.setdefault(_window_delta(window_side, fixed), []).append(distribution)
+    return {delta: _concat(distributions) for delta, distributions in grouped.items()}
+
+
+def between_units_distribution(codes: list, attachments: list):
+    """
+    The window adjustment couples window_facing_side with the open space
+    columns. Those columns are branched on one code at a time until the
+    window delta is known, then branches with the same delta are merged
+    and the remaining fields enumerated once per delta.
+    Includes window_facing_side's completions.
+    """
+    distributions = []
+
+    for window_side in _candidates(codes, _WINDOW_SIDE):
+        columns = _WINDOW_COLUMNS.get(window_side, ())
+        branches = {(): _start(rules.BETWEEN_UNITS_BASE)}
+        if not columns:
+            branches = _group_by_window(window_side, branches)
+
+        for column, deltas, _, _ in BETWEEN_UNITS_STEPS:
+            grown = {}
+            for key, (values, counts) in branches.items():
+                if column in columns:
+                    for code in _candidates(codes, column):
+                        grown[key + (code,)] = _add_choices(values, counts, [deltas[code]])
+                else:
+                    grown[key] = _add_choices(
+                        values, counts, [deltas[code] for code in _candidates(codes, column)]
+                    )
+            branches = grown
+
+            if columns and column == columns[-1]:
+                branches = _group_by_window(window_side, branches)
+
+        for window_delta, (values, counts) in branches.items():
+            values = np.clip(values, 0, 1)
+            for code in attachments:
+                values = values + ATTACHMENT_TABLE[0][code]
+            values = values + window_delta
+            distributions.append((np.clip(values, 0, 1), counts))
+
+    return _concat(distributions)
+
+
+SECTION_DISTRIBUTIONS = {
+    "privacy_in_room": lambda codes, attachments: in_room_distribution(codes),
+    "privacy_between_rooms": lambda codes, attachments: between_rooms_distribution(codes),
+    "privacy_between_units": between_units_distribution,
+}
+
+
+# -----------------------
+# Score range
+# -----------------------
+def _mean(values, counts):
+    return (values @ counts / counts.sum()).item()
+
+
+def section_bounds(section: str, codes: list, attachments: list) -> dict:
+    """
+    Unrounded min, max and expected score of one section over its
+    completions. Depends on the same inputs as the section's score
+    (SECTION_INPUTS), so it can be cached alongside it.
+    """
+    values, counts = SECTION_DISTRIBUTIONS[section](codes, attachments)
+    return {"min": values[0].item(), "max": values[-1].item(), "expected": _mean(values, counts)}
+
+
+def combine_section_bounds(bounds: dict) -> dict:
+    """
+    privacy_score_1_to_10 range from the three sections' bounds. The
+    weighted sum is monotone in each section, so the extremes come from
+    the section extremes; the expectation is linear.
+    """
+    sections = [bounds[section] for section in SECTION_DISTRIBUTIONS]
+    return {
+        "min": round(_weighted(*(b["min"] for b in sections)), 1),
+        "max": round(_weighted(*(b["max"] for b in sections)), 1),
+        "expected": round(_weighted(*(b["expected"] for b in sections)), 2),
+    }
+
+
+def _bounds(values, counts, digits):
+    return {
+        "min": round(values[0].item(), digits),
+        "max": round(values[-1].item(), digits),
+        "expected": round(_mean(values, counts), digits),
+    }
+
+
+def _weighted(in_room, between_rooms, between_units):
+    weights = rules.SECTION_WEIGHTS
+    return (
+        in_room * weights["privacy_in_room"] +
+        between_rooms * weights["privacy_between_rooms"] +
+        between_units * weights["privacy_between_units"]
+    ) * 10
+
+
+def score_range_codes(codes: list, attachments: list) -> dict:
+    """
+    Score range for one encoded record (see encoding.encode_extraction).
+    """
+    sections = {
+        section: distribution(codes, attachments)
+        for section, distribution in SECTION_DISTRIBUTIONS.items()
+    }
+    bounds = {
+        section: {"min": values[0].item(), "max": values[-1].item(), "expected": _mean(values, counts)}
+        for section, (values, counts) in sections.items()
+    }
+
+    total = 1
+    for _, counts in sections.values():
+        total *= int(counts.sum())
+
+    # Confidence only depends on which fields are known
+    known = (
+        score_in_room_section(codes),
+        score_between_rooms_section(codes),
+        score_between_units_section(codes, attachments),
+    )
+
+    return {
+        "privacy_score_1_to_10": combine_section_bounds(bounds),
+        "confidence": confidence_level(
+            sum(s["known"] for s in known),
+            sum(s["total"] for s in known),
+        ),
+        "completions": total,
+        "breakdown": {
+            "scale": "0 to 1 (higher is better)",
+            **{section: _bounds(values, counts, 2) for section, (values, counts) in sections.items()},
+        },
+    }
+
+
+def score_privacy_range(extracted) -> dict:
+    """
+    Min, max and expected privacy score over every way the missing fields
+    could be filled in. When nothing is missing min == max == the
+    score_privacy_v1 score. Takes an extracted dict or a PropertyState.
+    """
+    codes, attachments = encode_state(extracted)
+    return score_range_codes(codes, attachments)
@@ -0,0 +1,420 @@
+# scoring/privacy_score_table.py
+#
+# Precomputed score tables over the finite input space of score_privacy_v1.
+#
+# Every field is a small enum (see scoring/encoding.py, "unknown" and
+# "unrecognised" included), so each section score can be enumerated once
+# and stored. The joint product of all fields is far too large
+# (~10^13 rows), so the table is split where the scorer itself clamps:
+#
+#   in_room        → one table over its 3 scored fields
+#   between_rooms  → one table over its 4 fields
+#   between_units  → two chained tables over its 9 fields (the first
+#                    four fields collapse into ~100 distinct partial sums)
+#
+# Attachments and the window × open space adjustment are applied after
+# the first clamp and are stored as small delta/reason tables.
+# Everything is written as .npy files. The big between_units table is
+# opened with mmap_mode="r", so every worker process that maps the
+# directory shares the same pages.
+#
+#   python -m evaluator.scoring.privacy_score_table build
+#
+# tests/test_scoring_equivalence.py checks the tables against
+# score_privacy_v1.
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+
+from evaluator.scoring import privacy_rules_v1 as rules
+from evaluator.scoring import privacy_score_compiled as compiled
+from evaluator.scoring.encoding import COLUMN_INDEX, COLUMNS, UNKNOWN
+from evaluator.state import encode_state
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_TABLE_DIR = BASE_DIR / "tables" / "privacy_v1"
+
+UNITS_STAGE1_STEPS = compiled.BETWEEN_UNITS_STEPS[:4]
+UNITS_STAGE2_STEPS = compiled.BETWEEN_UNITS_STEPS[4:]
+
+NO_REASON = -1
+
+
+def rules_fingerprint() -> str:
+    """
+    Hash of every compiled table. A table directory built from different
+    rules is refused at load time.
+    """
+    payload = repr((
+        rules.IN_ROOM_BASE,
+        rules.BETWEEN_ROOMS_BASE,
+        rules.BETWEEN_UNITS_BASE,
+        rules.SINGLE_BEDROOM_SCORE,
+        compiled.IN_ROOM_STEPS,
+        compiled.BETWEEN_ROOMS_STEPS,
+        compiled.BETWEEN_UNITS_STEPS,
+        compiled.ATTACHMENT_TABLE,
+        compiled.FRONT_WINDOW_TABLE,
+        compiled.BACK_WINDOW_TABLE,
+        compiled.SIDE_WINDOW_TABLE,
+        COLUMNS,
+    ))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# -----------------------
+# Build
+# -----------------------
+def _fold(start, steps):
+    """
+    Enumerates start + d1 + d2 + ... over every code combination,
+    adding in step order so each cell is bit-identical to the scalar sum.
+    The result has one axis per step.
+    """
+    score = np.asarray(start, dtype=np.float64)
+    for _, deltas, _, _ in steps:
+        score = score[..., None] + np.array(deltas, dtype=np.float64)
+    return score
+
+
+def _radices(steps):
+    return [len(deltas) for _, deltas, _, _ in steps]
+
+
+def _reason_table(tables, messages):
+    """
+    Flattens (deltas, strengths, concerns) tables into:
+    - offsets into the flat arrays
+    - float64 deltas
+    - int16 (strength_id, concern_id) pairs, NO_REASON when empty
+    """
+    ids = {}
+
+    def message_id(text):
+        if text is None:
+            return NO_REASON
+        if text not in ids:
+            ids[text] = len(messages)
+            messages.append(text)
+        return ids[text]
+
+    offsets = []
+    deltas = []
+    reasons = []
+
+    for table_deltas, strengths, concerns in tables:
+        offsets.append(len(deltas))
+        deltas.extend(table_deltas)
+        reasons.extend(
+            (message_id(s), message_id(c))
+            for s, c in zip(strengths, concerns)
+        )
+
+    return offsets, np.array(deltas, dtype=np.float64), np.array(reasons, dtype=np.int16)
+
+
+def build_score_table(out_dir: Path = DEFAULT_TABLE_DIR) -> Path:
+    """
+    Enumerates every section and writes the table directory.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # ---- In room
+    in_room = np.clip(_fold(rules.IN_ROOM_BASE, compiled.IN_ROOM_STEPS), 0, 1)
+
+    # ---- Between rooms (leading axis = has_multiple_bedrooms)
+    rooms = np.clip(_fold(rules.BETWEEN_ROOMS_BASE, compiled.BETWEEN_ROOMS_STEPS), 0, 1)
+    has_multiple_codes = len(compiled.FIELD_VOCAB["has_multiple_bedrooms"]) + 2
+    between_rooms = np.repeat(rooms[None, ...], has_multiple_codes, axis=0)
+    between_rooms[compiled.SINGLE_BEDROOM] = rules.SINGLE_BEDROOM_SCORE
+
+    # ---- Between units, stage 1: first four fields → partial-sum id
+    stage1 = _fold(rules.BETWEEN_UNITS_BASE, UNITS_STAGE1_STEPS)
+    stage1_values, stage1_ids = np.unique(stage1, return_inverse=True)
+
+    # ---- Stage 2: partial sum + remaining fields → clamped base id
+    stage2 = np.clip(_fold(stage1_values, UNITS_STAGE2_STEPS), 0, 1)
+    units_values, units_ids = np.unique(stage2, return_inverse=True)
+
+    # ---- Post-clamp adjustments and reason codes
+    messages = []
+    field_tables = [
+        table
+        for steps in (compiled.IN_ROOM_STEPS, compiled.BETWEEN_ROOMS_STEPS, compiled.BETWEEN_UNITS_STEPS)
+        for _, *table in steps
+    ]
+    extra_tables = [
+        compiled.ATTACHMENT_TABLE,
+        compiled.FRONT_WINDOW_TABLE,
+        compiled.BACK_WINDOW_TABLE,
+        compiled.SIDE_WINDOW_TABLE,
+    ]
+    offsets, deltas, reasons = _reason_table(field_tables + extra_tables, messages)
+
+    arrays = {
+        "in_room": in_room.ravel(),
+        "between_rooms": between_rooms.ravel(),
+        "units_stage1": stage1_ids.ravel().astype(np.uint16),
+        "units_stage2": units_ids.ravel().astype(np.uint16),
+        "units_values": units_values,
+        "deltas": deltas,
+        "reasons": reasons,
+    }
+    for name, array in arrays.items():
+        np.save(out_dir / f"{name}.npy", array)
+
+    step_columns = [
+        column
+        for steps in (compiled.IN_ROOM_STEPS, compiled.BETWEEN_ROOMS_STEPS, compiled.BETWEEN_UNITS_STEPS)
+        for column, *_ in steps
+    ]
+
+    manifest = {
+        "rules_fingerprint": rules_fingerprint(),
+        "columns": [field for _, field in COLUMNS],
+        "in_room_radices": _radices(compiled.IN_ROOM_STEPS),
+        "between_rooms_radices": [has_multiple_codes] + _radices(compiled.BETWEEN_ROOMS_STEPS),
+        "units_stage1_radices": _radices(UNITS_STAGE1_STEPS),
+        "units_stage2_radices": [len(stage1_values)] + _radices(UNITS_STAGE2_STEPS),
+        "field_offsets": dict(zip(map(str, step_columns), offsets[:len(step_columns)])),
+        "attachment_offset": offsets[len(step_columns)],
+        "front_window_offset": offsets[len(step_columns) + 1],
+        "back_window_offset": offsets[len(step_columns) + 2],
+        "side_window_offset": offsets[len(step_columns) + 3],
+        "messages": messages,
+    }
+    with open(out_dir / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return out_dir
+
+
+# -----------------------
+# Lookup
+# -----------------------
+def _index(codes, columns, radices):
+    index = 0
+    for column, radix in zip(columns, radices):
+        index = index * radix + codes[column]
+    return index
+
+
+def _step_columns(steps):
+    return tuple(column for column, *_ in steps)
+
+
+class ScoreTable:
+    """
+    Read-only, memory-mapped view of a built table directory.
+    """
+
+    def __init__(self, directory: Path = DEFAULT_TABLE_DIR):
+        directory = Path(directory)
+
+        with open(directory / "manifest.json", "r") as f:
+            manifest = json.load(f)
+
+        if manifest["rules_fingerprint"] != rules_fingerprint():
+            raise RuntimeError(
+                f"Score table in {directory} was built from different rules; rebuild it"
+            )
+
+        def load(name):
+            return np.load(directory / f"{name}.npy", mmap_mode="r")
+
+        # The large stage-2 table stays mapped (shared between processes);
+        # the few-KB tables are copied into Python lists for fast scalar reads.
+        self.units_stage2 = load("units_stage2").view(np.ndarray)
+        self.in_room = load("in_room").tolist()
+        self.between_rooms = load("between_rooms").tolist()
+        self.units_stage1 = load("units_stage1").tolist()
+        self.units_values = load("units_values").tolist()
+        self.deltas = load("deltas").tolist()
+        self.reasons = [tuple(r) for r in load("reasons").tolist()]
+        self.messages = manifest["messages"]
+
+        self.in_room_radices = manifest["in_room_radices"]
+        self.between_rooms_radices = manifest["between_rooms_radices"]
+        self.units_stage1_radices = manifest["units_stage1_radices"]
+        self.units_stage2_radices = manifest["units_stage2_radices"][1:]
+        self.units_stage2_size = int(np.prod(self.units_stage2_radices))
+
+        offsets = manifest["field_offsets"]
+        self.in_room_reasons = self._field_reasons(compiled.IN_ROOM_STEPS, offsets)
+        self.between_rooms_reasons = self._field_reasons(compiled.BETWEEN_ROOMS_STEPS, offsets)
+        self.between_units_reasons = self._field_reasons(compiled.BETWEEN_UNITS_STEPS, offsets)
+
+        self.attachment_offset = manifest["attachment_offset"]
+        self.front_window_offset = manifest["front_window_offset"]
+        self.back_window_offset = manifest["back_window_offset"]
+        self.side_window_offset = manifest["side_window_offset"]
+
+    @staticmethod
+    def _field_reasons(steps, offsets):
+        return tuple((column, offsets[str(column)]) for column in _step_columns(steps))
+
+    def _collect(self, offset, strengths, concerns):
+        strength_id, concern_id = self.reasons[offset]
+        if strength_id != NO_REASON:
+            strengths.append(self.messages[strength_id])
+        if concern_id != NO_REASON:
+            concerns.append(self.messages[concern_id])
+
+    def _adjust(self, score, offset, strengths, concerns):
+        self._collect(offset, strengths, concerns)
+        return score + self.deltas[offset]
+
+    def score_codes(self, codes: list, attachments: list) -> dict:
+        """
+        Same result as score_privacy_v1 for one encoded record.
+        """
+        strengths = []
+        concerns = []
+
+        known_fields = len(codes) - codes.count(UNKNOWN)
+        total_fields = len(codes)
+
+        # ---- In room
+        in_room_score = self.in_room[_index(codes, _IN_ROOM_COLUMNS, self.in_room_radices)]
+        for column, offset in self.in_room_reasons:
+            self._collect(offset + codes[column], strengths, concerns)
+
+        # ---- Between rooms
+        between_rooms_score = self.between_rooms[
+            _index(codes, _BETWEEN_ROOMS_COLUMNS, self.between_rooms_radices)
+        ]
+
+        if codes[_HAS_MULTIPLE] == compiled.SINGLE_BEDROOM:
+            for column in compiled.ROOMS_DETAIL_COLUMNS:
+                if codes[column] != UNKNOWN:
+                    known_fields -= 1
+            total_fields -= len(compiled.ROOMS_DETAIL_COLUMNS)
+        else:
+            for column, offset in self.between_rooms_reasons:
+                self._collect(offset + codes[column], strengths, concerns)
+
+        # ---- Between units
+        stage1_id = self.units_stage1[
+            _index(codes, _UNITS_STAGE1_COLUMNS, self.units_stage1_radices)
+        ]
+        stage2_index = (
+            stage1_id * self.units_stage2_size
+            + _index(codes, _UNITS_STAGE2_COLUMNS, self.units_stage2_radices)
+        )
+        between_units_score = self.units_values[self.units_stage2[stage2_index]]
+
+        for column, offset in self.between_units_reasons:
+            self._collect(offset + codes[column], strengths, concerns)
+
+        for code in attachments:
+            between_units_score = self._adjust(
+                between_units_score, self.attachment_offset + code, strengths, concerns
+            )
+
+        window_side = codes[_WINDOW_SIDE]
+        if window_side == compiled.WINDOW_FRONT:
+            between_units_score = self._adjust(
+                between_units_score, self.front_window_offset + codes[_FRONT], strengths, concerns
+            )
+        elif window_side == compiled.WINDOW_BACK:
+            between_units_score = self._adjust(
+                between_units_score, self.back_window_offset + codes[_BACK], strengths, concerns
+            )
+        elif window_side == compiled.WINDOW_SIDE:
+            between_units_score = self._adjust(
+                between_units_score,
+                self.side_window_offset + codes[_SIDE_A] * compiled.SIDE_STRIDE + codes[_SIDE_B],
+                strengths,
+                concerns,
+            )
+
+        between_units_score = max(min(between_units_score, 1), 0)
+
+        # ---- Final score
+        weights = rules.SECTION_WEIGHTS
+        weighted_score = (
+            in_room_score * weights["privacy_in_room"] +
+            between_rooms_score * weights["privacy_between_rooms"] +
+            between_units_score * weights["privacy_between_units"]
+        )
+
+        confidence_ratio = known_fields / total_fields
+        confidence = "low"
+        for threshold, level in rules.CONFIDENCE_LEVELS:
+            if confidence_ratio >= threshold:
+                confidence = level
+                break
+
+        return {
+            "privacy_score_1_to_10": round(weighted_score * 10, 1),
+            "confidence": confidence,
+            "breakdown": {
+                "scale": "0 to 1 (higher is better)",
+                "privacy_in_room": round(in_room_score, 2),
+                "privacy_between_rooms": round(between_rooms_score, 2),
+                "privacy_between_units": round(between_units_score, 2)
+            },
+            "explanation": {
+                "strengths": strengths,
+                "concerns": concerns
+            }
+        }
+
+    def score(self, extracted) -> dict:
+        codes, attachments = encode_state(extracted)
+        return self.score_codes(codes, attachments)
+
+
+_IN_ROOM_COLUMNS = _step_columns(compiled.IN_ROOM_STEPS)
+_BETWEEN_ROOMS_COLUMNS = (COLUMN_INDEX["has_multiple_bedrooms"],) + _step_columns(compiled.BETWEEN_ROOMS_STEPS)
+_UNITS_STAGE1_COLUMNS = _step_columns(UNITS_STAGE1_STEPS)
+_UNITS_STAGE2_COLUMNS = _step_columns(UNITS_STAGE2_STEPS)
+
+_HAS_MULTIPLE = COLUMN_INDEX["has_multiple_bedrooms"]
+_WINDOW_SIDE = COLUMN_INDEX["window_facing_side"]
+_FRONT = COLUMN_INDEX["front_open_space"]
+_SIDE_A = COLUMN_INDEX["side_a_open_space"]
+_SIDE_B = COLUMN_INDEX["side_b_open_space"]
+_BACK = COLUMN_INDEX["back_open_space"]
+
+_TABLES = {}
+
+
+def load_score_table(directory: Path = DEFAULT_TABLE_DIR) -> ScoreTable:
+    """
+    Maps a table directory once per process.
+    """
+    directory = Path(directory)
+    if directory not in _TABLES:
+        _TABLES[directory] = ScoreTable(directory)
+    return _TABLES[directory]
+
+
+def score_privacy_table(extracted: dict, directory: Path = DEFAULT_TABLE_DIR) -> dict:
+    """
+    score_privacy_v1 via the precomputed tables.
+    """
+    return load_score_table(directory).score(extracted)
+
+
+# -----------------------
+# CLI
+# -----------------------
+def main():
+    parser = argparse.ArgumentParser(description="Build the privacy_v1 score table.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--dir", type=Path, default=DEFAULT_TABLE_DIR)
+    args = parser.parse_args()
+
+    out_dir = build_score_table(args.dir)
+    size = sum(p.stat().st_size for p in out_dir.iterdir())
+    print(f"Wrote score table to {out_dir} ({size / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
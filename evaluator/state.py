@@ -0,0 +1,292 @@
+# evaluator/state.py
+#
+# Compact property state.
+#
+# PropertyState holds the same information as the nested `extracted`
+# dict, but every field is one byte: the integer code from
+# scoring/encoding.py (0 = unknown, 1 = unrecognised, 2.. = vocabulary
+# index). Raw values are only kept where a code can't reproduce them:
+# the numeric ceiling height and unrecognised LLM output.
+#
+# It quacks like the dict where the evaluator reads it
+# (state.get(section).get(field)), so find_next_missing_field and
+# get_attached_sides work unchanged, and it hands its codes straight to
+# the compiled scorers without re-encoding.
+#
+# In the session it is stored as state.pack(): a short list of bytes and
+# scalars instead of three nested dicts of strings.
+
+from enum import IntEnum
+
+from evaluator.scoring.encoding import (
+    COLUMNS,
+    SECTIONS,
+    UNKNOWN,
+    UNRECOGNISED,
+    encode_attachment,
+    encode_extraction,
+    field_encoder,
+)
+
+
+class Section(IntEnum):
+    PRIVACY_IN_ROOM = 0
+    PRIVACY_BETWEEN_ROOMS = 1
+    PRIVACY_BETWEEN_UNITS = 2
+
+
+SECTION_NAMES = tuple(section for section, _ in SECTIONS)
+SECTION_INDEX = {name: Section(i) for i, name in enumerate(SECTION_NAMES)}
+
+# {section: {field: column}}
+SECTION_COLUMNS = {
+    section: {field: column for column, (s, field) in enumerate(COLUMNS) if s == section}
+    for section in SECTION_NAMES
+}
+
+_FIELD_VALUES = tuple(vocab[field] for section, vocab in SECTIONS for field in vocab)
+_COLUMN_ENCODERS = tuple(field_encoder(field) for _, field in COLUMNS)
+_CEILING = next(column for column, (_, field) in enumerate(COLUMNS) if field == "ceiling_height_ft")
+
+
+class SectionView:
+    """
+    Read-only dict-like view of one section of a PropertyState.
+    """
+
+    __slots__ = ("_state", "_columns")
+
+    def __init__(self, state, columns: dict):
+        self._state = state
+        self._columns = columns
+
+    def get(self, field, default=None):
+        column = self._columns.get(field)
+        if column is None:
+            return default
+
+        value = self._state.value(column)
+        return default if value is None else value
+
+    def __getitem__(self, field):
+        return self.get(field)
+
+    def __contains__(self, field):
+        column = self._columns.get(field)
+        return column is not None and self._state.codes[column] != UNKNOWN
+
+    def items(self):
+        return ((field, self._state.value(column)) for field, column in self._columns.items())
+
+    def __bool__(self):
+        return True
+
+
+class PropertyState:
+    """
+    Slotted, integer-coded replacement for the nested `extracted` dict.
+    """
+
+    __slots__ = ("codes", "sections", "ceiling_height_ft", "raw", "attachments")
+
+    def __init__(self):
+        self.codes = bytearray(len(COLUMNS))
+        # Bitmask of Section values present (an empty section still counts)
+        self.sections = 0
+        self.ceiling_height_ft = None
+        # {column: original value} for unrecognised values
+        self.raw = {}
+        # {side: {"owner": ..., "space_type": ...}}, kept as given
+        self.attachments = {}
+
+    # -----------------------
+    # Field access
+    # -----------------------
+    def value(self, column: int):
+        code = self.codes[column]
+
+        if column == _CEILING:
+            return self.ceiling_height_ft
+        if code == UNKNOWN:
+            return None
+        if code == UNRECOGNISED:
+            return self.raw[column]
+        return _FIELD_VALUES[column][code - 2]
+
+    def set_value(self, column: int, value):
+        try:
+            code = _COLUMN_ENCODERS[column](value)
+        except TypeError:
+            # Unhashable junk from the LLM
+            code = UNRECOGNISED
+
+        self.codes[column] = code
+
+        if column == _CEILING:
+            self.ceiling_height_ft = value
+        elif code == UNRECOGNISED:
+            self.raw[column] = value
+        else:
+            self.raw.pop(column, None)
+
+    def has_section(self, section: str) -> bool:
+        return bool(self.sections & (1 << SECTION_INDEX[section]))
+
+    def add_section(self, section: str):
+        self.sections |= 1 << SECTION_INDEX[section]
+
+    def get(self, section, default=None):
+        """
+        Same lookups as extracted.get(section) on the dict form.
+        """
+        if section == "attachment_details":
+            return self.attachments if self.attachments else default
+
+        if section not in SECTION_INDEX or not self.has_section(section):
+            return default
+
+        return SectionView(self, SECTION_COLUMNS[section])
+
+    def set_attachment(self, side: str, info: dict):
+        self.attachments[side] = dict(info)
+
+    # -----------------------
+    # Merging
+    # -----------------------
+    def merge(self, update) -> set:
+        """
+        merge_extraction for a PropertyState base: copies non-null fields
+        from update and returns the (section, field) pairs that changed.
+        """
+        if isinstance(update, PropertyState):
+            update = update.to_dict()
+
+        changed = set()
+
+        for section, section_data in update.items():
+            columns = SECTION_COLUMNS.get(section)
+            if columns is None or not section_data:
+                continue
+
+            self.add_section(section)
+
+            for field, value in section_data.items():
+                column = columns.get(field)
+                if column is None or value is None:
+                    continue
+
+                if self.value(column) != value:
+                    changed.add((section, field))
+                self.set_value(column, value)
+
+        return changed
+
+    # -----------------------
+    # Scoring
+    # -----------------------
+    def encoded(self):
+        """
+        (field_codes, attachment_codes), as encoding.encode_extraction
+        would return for to_dict().
+        """
+        return list(self.codes), [encode_attachment(info) for info in self.attachments.values()]
+
+    def fingerprint(self) -> tuple:
+        """
+        Same key as encoding.canonical_fingerprint(self.to_dict()).
+        """
+        codes, attachments = self.encoded()
+        return bytes(codes), bytes(attachments)
+
+    # -----------------------
+    # Conversion
+    # -----------------------
+    @classmethod
+    def from_dict(cls, extracted: dict) -> "PropertyState":
+        state = cls()
+
+        for section, columns in SECTION_COLUMNS.items():
+            data = extracted.get(section)
+            if data is None:
+                continue
+
+            state.add_section(section)
+            for field, column in columns.items():
+                value = data.get(field)
+                if value is not None:
+                    state.set_value(column, value)
+
+        for side, info in (extracted.get("attachment_details") or {}).items():
+            state.set_attachment(side, info)
+
+        return state
+
+    def to_dict(self) -> dict:
+        extracted = {}
+
+        for section, columns in SECTION_COLUMNS.items():
+            if self.has_section(section):
+                extracted[section] = {
+                    field: self.value(column)
+                    for field, column in columns.items()
+                    if self.codes[column] != UNKNOWN
+                }
+
+        if self.attachments:
+            extracted["attachment_details"] = {
+                side: dict(info) for side, info in self.attachments.items()
+            }
+
+        return extracted
+
+    def pack(self) -> list:
+        """
+        Session form: [codes, sections, ceiling, raw, attachments].
+        Only contains types the session serializer handles.
+        """
+        return [
+            bytes(self.codes),
+            self.sections,
+            self.ceiling_height_ft,
+            [[column, value] for column, value in sorted(self.raw.items())],
+            [[side, info.get("owner"), info.get("space_type")] for side, info in self.attachments.items()],
+        ]
+
+    @classmethod
+    def unpack(cls, packed) -> "PropertyState":
+        state = cls()
+        if not packed:
+            return state
+
+        codes, sections, ceiling, raw, attachments = packed
+
+        state.codes[:] = codes
+        state.sections = sections
+        state.ceiling_height_ft = ceiling
+        state.raw = {column: value for column, value in raw}
+        state.attachments = {
+            side: {"owner": owner, "space_type": space_type}
+            for side, owner, space_type in attachments
+        }
+
+        return state
+
+    def __eq__(self, other):
+        if not isinstance(other, PropertyState):
+            return NotImplemented
+        return self.pack() == other.pack()
+
+    def __repr__(self):
+        return f"PropertyState({self.to_dict()!r})"
+
+
+# -----------------------
+# Helpers for modules that take either form
+# -----------------------
+def encode_state(extracted):
+    """
+    encode_extraction for either a dict or a PropertyState.
+    """
+    if isinstance(extracted, PropertyState):
+        return extracted.encoded()
+    return encode_extraction(extracted)
@@ -0,0 +1,62 @@
+# Seeded random `extracted` dicts for the scorer tests.
+
+import random
+
+from evaluator.scoring.encoding import ATTACHMENT_OWNER_VOCAB, ATTACHMENT_SPACE_VOCAB, COLUMNS, SECTIONS
+
+FIELD_VOCAB = {field: values for _, vocab in SECTIONS for field, values in vocab.items()}
+
+CEILING_HEIGHTS = (7, 7.5, 8, 8.5, 9, 10)
+
+# Ceiling heights that land in each bucket
+COMPLETE_VALUES = {"ceiling_height_ft": (7, 8, 8.5, 9)}
+
+
+def random_attachments(rng: random.Random) -> dict:
+    sides = rng.sample(["front", "side_a", "side_b", "back"], rng.randint(0, 4))
+    return {
+        side: {
+            "owner": rng.choice(ATTACHMENT_OWNER_VOCAB + (None,)),
+            "space_type": rng.choice(ATTACHMENT_SPACE_VOCAB + (None, "unexpected")),
+        }
+        for side in sides
+    }
+
+
+def random_extraction(rng: random.Random) -> dict:
+    """
+    Any mix of known, missing and unrecognised values; sections are
+    sometimes left out entirely.
+    """
+    extracted = {}
+
+    for section, vocab in SECTIONS:
+        if rng.random() < 0.1:
+            continue
+
+        data = {}
+        for field, values in vocab.items():
+            if field == "ceiling_height_ft":
+                data[field] = rng.choice(CEILING_HEIGHTS + (None, None))
+            else:
+                data[field] = rng.choice(values + (None, None, "unexpected"))
+        extracted[section] = data
+
+    extracted["attachment_details"] = random_attachments(rng)
+    return extracted
+
+
+def partial_extraction(rng: random.Random, missing: int) -> dict:
+    """
+    A fully filled-in extraction with `missing` fields set to None.
+    """
+    extracted = {"attachment_details": random_attachments(rng)}
+
+    for section, field in COLUMNS:
+        values = COMPLETE_VALUES.get(field, FIELD_VOCAB[field])
+        extracted.setdefault(section, {})[field] = rng.choice(values)
+
+    for section, field in rng.sample(COLUMNS, missing):
+        extracted[section][field] = None
+
+    return extracted
@@ -0,0 +1,62 @@
+import json
+
+from evaluator.bulk_score import main, read_json, read_jsonl, score_chunk
+
+RECORD = {"privacy_in_room": {"room_size": "small"}}
+
+
+def test_malformed_jsonl_lines_become_error_results(tmp_path):
+    path = tmp_path / "records.jsonl"
+    path.write_text(
+        json.dumps({"id": "a", "extracted": RECORD}) + "\n"
+        + '{"id": "b", "extr\n'
+        + "42\n"
+        + json.dumps(RECORD) + "\n"
+    )
+
+    results = score_chunk(list(read_jsonl(path)))
+
+    assert [r["id"] for r in results] == ["a", 2, 3, 4]
+    assert "score" in results[0] and "score" in results[3]
+    assert "invalid JSON on line 2" in results[1]["error"]
+    assert "expected an object" in results[2]["error"]
+
+
+def test_json_array_input(tmp_path):
+    path = tmp_path / "records.json"
+    path.write_text(json.dumps([{"id": "a", "extracted": RECORD}, RECORD]))
+
+    assert list(read_json(path)) == [("a", RECORD), (2, RECORD)]
+
+
+def test_batch_breakdown_matches_scored_breakdown():
+    chunk = [(1, RECORD)]
+    full = score_chunk(chunk)[0]["score"]
+    batch = score_chunk(chunk, explanations=False)[0]["score"]
+
+    assert batch["breakdown"] == full["breakdown"]
+    assert batch["privacy_score_1_to_10"] == full["privacy_score_1_to_10"]
+
+
+def test_no_explanations_malformed_record_becomes_error_result():
+    chunk = [(1, RECORD), (2, {"attachment_details": ["side_a"]}), (3, RECORD)]
+    results = score_chunk(chunk, explanations=False)
+
+    assert [r["id"] for r in results] == [1, 2, 3]
+    assert "error" in results[1]
+    assert results[0]["score"] == results[2]["score"] == score_chunk([(1, RECORD)], explanations=False)[0]["score"]
+
+
+def test_no_explanations_cli_keeps_going(tmp_path):
+    path = tmp_path / "records.jsonl"
+    path.write_text(
+        json.dumps(RECORD) + "\n"
+        + json.dumps({"attachment_details": ["side_a"]}) + "\n"
+        + json.dumps(RECORD) + "\n"
+    )
+    output = tmp_path / "scores.jsonl"
+
+    main([str(path), "-o", str(output), "--no-explanations", "--quiet"])
+
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert ["error" in r for r in results] == [False, True, False]
@@ -0,0 +1,36 @@
+import contextlib
+from types import SimpleNamespace
+
+from evaluator.logic import explain
+from evaluator.metrics import GATEWAY_TOKENS
+
+
+def chunk(content=None, usage=None):
+    choices = [] if content is None else [SimpleNamespace(delta=SimpleNamespace(content=content))]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+def test_streamed_explanation_records_usage(monkeypatch):
+    calls = []
+
+    @contextlib.contextmanager
+    def fake_chat_completion(**kwargs):
+        calls.append(kwargs)
+        yield iter([
+            chunk(" A test "),
+            chunk("answer."),
+            chunk(usage=SimpleNamespace(prompt_tokens=40, completion_tokens=7)),
+        ])
+
+    monkeypatch.setattr(explain, "chat_completion", fake_chat_completion)
+    monkeypatch.setattr(explain, "known_explanation", lambda text: (None, None))
+    before = (
+        GATEWAY_TOKENS.value("explain_concept", "prompt"),
+        GATEWAY_TOKENS.value("explain_concept", "completion"),
+    )
+
+    assert "".join(explain.explain_concept_stream("what is a zzqx")) == "A test answer."
+
+    assert calls[0]["stream_options"] == {"include_usage": True}
+    assert GATEWAY_TOKENS.value("explain_concept", "prompt") == before[0] + 40
+    assert GATEWAY_TOKENS.value("explain_concept", "completion") == before[1] + 7
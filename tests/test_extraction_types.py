@@ -0,0 +1,72 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from evaluator.extraction_types import decode_extraction
+from evaluator.metrics import EXTRACTION_REJECTED
+from evaluator.run_extraction import decode_extraction_response
+
+
+def decode_ceiling(value):
+    rejected = []
+    extracted = decode_extraction(
+        json.dumps({"privacy_in_room": {"ceiling_height_ft": value, "room_size": "large"}}),
+        rejected,
+    )
+    return extracted["privacy_in_room"], rejected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("9", 9),
+    (" 8.5 ", 8.5),
+    ("10.0", 10),
+    (9, 9),
+    (8.5, 8.5),
+    ("High", 9),
+    ("average", 8),
+    ("null", None),
+    (None, None),
+])
+def test_ceiling_height_values(value, expected):
+    section, rejected = decode_ceiling(value)
+    assert section["ceiling_height_ft"] == expected
+    assert section["room_size"] == "large"
+    assert rejected == []
+
+
+@pytest.mark.parametrize("value", ["tall", "nine", "-1", "nan", "9 ft"])
+def test_unreadable_ceiling_height_is_rejected(value):
+    section, rejected = decode_ceiling(value)
+    assert section["ceiling_height_ft"] is None
+    assert section["room_size"] == "large"
+    assert rejected == ["privacy_in_room.ceiling_height_ft"]
+
+
+def test_number_rejection_reported_once_alongside_type_rejections():
+    rejected = []
+    extracted = decode_extraction(
+        json.dumps({
+            "privacy_in_room": {"ceiling_height_ft": "tall"},
+            "privacy_between_rooms": {"has_multiple_bedrooms": "sometimes"},
+        }),
+        rejected,
+    )
+    assert extracted["privacy_in_room"]["ceiling_height_ft"] is None
+    assert "has_multiple_bedrooms" not in extracted["privacy_between_rooms"]
+    assert sorted(rejected) == [
+        "privacy_between_rooms.has_multiple_bedrooms",
+        "privacy_in_room.ceiling_height_ft",
+    ]
+
+
+def test_rejections_are_counted_not_printed(capsys):
+    response = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(
+        function_call=SimpleNamespace(arguments=json.dumps({"privacy_in_room": {"ceiling_height_ft": "tall"}})),
+    ))])
+    before = EXTRACTION_REJECTED.value("privacy_in_room.ceiling_height_ft")
+
+    decode_extraction_response(response)
+
+    assert EXTRACTION_REJECTED.value("privacy_in_room.ceiling_height_ft") == before + 1
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,72 @@
+import pytest
+
+from evaluator.logic.field_resolver import resolve_field_answer
+
+
+def resolve(text: str, field: str):
+    return resolve_field_answer(text, {"last_question": ("x", field)})
+
+
+@pytest.mark.parametrize("field", [
+    "is_in_gated_society",
+    "has_multiple_bedrooms",
+    "bedrooms_share_wall",
+    "buffer_between_rooms",
+    "ceiling_height_ft",
+])
+@pytest.mark.parametrize("text", [
+    "no idea",
+    "no clue",
+    "no i dont know",
+    "nah not sure yet",
+    "not sure",
+    "maybe",
+    "dunno",
+])
+def test_non_answers_are_left_to_the_llm(text, field):
+    assert resolve(text, field) is None
+
+
+@pytest.mark.parametrize("text", [
+    "yes but not gated", "yeah not gated", "yes, not gated", "no, gated", "nope gated",
+])
+def test_mixed_yes_no_is_left_to_the_llm(text):
+    assert resolve(text, "is_in_gated_society") is None
+
+
+@pytest.mark.parametrize("text, value", [
+    ("yes", True),
+    ("no", False),
+    ("sure", True),
+    ("nope", False),
+    ("yes gated", True),
+    ("gated yes", True),
+    ("not gated", False),
+    ("no not gated", False),
+])
+def test_yes_no_answers(text, value):
+    assert resolve(text, "is_in_gated_society") == {"privacy_between_units": {"is_in_gated_society": value}}
+
+
+def test_bare_no_only_as_the_whole_reply():
+    assert resolve("no", "buffer_between_rooms") == {"privacy_between_rooms": {"buffer_between_rooms": "none"}}
+    assert resolve("no lobby", "buffer_between_rooms") == {"privacy_between_rooms": {"buffer_between_rooms": "none"}}
+    assert resolve("no there is a passage", "buffer_between_rooms") is None
+    assert resolve("yes it is", "bedrooms_share_wall") is None
+
+
+@pytest.mark.parametrize("text, field, value", [
+    ("attached", "front_open_space", "attached"),
+    ("narrow road", "front_open_space", "narrow_road"),
+    ("no gap", "front_open_space", "attached"),
+    ("9 ft", "ceiling_height_ft", 9),
+    ("8.5 feet", "ceiling_height_ft", 8.5),
+])
+def test_option_answers(text, field, value):
+    result = resolve(text, field)
+    assert result is not None
+    assert next(iter(result.values())) == {field: value}
+
+
+def test_maybe_with_a_number_is_left_to_the_llm():
+    assert resolve("maybe 9", "ceiling_height_ft") is None
@@ -0,0 +1,68 @@
+import pytest
+
+from evaluator.logic import intent_model, product_questions
+from evaluator.logic.intent_model import read_labelled, record_label, training_set
+
+
+def test_label_log_is_off_by_default(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    assert intent_model.INTENT_LABEL_LOG == ""
+
+    record_label("how does this tool work", "A")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_label_log_rotates_at_max_bytes(monkeypatch, tmp_path):
+    log = tmp_path / "labels.jsonl"
+    monkeypatch.setattr(intent_model, "INTENT_LABEL_LOG", str(log))
+    monkeypatch.setattr(intent_model, "INTENT_LABEL_LOG_MAX_BYTES", 200)
+
+    for i in range(20):
+        record_label(f"message number {i}", "B")
+
+    rotated = tmp_path / "labels.jsonl.1"
+    assert log.stat().st_size <= 200
+    assert rotated.stat().st_size <= 200
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["labels.jsonl", "labels.jsonl.1"]
+
+    texts = [text for text, _ in read_labelled(rotated) + read_labelled(log)]
+    assert texts[-1] == "message number 19"
+    assert texts == sorted(texts, key=lambda t: int(t.split()[-1]))
+
+    seed = tmp_path / "seed.jsonl"
+    seed.write_text('{"text": "message number 19", "label": "A"}\n')
+    assert ("message number 19", "B") in training_set(seed, str(log))
+
+
+def test_product_question_locally_runs_the_model_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(product_questions, "local_label", lambda text: calls.append(text) or "B")
+
+    assert product_questions.product_question_locally("the bedroom window faces a narrow lane") is False
+    assert len(calls) == 1
+
+
+NON_ANSWERS = ["i don't know", "skip this question please", "what do you think"]
+
+
+@pytest.mark.parametrize("text", NON_ANSWERS)
+def test_non_answers_are_not_product_questions(text):
+    assert product_questions.product_question_locally(text) is not True
+
+
+@pytest.mark.parametrize("text", ["i don't know", "pass", "skip this one"])
+def test_question_labels_need_a_question_cue(monkeypatch, text):
+    class Confident:
+        def predict(self, text):
+            return "A", 0.99
+
+    monkeypatch.setattr(intent_model, "get_model", lambda: Confident())
+    assert intent_model.local_label(text) is None
+
+
+def test_seed_questions_have_a_question_cue():
+    questions = [
+        text for text, label in read_labelled(intent_model.SEED_PATH)
+        if label in intent_model.QUESTION_LABELS
+    ]
+    assert questions and all(intent_model.has_question_cue(text) for text in questions)
@@ -0,0 +1,41 @@
+import importlib
+
+import pytest
+
+from evaluator.explanation_cache import explanation_cache
+from evaluator.extraction_cache import extraction_cache
+
+
+@pytest.fixture(scope="module")
+def app_module(tmp_path_factory):
+    # Session files go to a temporary directory, not the repo
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("SECRET_KEY", "test")
+        mp.setenv("SESSION_FILE_DIR", str(tmp_path_factory.mktemp("flask_session")))
+        return importlib.import_module("app")
+
+
+@pytest.fixture
+def client(app_module, tmp_path, monkeypatch):
+    for cache, name in ((extraction_cache, "extraction"), (explanation_cache, "explanations")):
+        monkeypatch.setattr(cache, "path", str(tmp_path / f"{name}.sqlite"))
+        monkeypatch.setattr(cache, "_disk", None)
+
+    return app_module.app.test_client()
+
+
+def test_metrics_off_without_a_token(app_module, client, monkeypatch):
+    monkeypatch.setattr(app_module, "METRICS_TOKEN", "")
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/metrics", headers={"Authorization": "Bearer "}).status_code == 404
+
+
+def test_metrics_needs_the_token(app_module, client, monkeypatch):
+    monkeypatch.setattr(app_module, "METRICS_TOKEN", "s3cret")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert b"gateway_request_seconds" in response.data
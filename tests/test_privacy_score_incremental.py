@@ -0,0 +1,51 @@
+import pytest
+
+from evaluator.scoring import privacy_score_incremental
+from evaluator.scoring.privacy_score_incremental import provisional_range, update_section_scores
+from evaluator.scoring.privacy_score_range import score_privacy_range
+
+EXTRACTIONS = [
+    {},
+    {"privacy_in_room": {"room_size": "small", "window_facing_side": "front"}},
+    {
+        "privacy_between_units": {"unit_type": "apartment", "is_in_gated_society": True},
+        "privacy_between_rooms": {"has_multiple_bedrooms": False},
+    },
+    {
+        "privacy_in_room": {"room_size": "large", "ceiling_height_ft": 9, "window_facing_side": "side"},
+        "privacy_between_units": {"front_open_space": "wide_road", "side_a_open_space": "attached"},
+        "attachment_details": {"side_a": {"owner": "neighbor_unit", "space_type": "bedroom"}},
+    },
+]
+
+
+@pytest.mark.parametrize("extracted", EXTRACTIONS)
+def test_cached_range_matches_full_range(extracted):
+    section_scores = update_section_scores(extracted, {})
+    assert provisional_range(section_scores) == score_privacy_range(extracted)["privacy_score_1_to_10"]
+
+
+def test_range_only_recomputed_for_changed_sections(monkeypatch):
+    extracted = EXTRACTIONS[3]
+    section_scores = update_section_scores(extracted, {})
+
+    recomputed = []
+    bounds = privacy_score_incremental.section_bounds
+    monkeypatch.setattr(
+        privacy_score_incremental, "section_bounds",
+        lambda section, *args: recomputed.append(section) or bounds(section, *args),
+    )
+
+    update_section_scores(extracted, section_scores, set())
+    assert recomputed == []
+
+    update_section_scores(extracted, section_scores, {("privacy_between_rooms", "bedrooms_share_wall")})
+    assert recomputed == ["privacy_between_rooms"]
+
+
+def test_results_cached_without_a_range_are_refreshed():
+    section_scores = update_section_scores(EXTRACTIONS[1], {})
+    del section_scores["privacy_in_room"]["range"]
+
+    update_section_scores(EXTRACTIONS[1], section_scores, set())
+    assert "range" in section_scores["privacy_in_room"]
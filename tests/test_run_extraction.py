@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from evaluator import run_extraction
+from evaluator.run_extraction import split_by_section
+
+LONG_REPLY = " ".join(["the bedroom is large with a window facing a quiet lane"] * 5)
+
+
+@pytest.mark.parametrize("context", [None, {}, {"last_question": None}])
+def test_long_unprompted_description_is_split(context):
+    assert split_by_section(LONG_REPLY, context)
+
+
+@pytest.mark.parametrize("last_question", [
+    ("privacy_in_room", "__entire_section__"),
+    ("privacy_in_room", "room_size"),
+])
+def test_reply_to_a_question_is_not_split(last_question):
+    assert not split_by_section(LONG_REPLY, {"last_question": last_question})
+
+
+def test_sync_and_async_extraction_send_the_same_request(monkeypatch):
+    calls = []
+    monkeypatch.setattr(run_extraction, "known_extraction", lambda text, context: (None, None))
+    monkeypatch.setattr(run_extraction, "decode_extraction_response", lambda response, key=None: response)
+
+    def fake(**kwargs):
+        calls.append(kwargs)
+        return {}
+
+    async def afake(**kwargs):
+        return fake(**kwargs)
+
+    monkeypatch.setattr(run_extraction, "chat_completion", fake)
+    monkeypatch.setattr(run_extraction, "achat_completion", afake)
+
+    context = {"last_question": ("privacy_in_room", "__entire_section__")}
+    run_extraction.run_extraction(LONG_REPLY, context)
+    asyncio.run(run_extraction.run_extraction_async(LONG_REPLY, context))
+
+    assert len(calls) == 2
+    assert calls[0] == calls[1]
+    assert calls[0]["operation"] == "run_extraction"
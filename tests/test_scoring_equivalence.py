@@ -0,0 +1,74 @@
+import itertools
+import random
+
+import pytest
+
+from evaluator.scoring.encoding import COLUMNS, UNKNOWN, encode_extraction
+from evaluator.scoring.privacy_score_compiled import (
+    score_between_rooms_section,
+    score_between_units_section,
+    score_codes,
+    score_in_room_section,
+    score_privacy_compiled,
+)
+from evaluator.scoring.privacy_score_range import _weighted, score_privacy_range
+from evaluator.scoring.privacy_score_table import build_score_table, load_score_table
+from evaluator.scoring.privacy_score_v1 import score_privacy_v1
+from tests.extractions import FIELD_VOCAB, partial_extraction, random_extraction
+
+SAMPLES = 5_000
+
+
+@pytest.fixture(scope="module")
+def extractions():
+    rng = random.Random(0)
+    return [random_extraction(rng) for _ in range(SAMPLES)]
+
+
+def test_compiled_matches_reference(extractions):
+    mismatches = [e for e in extractions if score_privacy_compiled(e) != score_privacy_v1(e)]
+    assert mismatches == []
+
+
+def test_table_matches_reference(extractions, tmp_path_factory):
+    table = load_score_table(build_score_table(tmp_path_factory.mktemp("tables")))
+    mismatches = [e for e in extractions if table.score(e) != score_privacy_v1(e)]
+    assert mismatches == []
+
+
+def completions(codes):
+    missing = [column for column, code in enumerate(codes) if code == UNKNOWN]
+    candidates = [range(2, len(FIELD_VOCAB[COLUMNS[column][1]]) + 2) for column in missing]
+
+    for filled in itertools.product(*candidates):
+        completed = list(codes)
+        for column, code in zip(missing, filled):
+            completed[column] = code
+        yield completed
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_range_matches_enumeration(seed):
+    rng = random.Random(seed)
+
+    for _ in range(100):
+        extracted = partial_extraction(rng, rng.randint(0, 4))
+        codes, attachments = encode_extraction(extracted)
+
+        scores = []
+        weighted = []
+        for completed in completions(codes):
+            scores.append(score_codes(completed, attachments)["privacy_score_1_to_10"])
+            weighted.append(_weighted(
+                score_in_room_section(completed)["score"],
+                score_between_rooms_section(completed)["score"],
+                score_between_units_section(completed, attachments)["score"],
+            ))
+
+        result = score_privacy_range(extracted)["privacy_score_1_to_10"]
+        assert result["min"] == min(scores), extracted
+        assert result["max"] == max(scores), extracted
+        # Expectation is summed in a different order; allow for rounding
+        assert abs(result["expected"] - sum(weighted) / len(weighted)) <= 0.005 + 1e-9, extracted
+        if len(scores) == 1:
+            assert result["min"] == score_privacy_v1(extracted)["privacy_score_1_to_10"]